@@ -0,0 +1,53 @@
+"""Add composite indexes for plant galleries
+
+Revision ID: a3d5e7f9b2c4
+Revises: f2c6a8d4b1e7
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "a3d5e7f9b2c4"
+down_revision: Union[str, None] = "f2c6a8d4b1e7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index photos by owner in capture order, and care logs by plant."""
+    op.create_index(
+        "ix_photos_plant_id_taken_at",
+        "photos",
+        ["plant_id", "taken_at", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_photos_care_log_id_taken_at",
+        "photos",
+        ["care_log_id", "taken_at", "created_at"],
+        unique=False,
+    )
+    # The composite indexes lead with the owner columns, superseding these
+    op.drop_index("ix_photos_plant_id", table_name="photos")
+    op.drop_index("ix_photos_care_log_id", table_name="photos")
+    op.create_index(
+        "ix_plant_care_plant_id_care_type_id_care_date",
+        "plant_care",
+        ["plant_id", "care_type_id", "care_date"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Restore the single-column owner indexes."""
+    op.drop_index(
+        "ix_plant_care_plant_id_care_type_id_care_date", table_name="plant_care"
+    )
+    op.create_index("ix_photos_care_log_id", "photos", ["care_log_id"], unique=False)
+    op.create_index("ix_photos_plant_id", "photos", ["plant_id"], unique=False)
+    op.drop_index("ix_photos_care_log_id_taken_at", table_name="photos")
+    op.drop_index("ix_photos_plant_id_taken_at", table_name="photos")
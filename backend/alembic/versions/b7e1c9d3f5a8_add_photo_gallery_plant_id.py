@@ -0,0 +1,53 @@
+"""Add gallery_plant_id to photos for keyset-paginated galleries
+
+Revision ID: b7e1c9d3f5a8
+Revises: a3d5e7f9b2c4
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "b7e1c9d3f5a8"
+down_revision: Union[str, None] = "a3d5e7f9b2c4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Record the gallery each photo belongs to and index it in page order."""
+    op.add_column("photos", sa.Column("gallery_plant_id", sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        "fk_photos_gallery_plant_id_plants",
+        "photos",
+        "plants",
+        ["gallery_plant_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.execute(
+        "UPDATE photos SET gallery_plant_id = plant_id WHERE plant_id IS NOT NULL"
+    )
+    op.execute(
+        "UPDATE photos SET gallery_plant_id = ("
+        "SELECT plant_care.plant_id FROM plant_care "
+        "WHERE plant_care.id = photos.care_log_id"
+        ") WHERE care_log_id IS NOT NULL"
+    )
+    op.create_index(
+        "ix_photos_gallery_plant_id_taken_at",
+        "photos",
+        ["gallery_plant_id", "taken_at", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Drop the gallery column and its index."""
+    op.drop_index("ix_photos_gallery_plant_id_taken_at", table_name="photos")
+    op.drop_constraint("fk_photos_gallery_plant_id_plants", "photos", type_="foreignkey")
+    op.drop_column("photos", "gallery_plant_id")
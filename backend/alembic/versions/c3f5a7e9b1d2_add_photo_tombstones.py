@@ -0,0 +1,41 @@
+"""Add photo tombstones for deferred file deletion
+
+Revision ID: c3f5a7e9b1d2
+Revises: b7e1c9d3f5a8
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "c3f5a7e9b1d2"
+down_revision: Union[str, None] = "b7e1c9d3f5a8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Queue photo files for deletion by the background reaper."""
+    op.create_table(
+        "photo_tombstones",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("directory", sa.String(), nullable=False),
+        sa.Column("filename", sa.String(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_photo_tombstones_id"), "photo_tombstones", ["id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Drop the deletion queue."""
+    op.drop_index(op.f("ix_photo_tombstones_id"), table_name="photo_tombstones")
+    op.drop_table("photo_tombstones")
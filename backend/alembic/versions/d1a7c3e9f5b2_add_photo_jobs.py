@@ -0,0 +1,57 @@
+"""Add asynchronous photo processing jobs
+
+Revision ID: d1a7c3e9f5b2
+Revises: c9d3e5f7a2b4
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "d1a7c3e9f5b2"
+down_revision: Union[str, None] = "c9d3e5f7a2b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Track photo processing state and queue deferred processing work."""
+    op.add_column(
+        "photos",
+        sa.Column("status", sa.String(), nullable=False, server_default="ready"),
+    )
+    op.create_table(
+        "photo_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("photo_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("source_path", sa.String(), nullable=False),
+        sa.Column("taken_at", sa.DateTime(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["photo_id"], ["photos.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_photo_jobs_id"), "photo_jobs", ["id"], unique=False)
+    op.create_index(
+        op.f("ix_photo_jobs_photo_id"), "photo_jobs", ["photo_id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_photo_jobs_status"), "photo_jobs", ["status"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Drop the job queue and photo processing state."""
+    op.drop_index(op.f("ix_photo_jobs_status"), table_name="photo_jobs")
+    op.drop_index(op.f("ix_photo_jobs_photo_id"), table_name="photo_jobs")
+    op.drop_index(op.f("ix_photo_jobs_id"), table_name="photo_jobs")
+    op.drop_table("photo_jobs")
+    op.drop_column("photos", "status")
@@ -0,0 +1,31 @@
+"""Add low-quality photo placeholders
+
+Revision ID: d5e7a9c1f3b6
+Revises: c3f5a7e9b1d2
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "d5e7a9c1f3b6"
+down_revision: Union[str, None] = "c3f5a7e9b1d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Store a tiny inline preview with each blob and photo. Existing rows
+    are filled in by `flask photos placeholders`."""
+    op.add_column("photo_blobs", sa.Column("placeholder", sa.String(), nullable=True))
+    op.add_column("photos", sa.Column("placeholder", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove the placeholders."""
+    op.drop_column("photos", "placeholder")
+    op.drop_column("photo_blobs", "placeholder")
@@ -0,0 +1,60 @@
+"""Add content-addressed photo blobs
+
+Revision ID: e4b8f1a2c6d3
+Revises: d1a7c3e9f5b2
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "e4b8f1a2c6d3"
+down_revision: Union[str, None] = "d1a7c3e9f5b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Store photo content once per unique upload, shared by reference."""
+    op.create_table(
+        "photo_blobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("filename", sa.String(), nullable=False),
+        sa.Column("mime_type", sa.String(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("width", sa.Integer(), nullable=True),
+        sa.Column("height", sa.Integer(), nullable=True),
+        sa.Column("taken_at", sa.DateTime(), nullable=True),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_photo_blobs_id"), "photo_blobs", ["id"], unique=False)
+    op.create_index(
+        op.f("ix_photo_blobs_sha256"), "photo_blobs", ["sha256"], unique=True
+    )
+    op.add_column("photos", sa.Column("blob_id", sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        "fk_photos_blob_id_photo_blobs",
+        "photos",
+        "photo_blobs",
+        ["blob_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    op.create_index(op.f("ix_photos_blob_id"), "photos", ["blob_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Drop blob references. Photos stored as blobs lose their files' location."""
+    op.drop_index(op.f("ix_photos_blob_id"), table_name="photos")
+    op.drop_constraint("fk_photos_blob_id_photo_blobs", "photos", type_="foreignkey")
+    op.drop_column("photos", "blob_id")
+    op.drop_index(op.f("ix_photo_blobs_sha256"), table_name="photo_blobs")
+    op.drop_index(op.f("ix_photo_blobs_id"), table_name="photo_blobs")
+    op.drop_table("photo_blobs")
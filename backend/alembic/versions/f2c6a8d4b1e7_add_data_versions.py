@@ -0,0 +1,34 @@
+"""Add data version markers for conditional GETs
+
+Revision ID: f2c6a8d4b1e7
+Revises: e4b8f1a2c6d3
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "f2c6a8d4b1e7"
+down_revision: Union[str, None] = "e4b8f1a2c6d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Track a change counter per cached data scope."""
+    op.create_table(
+        "data_versions",
+        sa.Column("scope", sa.String(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("scope"),
+    )
+
+
+def downgrade() -> None:
+    """Drop the change counters."""
+    op.drop_table("data_versions")
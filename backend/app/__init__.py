@@ -4,6 +4,9 @@ from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 
 from app.api import register_api_blueprints
+from app.cli import photos_cli
+from app.decorators.caching import record_write
+from app.request import UploadRequest
 
 jwt = JWTManager()
 
@@ -11,8 +14,9 @@ jwt = JWTManager()
 def create_app():
     """Creates the Flask application"""
     app = Flask(__name__)
+    app.request_class = UploadRequest
     app.config.from_object("config.Config")
-    app.config["MAX_CONTENT_LENGTH"] = Config.MAX_UPLOAD_SIZE
+    app.config["MAX_CONTENT_LENGTH"] = Config.MAX_REQUEST_SIZE
     CORS(
         app,
         supports_credentials=True,
@@ -22,8 +26,11 @@ def create_app():
             "https://plants.talonlikeaclaw.com",
         ],
         allow_headers=["Content-Type", "Authorization"],
+        expose_headers=["X-Upload-Token", "Retry-After"],
         methods=["GET", "POST", "PATCH", "DELETE", "OPTIONS"],
     )
     register_api_blueprints(app)
+    app.cli.add_command(photos_cli)
+    app.after_request(record_write)
     jwt.init_app(app)
     return app
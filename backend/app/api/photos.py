@@ -1,17 +1,36 @@
 import os
+import uuid
 from datetime import datetime, timezone
-
-from flask import Blueprint, jsonify, request, send_file, send_from_directory
+from urllib.parse import quote
+
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    jsonify,
+    redirect,
+    request,
+    send_file,
+    send_from_directory,
+    stream_with_context,
+)
 from flask_jwt_extended import jwt_required
 from werkzeug.datastructures import FileStorage
+from werkzeug.exceptions import RequestedRangeNotSatisfiable, RequestEntityTooLarge
+from werkzeug.utils import secure_filename
 
 from app.decorators.auth import require_user_id
+from app.decorators.caching import conditional_json, read_only
 from app.models.database import SessionLocal
+from app.models.photo import Photo
 from app.models.plant import Plant
 from app.models.plant_care import PlantCare
-from app.services.photo_service import PhotoService
+from app.services.data_version_service import DataVersionService
+from app.services.image_work_limiter import ImageWorkBusy, get_image_limiter
+from app.services.photo_service import PhotoService, PreviewUpload
 from app.services.plant_care_service import PlantCareService
 from app.services.plant_service import PlantService
+from app.storage import get_storage
 
 photo_bp = Blueprint("photo", __name__)
 
@@ -49,21 +68,43 @@ def _verify_care_log_ownership(
     return care_log, None
 
 
+def _verify_photo_ownership(photo_service: PhotoService, user_id: int, photo_id: int):
+    """Returns (photo, error_response). Same semantics as above; ownership
+    is resolved in the same query as the photo.
+    """
+    photo, owned = photo_service.get_photo_for_user(photo_id, user_id)
+    if not photo:
+        return None, (jsonify({"error": "Photo not found"}), 404)
+    if not owned:
+        return None, (jsonify({"error": "Unauthorized access to this photo."}), 403)
+    return photo, None
+
+
 # --- PLANT PHOTO ENDPOINTS ---
 
 
 @photo_bp.route("/preview", methods=["POST"])
 @jwt_required()
 @require_user_id
+@read_only
 def preview_photo(user_id):
-    """Returns an in-memory JPEG preview for a prospective upload."""
+    """Returns a JPEG preview for a prospective upload, with an
+    `X-Upload-Token` header. Submitting the token as `upload_token` in place
+    of the file reuses the already processed upload.
+    """
     db = SessionLocal()
     try:
         file = request.files.get("file")
         if not file or not file.filename:
             return jsonify({"error": "No file provided."}), 400
-        preview = PhotoService(db).create_preview(file)
-        return send_file(preview, mimetype="image/jpeg", max_age=0)
+        preview, token = PhotoService(db).cache_preview(user_id, file)
+        response = send_file(preview, mimetype="image/jpeg", max_age=0)
+        response.headers["X-Upload-Token"] = token
+        return response
+    except ImageWorkBusy as error:
+        return _busy_response(error)
+    except RequestEntityTooLarge as error:
+        return jsonify({"error": error.description}), 413
     except ValueError as error:
         return jsonify({"error": str(error)}), 400
     except Exception:
@@ -75,9 +116,13 @@ def preview_photo(user_id):
 @photo_bp.route("/plant/<int:plant_id>", methods=["GET"])
 @jwt_required()
 @require_user_id
+@conditional_json(lambda user_id, plant_id: DataVersionService.user_scope(user_id))
 def get_plant_photos(user_id, plant_id):
     """Returns the aggregated gallery for a Plant: its own photos plus all
     photos attached to any of its care logs, in chronological order after cover.
+
+    Pass `?limit=<n>` to page through the gallery, following `next_cursor`
+    with `?cursor=<next_cursor>`. The cover is pinned on the first page only.
     """
     db = SessionLocal()
     try:
@@ -88,8 +133,53 @@ def get_plant_photos(user_id, plant_id):
         if err:
             return err
 
-        photos = photo_service.get_aggregated_plant_photos(plant_id)
-        return jsonify({"photos": photos}), 200
+        if "limit" not in request.args:
+            photos = photo_service.get_aggregated_plant_photos(plant_id)
+            return jsonify({"photos": photos}), 200
+
+        try:
+            limit = int(request.args["limit"])
+        except ValueError:
+            return jsonify({"error": "limit must be a positive integer"}), 400
+        photos, next_cursor = photo_service.get_plant_gallery_page(
+            plant_id, limit, request.args.get("cursor")
+        )
+        return jsonify({"photos": photos, "next_cursor": next_cursor}), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+    finally:
+        db.close()
+
+
+@photo_bp.route("/plant/<int:plant_id>/archive", methods=["GET"])
+@jwt_required()
+@require_user_id
+def download_plant_photos(user_id, plant_id):
+    """Streams every photo of a Plant, care log photos included, as a ZIP
+    in gallery order. The archive is built while it is sent, so nothing is
+    buffered or written to disk first.
+    """
+    db = SessionLocal()
+    try:
+        photo_service = PhotoService(db)
+
+        plant, err = _verify_plant_ownership(PlantService(db), user_id, plant_id)
+        if err:
+            return err
+
+        entries = photo_service.get_archive_entries(plant_id)
+        response = Response(
+            stream_with_context(photo_service.stream_archive(entries)),
+            mimetype="application/zip",
+        )
+        response.headers.set(
+            "Content-Disposition",
+            "attachment",
+            filename=f"{secure_filename(plant.nickname) or 'plant'}-photos.zip",
+        )
+        response.headers.set("Cache-Control", "private, no-store")
+        return response
 
     except Exception as e:
         return jsonify({"error": str(e)}), 400
@@ -104,6 +194,7 @@ def upload_plant_photos(user_id, plant_id):
     """Uploads one or more photos to a Plant. Accepts multipart/form-data
     with field name `file` (single) or `files` (multiple). Pass
     `featured_index=<index>` to make a selected uploaded photo the plant's cover photo.
+    Pass `?async=1` to queue processing and get 202 with job IDs instead.
     """
     db = SessionLocal()
     try:
@@ -114,10 +205,13 @@ def upload_plant_photos(user_id, plant_id):
         if err:
             return err
 
-        files = _collect_uploaded_files()
+        files = _collect_uploads(user_id)
         if not files:
             return jsonify(
-                {"error": "No files provided. Use field 'file' or 'files'."}
+                {
+                    "error": "No files provided. "
+                    "Use field 'file', 'files' or 'upload_token'."
+                }
             ), 400
 
         taken_at_values = request.form.getlist("taken_at")
@@ -125,18 +219,22 @@ def upload_plant_photos(user_id, plant_id):
             return jsonify({"error": "Each uploaded photo needs its own date field."}), 400
 
         taken_ats = [_parse_taken_at(value) for value in taken_at_values] or [None] * len(files)
-        created, errors, created_by_index = [], [], {}
-        for index, (f, taken_at) in enumerate(zip(files, taken_ats)):
-            try:
-                photo = photo_service.upload_plant_photo(plant_id, f, taken_at)
-                created.append(_serialize_created(photo, owner_type="plant"))
-                created_by_index[index] = photo.id
-            except ValueError as ve:
-                errors.append({"index": index, "filename": f.filename, "error": str(ve)})
-            except Exception as e:
-                errors.append({"index": index, "filename": f.filename, "error": str(e)})
-
         featured_index = _parse_featured_index(request.form.get("featured_index"), len(files))
+
+        if _wants_async() and not _has_previews(files):
+            jobs, failures = photo_service.enqueue_plant_photos(plant_id, files, taken_ats)
+            if featured_index is not None and featured_index in jobs:
+                photo_service.make_featured(jobs[featured_index].photo_id)
+            return _queued_response(photo_service, files, jobs, failures)
+
+        photos, failures = photo_service.upload_plant_photos(plant_id, files, taken_ats)
+        created = [
+            _serialize_created(photos[index], owner_type="plant")
+            for index in sorted(photos)
+        ]
+        created_by_index = {index: photo.id for index, photo in photos.items()}
+        errors = _serialize_errors(files, failures)
+
         if featured_index is not None and featured_index in created_by_index:
             photo_service.make_featured(created_by_index[featured_index])
             created = [
@@ -157,6 +255,10 @@ def upload_plant_photos(user_id, plant_id):
             201 if created else 400,
         )
 
+    except ImageWorkBusy as error:
+        return _busy_response(error)
+    except RequestEntityTooLarge as error:
+        return jsonify({"error": error.description}), 413
     except Exception as e:
         return jsonify({"error": str(e)}), 400
     finally:
@@ -206,7 +308,9 @@ def get_care_log_photos(user_id, care_log_id):
 @jwt_required()
 @require_user_id
 def upload_care_log_photos(user_id, care_log_id):
-    """Uploads one or more photos to a PlantCare log."""
+    """Uploads one or more photos to a PlantCare log. Pass `?async=1` to
+    queue processing and get 202 with job IDs instead.
+    """
     db = SessionLocal()
     try:
         plant_service = PlantService(db)
@@ -219,21 +323,25 @@ def upload_care_log_photos(user_id, care_log_id):
         if err:
             return err
 
-        files = _collect_uploaded_files()
+        files = _collect_uploads(user_id)
         if not files:
             return jsonify(
-                {"error": "No files provided. Use field 'file' or 'files'."}
+                {
+                    "error": "No files provided. "
+                    "Use field 'file', 'files' or 'upload_token'."
+                }
             ), 400
 
-        created, errors = [], []
-        for index, f in enumerate(files):
-            try:
-                photo = photo_service.upload_care_log_photo(care_log_id, f)
-                created.append(_serialize_created(photo, owner_type="care_log"))
-            except ValueError as ve:
-                errors.append({"index": index, "filename": f.filename, "error": str(ve)})
-            except Exception as e:
-                errors.append({"index": index, "filename": f.filename, "error": str(e)})
+        if _wants_async() and not _has_previews(files):
+            jobs, failures = photo_service.enqueue_care_log_photos(care_log_id, files)
+            return _queued_response(photo_service, files, jobs, failures)
+
+        photos, failures = photo_service.upload_care_log_photos(care_log_id, files)
+        created = [
+            _serialize_created(photos[index], owner_type="care_log")
+            for index in sorted(photos)
+        ]
+        errors = _serialize_errors(files, failures)
 
         return (
             jsonify(
@@ -246,6 +354,38 @@ def upload_care_log_photos(user_id, care_log_id):
             201 if created else 400,
         )
 
+    except ImageWorkBusy as error:
+        return _busy_response(error)
+    except RequestEntityTooLarge as error:
+        return jsonify({"error": error.description}), 413
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+    finally:
+        db.close()
+
+
+# --- PROCESSING JOB ENDPOINTS ---
+
+
+@photo_bp.route("/jobs/<int:job_id>", methods=["GET"])
+@jwt_required()
+@require_user_id
+def get_photo_job(user_id, job_id):
+    """Reports the progress of a queued photo-processing job."""
+    db = SessionLocal()
+    try:
+        photo_service = PhotoService(db)
+
+        job = photo_service.get_job(job_id)
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+
+        _, error = _verify_photo_ownership(photo_service, user_id, job.photo_id)  # type: ignore[arg-type]
+        if error:
+            return error
+
+        return jsonify({"job": _serialize_job(photo_service, job)}), 200
+
     except Exception as e:
         return jsonify({"error": str(e)}), 400
     finally:
@@ -266,12 +406,9 @@ def update_photo(user_id, photo_id):
     try:
         photo_service = PhotoService(db)
 
-        photo = photo_service.get_photo(photo_id)
-        if not photo:
-            return jsonify({"error": "Photo not found"}), 404
-
-        if not photo_service.user_owns_photo(user_id, photo):
-            return jsonify({"error": "Unauthorized access to this photo."}), 403
+        _, error = _verify_photo_ownership(photo_service, user_id, photo_id)
+        if error:
+            return error
 
         data = request.get_json(silent=True) or {}
         if data.get("featured") is True:
@@ -323,12 +460,9 @@ def delete_photo(user_id, photo_id):
     try:
         photo_service = PhotoService(db)
 
-        photo = photo_service.get_photo(photo_id)
-        if not photo:
-            return jsonify({"error": "Photo not found"}), 404
-
-        if not photo_service.user_owns_photo(user_id, photo):
-            return jsonify({"error": "Unauthorized access to this photo."}), 403
+        _, error = _verify_photo_ownership(photo_service, user_id, photo_id)
+        if error:
+            return error
 
         deleted = photo_service.delete_photo(photo_id)
         if not deleted:
@@ -346,40 +480,194 @@ def delete_photo(user_id, photo_id):
 @jwt_required()
 @require_user_id
 def serve_photo_file(user_id, photo_id):
-    """Serves the photo's original file. Pass `?thumb=1` for the thumbnail."""
+    """Serves the photo's original file. Pass `?w=<px>` for the smallest
+    rendition at least that wide (generated on first request), or `?thumb=1`
+    for the thumbnail. AVIF or WebP is sent when the `Accept` header names it;
+    JPEG otherwise. Byte `Range` requests, including `If-Range` and several
+    ranges at once, get a 206 so interrupted downloads can resume.
+    """
     db = SessionLocal()
     try:
         photo_service = PhotoService(db)
 
-        photo = photo_service.get_photo(photo_id)
-        if not photo:
-            return jsonify({"error": "Photo not found"}), 404
+        photo, error = _verify_photo_ownership(photo_service, user_id, photo_id)
+        if error:
+            return error
+
+        if photo.status != Photo.STATUS_READY:
+            return jsonify({"error": f"Photo is {photo.status}."}), 409
 
-        if not photo_service.user_owns_photo(user_id, photo):
-            return jsonify({"error": "Unauthorized access to this photo."}), 403
+        try:
+            width = _requested_width(photo_service, photo)
+        except ValueError as error:
+            return jsonify({"error": str(error)}), 400
 
-        thumb = request.args.get("thumb") == "1"
+        mime = photo_service.negotiate_output_mime(request.accept_mimetypes)
         directory = photo_service.directory_for(photo)
-        filename = photo_service.file_name_for(photo, thumb=thumb)
+        filename = photo_service.file_name_for(photo, width=width, mime=mime)
+
+        # Revalidate on every use: this URL stays the same when a rebuild
+        # re-encodes the rendition under a new name, and the ETag is checked
+        # without touching the file
+        cache_control = "private, no-cache"
+        etag = photo_service.rendition_etag(photo.filename, width, mime)  # type: ignore[arg-type]
+        if request.if_none_match.contains(etag):
+            return _not_modified(etag, cache_control)
+
+        try:
+            photo_service.ensure_rendition(photo, width, mime)
+        except FileNotFoundError:
+            return jsonify({"error": "File missing from storage."}), 404
+
+        response = _send_photo_file(directory, filename, mime, cache_control, etag)
+        response.set_etag(etag)
+        response.vary.add("Accept")
+        return response
+
+    except ImageWorkBusy as error:
+        return _busy_response(error)
+    except RequestedRangeNotSatisfiable as error:
+        return _range_not_satisfiable(error)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+    finally:
+        db.close()
+
+
+@photo_bp.route("/thumbnails", methods=["POST"])
+@jwt_required()
+@require_user_id
+@read_only
+def serve_photo_thumbnails(user_id):
+    """Streams the thumbnails for many photos in one `multipart/form-data`
+    response, so a gallery grid loads in a single round trip.
+
+    Expects JSON: `{"photo_ids": [...], "w": <px>}`. `w` is optional and
+    defaults to the thumbnail width. Ownership of every photo is checked in
+    one query. Each part is named after its photo ID. Photos that are missing,
+    not owned, or not ready are left out, and the client falls back to
+    `GET /<id>/file` for them. The format is negotiated from the `Accept`
+    header like `GET /<id>/file`.
+    """
+    db = SessionLocal()
+    try:
+        data = request.get_json(silent=True) or {}
+        photo_ids = data.get("photo_ids")
+        if (
+            not isinstance(photo_ids, list)
+            or not photo_ids
+            or not all(type(photo_id) is int for photo_id in photo_ids)
+        ):
+            return jsonify({"error": "Field 'photo_ids' must be a list of IDs."}), 400
+        if len(photo_ids) > PhotoService.THUMBNAIL_BATCH_MAX:
+            return (
+                jsonify(
+                    {
+                        "error": f"At most {PhotoService.THUMBNAIL_BATCH_MAX} "
+                        "photos per request."
+                    }
+                ),
+                400,
+            )
+        requested = data.get("w", PhotoService.THUMBNAIL_WIDTH)
+        if type(requested) is not int or requested <= 0:
+            return jsonify({"error": "Field 'w' must be a positive integer."}), 400
 
-        if not os.path.isfile(os.path.join(directory, filename)):
-            return jsonify({"error": "File missing on disk."}), 404
+        photo_service = PhotoService(db)
+        mime = photo_service.negotiate_output_mime(request.accept_mimetypes)
+        order = {photo_id: index for index, photo_id in enumerate(photo_ids)}
+        photos = sorted(
+            photo_service.get_user_photos(user_id, photo_ids),
+            key=lambda photo: order[photo.id],
+        )
 
-        # Cache privately for a long time (filenames are immutable UUIDs)
-        response = send_from_directory(
-            directory,
-            filename,
-            mimetype="image/jpeg",
+        # Resolve every file before streaming so the session can be closed
+        parts = []
+        for photo in photos:
+            if photo.status != Photo.STATUS_READY:
+                continue
+            width = photo_service.rendition_width_for(photo, requested)
+            try:
+                path = photo_service.ensure_rendition(photo, width, mime)
+            except FileNotFoundError:
+                continue
+            parts.append((photo.id, path))
+
+        boundary = uuid.uuid4().hex
+        response = Response(
+            _multipart_files(parts, mime, boundary),
+            mimetype=f"multipart/form-data; boundary={boundary}",
         )
-        response.headers.set("Cache-Control", "private, max-age=31536000, immutable")
+        response.headers.set("Cache-Control", "private, no-store")
+        response.vary.add("Accept")
         return response
 
+    except ImageWorkBusy as error:
+        return _busy_response(error)
     except Exception as e:
         return jsonify({"error": str(e)}), 400
     finally:
         db.close()
 
 
+@photo_bp.route("/signed/<path:path>", methods=["GET"])
+def serve_signed_photo_file(path):
+    """Serves a photo through a signed, expiring URL handed out by a list
+    endpoint. No JWT or database lookup is needed: the signature covers the
+    file path, rendition width and expiry. The format is negotiated from
+    the `Accept` header like `GET /<id>/file`.
+    """
+    try:
+        width = int(request.args["w"]) if request.args.get("w") else None
+        expires = int(request.args.get("exp", ""))
+    except ValueError:
+        return jsonify({"error": "Malformed signed URL."}), 400
+
+    try:
+        photo_service = PhotoService(None)  # type: ignore[arg-type]
+        signature = request.args.get("sig", "")
+        if not photo_service.verify_signed_url(path, width, expires, signature):
+            return jsonify({"error": "Invalid or expired photo URL."}), 403
+
+        mime = photo_service.negotiate_output_mime(request.accept_mimetypes)
+        etag = photo_service.rendition_etag(os.path.basename(path), width, mime)
+
+        # Cache until the URL expires; the signature keeps it private
+        max_age = max(0, expires - int(datetime.now(timezone.utc).timestamp()))
+        cache_control = f"private, max-age={max_age}, immutable"
+        if request.if_none_match.contains(etag):
+            return _not_modified(etag, cache_control)
+
+        try:
+            file_path = photo_service.resolve_signed_file(path, width, mime)
+        except FileNotFoundError:
+            return jsonify({"error": "File missing from storage."}), 404
+
+        response = _send_photo_file(
+            *os.path.split(file_path), mime, cache_control, etag
+        )
+        response.set_etag(etag)
+        response.vary.add("Accept")
+        return response
+
+    except ImageWorkBusy as error:
+        return _busy_response(error)
+    except RequestedRangeNotSatisfiable as error:
+        return _range_not_satisfiable(error)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@photo_bp.route("/metrics", methods=["GET"])
+@jwt_required()
+def get_photo_metrics():
+    """Reports this process's image work limiter: slots and memory in use,
+    queue depth, wait times and rejections. Requires a JWT, as load figures
+    help time attacks on the decoder.
+    """
+    return jsonify({"image_work": get_image_limiter().stats()}), 200
+
+
 # --- HELPERS ---
 
 
@@ -397,6 +685,277 @@ def _collect_uploaded_files() -> list[FileStorage]:
     return [f for f in files if f and f.filename]
 
 
+def _collect_uploads(user_id: int) -> list[FileStorage | PreviewUpload]:
+    """Returns the uploads in request order: uploaded files, with cached
+    previews submitted as `upload_token` fields in their places.
+
+    Each `upload_token` value stands for one photo. An empty value takes the
+    next uploaded file instead, so tokens and files can be mixed.
+
+    Raises:
+        ValueError: If the empty tokens and the uploaded files do not match up.
+    """
+    files = _collect_uploaded_files()
+    tokens = request.form.getlist("upload_token")
+    if not tokens:
+        return list(files)
+    if tokens.count("") != len(files):
+        raise ValueError("Each empty 'upload_token' needs exactly one uploaded file.")
+    remaining = iter(files)
+    return [
+        PreviewUpload(token, user_id) if token else next(remaining)
+        for token in tokens
+    ]
+
+
+def _has_previews(uploads: list) -> bool:
+    """Returns True if any upload is a cached preview. Those are already
+    processed, so their batch is stored inline rather than queued.
+    """
+    return any(isinstance(upload, PreviewUpload) for upload in uploads)
+
+
+def _busy_response(error: ImageWorkBusy) -> Response:
+    """Returns a 503 asking the client to retry once image work frees up."""
+    response = jsonify({"error": str(error)})
+    response.status_code = 503
+    response.headers["Retry-After"] = str(error.retry_after)
+    return response
+
+
+def _not_modified(etag: str, cache_control: str) -> Response:
+    """Returns an empty 304 for a photo file the client already has."""
+    response = current_app.response_class(status=304)
+    response.set_etag(etag)
+    response.headers.set("Cache-Control", cache_control)
+    response.vary.add("Accept")
+    return response
+
+
+def _send_photo_file(
+    directory: str,
+    filename: str,
+    mime: str,
+    cache_control: str,
+    etag: str | None = None,
+) -> Response:
+    """Sends a photo file from disk, or hands the transfer to the front proxy
+    when `PHOTO_SEND_FILE_MODE` is `x-accel` (nginx) or `x-sendfile`, or to
+    the storage backend when it is `redirect`.
+
+    Files sent from disk honor byte `Range` requests, validated by `etag` for
+    `If-Range`. Proxies and object stores serve ranges themselves.
+
+    Offloaded responses have an empty body and only name the file in a
+    header, so the worker is released before a single byte is transferred.
+    They carry `etag` for the proxy to pass on in place of its own.
+    Redirects to a presigned URL are cached only while the URL is valid;
+    backends without presigned reads fall back to sending the file.
+    """
+    mode = current_app.config.get("PHOTO_SEND_FILE_MODE")
+    path = os.path.join(directory, filename)
+    relative = os.path.relpath(path, current_app.config["UPLOAD_FOLDER"])
+    if mode == "redirect":
+        ttl = current_app.config.get("PHOTO_PRESIGNED_URL_TTL", 15 * 60)
+        url = get_storage().presigned_url(relative.replace(os.sep, "/"), ttl, mime)
+        if url:
+            response = redirect(url)
+            # Stop reusing the redirect a minute before the URL expires
+            response.headers.set("Cache-Control", f"private, max-age={max(0, ttl - 60)}")
+            return response
+        mode = ""
+    if not mode:
+        response = _send_byte_ranges(path, mime, etag) or send_from_directory(
+            directory, filename, mimetype=mime, etag=etag or True
+        )
+        response.headers.set("Cache-Control", cache_control)
+        return response
+
+    response = current_app.response_class(mimetype=mime)
+    response.headers.set("Cache-Control", cache_control)
+    if etag:
+        # The proxy passes this ETag through, so revalidations are answered
+        # here without handing off the file
+        response.set_etag(etag)
+        response.make_conditional(request)
+        if response.status_code == 304:
+            return response
+    if mode == "x-accel":
+        prefix = current_app.config["PHOTO_ACCEL_PREFIX"].rstrip("/")
+        response.headers["X-Accel-Redirect"] = f"{prefix}/{quote(relative)}"
+    elif mode == "x-sendfile":
+        response.headers["X-Sendfile"] = os.path.abspath(path)
+    else:
+        raise ValueError(f"Unknown PHOTO_SEND_FILE_MODE: {mode}")
+    return response
+
+
+def _send_byte_ranges(path: str, mime: str, etag: str | None) -> Response | None:
+    """Answers a `Range` request for several byte ranges with a 206,
+    reading each range from disk in chunks.
+
+    Werkzeug serves single ranges itself but refuses overlapping or unordered
+    ones, so this returns None for requests with fewer than two ranges, with
+    more than `BYTE_RANGES_MAX`, with a malformed range, or whose `If-Range`
+    no longer matches, and the caller sends the file as usual. Overlapping
+    and adjacent ranges are merged first; several remaining ranges are sent
+    as `multipart/byteranges`.
+
+    Raises:
+        RequestedRangeNotSatisfiable: If no range overlaps the file.
+    """
+    units, _, specs = request.headers.get("Range", "").partition("=")
+    items = [item.strip(" \t") for item in specs.split(",")]
+    if units.strip(" \t").lower() != "bytes" or not (
+        2 <= len(items) <= PhotoService.BYTE_RANGES_MAX
+    ):
+        return None
+    stat = os.stat(path)
+    if not _if_range_matches(etag, stat.st_mtime):
+        return None
+
+    spans = []
+    for item in items:
+        first, dash, last = (part.strip(" \t") for part in item.partition("-"))
+        if not dash or not (first or last) or not (first + last).isdigit():
+            return None
+        if not first:
+            # A suffix: the last `last` bytes, or all of a shorter file
+            if int(last) == 0:
+                return None
+            start, stop = max(0, stat.st_size - int(last)), stat.st_size
+        else:
+            start = int(first)
+            stop = int(last) + 1 if last else stat.st_size
+            if stop <= start:
+                return None
+        stop = min(stop, stat.st_size)
+        if start < stop:
+            spans.append((start, stop))
+    if not spans:
+        raise RequestedRangeNotSatisfiable(length=stat.st_size)
+    merged: list[tuple[int, int]] = []
+    for start, stop in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+
+    if len(merged) == 1:
+        start, stop = merged[0]
+        response = current_app.response_class(mimetype=mime)
+        response.headers["Content-Range"] = f"bytes {start}-{stop - 1}/{stat.st_size}"
+        headers, trailer = [b""], b""
+    else:
+        boundary = uuid.uuid4().hex
+        headers = [
+            (
+                f"--{boundary}\r\n"
+                f"Content-Type: {mime}\r\n"
+                f"Content-Range: bytes {start}-{stop - 1}/{stat.st_size}\r\n\r\n"
+            ).encode()
+            for start, stop in merged
+        ]
+        response = current_app.response_class(
+            mimetype=f"multipart/byteranges; boundary={boundary}"
+        )
+        trailer = f"--{boundary}--\r\n".encode()
+    separator = b"\r\n" if len(merged) > 1 else b""
+
+    def generate():
+        with open(path, "rb") as handle:
+            for header, (start, stop) in zip(headers, merged):
+                yield header
+                handle.seek(start)
+                remaining = stop - start
+                while remaining > 0:
+                    chunk = handle.read(min(PhotoService.SPOOL_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        return
+                    remaining -= len(chunk)
+                    yield chunk
+                yield separator
+            yield trailer
+
+    response.response = generate()
+    response.direct_passthrough = True
+    response.status_code = 206
+    response.content_length = len(trailer) + sum(
+        len(header) + stop - start + len(separator)
+        for header, (start, stop) in zip(headers, merged)
+    )
+    response.accept_ranges = "bytes"
+    response.last_modified = datetime.fromtimestamp(int(stat.st_mtime), timezone.utc)
+    if etag:
+        response.set_etag(etag)
+    return response
+
+
+def _if_range_matches(etag: str | None, mtime: float) -> bool:
+    """Returns True unless an `If-Range` header names a different version
+    of the file. Weak ETags never match, as RFC 9110 requires.
+    """
+    header = request.headers.get("If-Range")
+    if not header:
+        return True
+    if_range = request.if_range
+    if if_range.etag is not None:
+        return not header.startswith("W/") and if_range.etag == etag
+    if if_range.date is not None:
+        return int(if_range.date.timestamp()) == int(mtime)
+    return False
+
+
+def _range_not_satisfiable(error: RequestedRangeNotSatisfiable) -> Response:
+    """Returns a 416 naming the file's length, as `Content-Range: bytes */n`."""
+    response = jsonify({"error": "Requested range not satisfiable."})
+    response.status_code = 416
+    response.headers["Content-Range"] = f"{error.units} */{error.length}"
+    return response
+
+
+def _multipart_files(parts, mime: str, boundary: str):
+    """Yields `(photo_id, path)` files as `multipart/form-data` parts named
+    after the photo ID, reading each file in chunks.
+    """
+    extension = PhotoService.RENDITION_FORMATS[mime][0]
+    for photo_id, path in parts:
+        try:
+            handle = open(path, "rb")
+        except FileNotFoundError:
+            continue
+        with handle:
+            yield (
+                f"--{boundary}\r\n"
+                f'Content-Disposition: form-data; name="{photo_id}"; '
+                f'filename="{photo_id}{extension}"\r\n'
+                f"Content-Type: {mime}\r\n"
+                f"Content-Length: {os.fstat(handle.fileno()).st_size}\r\n\r\n"
+            ).encode()
+            while chunk := handle.read(PhotoService.SPOOL_CHUNK_SIZE):
+                yield chunk
+            yield b"\r\n"
+    yield f"--{boundary}--\r\n".encode()
+
+
+def _requested_width(photo_service: PhotoService, photo) -> int | None:
+    """Returns the rendition width selected by `?w=` or `?thumb=1`, or None
+    when the original should be served.
+    """
+    if request.args.get("thumb") == "1":
+        return PhotoService.THUMBNAIL_WIDTH
+    value = request.args.get("w")
+    if not value:
+        return None
+    try:
+        requested = int(value)
+    except ValueError as error:
+        raise ValueError("Query parameter 'w' must be a positive integer.") from error
+    if requested <= 0:
+        raise ValueError("Query parameter 'w' must be a positive integer.")
+    return photo_service.rendition_width_for(photo, requested)
+
+
 def _parse_taken_at(value: str | None) -> datetime | None:
     """Parses the optional date selected by the user for an upload batch."""
     if not value:
@@ -423,6 +982,51 @@ def _parse_featured_index(value: str | None, file_count: int) -> int | None:
     return index
 
 
+def _wants_async() -> bool:
+    """Returns True if the client opted into queued processing."""
+    return request.args.get("async") == "1"
+
+
+def _queued_response(photo_service: PhotoService, files, jobs: dict, failures: dict):
+    """Builds the 202 response for a batch queued for the photo worker."""
+    return (
+        jsonify(
+            {
+                "message": f"Queued {len(jobs)} photo(s).",
+                "jobs": [
+                    {"index": index, **_serialize_job(photo_service, jobs[index])}
+                    for index in sorted(jobs)
+                ],
+                "errors": _serialize_errors(files, failures),
+            }
+        ),
+        202 if jobs else 400,
+    )
+
+
+def _serialize_job(photo_service: PhotoService, job) -> dict:
+    """Serializes a PhotoJob with its position in the queue."""
+    return {
+        "id": job.id,
+        "photo_id": job.photo_id,
+        "status": job.status,
+        "queue_position": photo_service.get_queue_position(job),
+        "attempts": job.attempts,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+def _serialize_errors(files: list[FileStorage], failures: dict[int, str]) -> list[dict]:
+    """Serializes per-file upload failures in upload order."""
+    return [
+        {"index": index, "filename": files[index].filename, "error": failures[index]}
+        for index in sorted(failures)
+    ]
+
+
 def _serialize_created(photo, owner_type: str) -> dict:
     """Serializes a freshly-created Photo row with the essentials the frontend
     needs immediately after upload.
@@ -438,6 +1042,7 @@ def _serialize_created(photo, owner_type: str) -> dict:
         "position": photo.position,
         "taken_at": photo.taken_at.isoformat() if photo.taken_at else None,
         "created_at": photo.created_at.isoformat() if photo.created_at else None,  # type: ignore
+        "status": photo.status,
     }
 
 
@@ -454,5 +1059,6 @@ def _serialize_with_source(photo, source_type: str) -> dict:
         "position": photo.position,
         "taken_at": photo.taken_at.isoformat() if photo.taken_at else None,
         "created_at": photo.created_at.isoformat() if photo.created_at else None,  # type: ignore
+        "status": photo.status,
         "source": {"type": source_type},
     }
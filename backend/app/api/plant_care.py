@@ -1,7 +1,9 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app.decorators.auth import require_user_id
+from app.decorators.caching import conditional_json
 from app.models.database import SessionLocal
+from app.services.data_version_service import DataVersionService
 from app.services.plant_service import PlantService
 from app.services.plant_care_service import PlantCareService
 from app.models.care_plan import CarePlan
@@ -289,6 +291,7 @@ def get_care_log(user_id, care_log_id):
 @plant_care_bp.route("/care-plans/upcoming", methods=["GET"])
 @jwt_required()
 @require_user_id
+@conditional_json(lambda user_id: DataVersionService.user_scope(user_id))
 def get_upcoming_care_plans(user_id):
     """Returns a list of upcoming plant care tasks."""
     db = SessionLocal()
@@ -1,8 +1,10 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app.decorators.auth import require_user_id
+from app.decorators.caching import conditional_json
 from app.models.database import SessionLocal
 from app.services.plant_service import PlantService
+from app.services.data_version_service import DataVersionService
 from app.services.photo_service import PhotoService
 
 plant_bp = Blueprint("plant", __name__)
@@ -11,6 +13,7 @@ plant_bp = Blueprint("plant", __name__)
 @plant_bp.route("", methods=["GET"])
 @jwt_required()
 @require_user_id
+@conditional_json(lambda user_id: DataVersionService.user_scope(user_id))
 def get_plants(user_id):
     """Gets all plants that belong to the user's JWT identity."""
     db = SessionLocal()
@@ -36,6 +39,9 @@ def get_plants(user_id):
                     "last_watered": plant.last_watered.isoformat()
                     if plant.last_watered else None,  # type: ignore
                     "cover_photo_id": cover.id if cover else None,
+                    "cover_photo_urls": photo_service.signed_urls_for(cover)
+                    if cover else None,
+                    "cover_photo_placeholder": cover.placeholder if cover else None,
                 }
             )
 
@@ -96,6 +102,8 @@ def create_plant(user_id):
                 "last_watered": new_plant.last_watered.isoformat()
                 if new_plant.last_watered else None,  # type: ignore
                 "cover_photo_id": None,
+                "cover_photo_urls": None,
+                "cover_photo_placeholder": None,
             }
         }), 201
 
@@ -145,6 +153,9 @@ def get_plant(user_id, plant_id):
                 "last_watered": plant.last_watered.isoformat()
                 if plant.last_watered else None,  # type: ignore
                 "cover_photo_id": cover.id if cover else None,
+                "cover_photo_urls": photo_service.signed_urls_for(cover)
+                if cover else None,
+                "cover_photo_placeholder": cover.placeholder if cover else None,
             }
         }), 200
 
@@ -207,6 +218,9 @@ def update_plant(user_id, plant_id):
                 "last_watered": updated_plant.last_watered.isoformat()
                 if updated_plant.last_watered else None,  # type: ignore
                 "cover_photo_id": cover.id if cover else None,
+                "cover_photo_urls": photo_service.signed_urls_for(cover)
+                if cover else None,
+                "cover_photo_placeholder": cover.placeholder if cover else None,
             }
         }), 200
 
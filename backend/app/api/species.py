@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
+from app.decorators.caching import conditional_json
 from app.models.database import SessionLocal
+from app.services.data_version_service import DataVersionService
 from app.services.species_service import SpeciesService
 
 species_bp = Blueprint("species", __name__)
@@ -8,6 +10,7 @@ species_bp = Blueprint("species", __name__)
 
 @species_bp.route("", methods=["GET"])
 @jwt_required()
+@conditional_json(lambda: DataVersionService.SPECIES_SCOPE)
 def get_species():
     """Gets all species in the database."""
     db = SessionLocal()
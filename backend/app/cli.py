@@ -0,0 +1,453 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import click
+from flask import Flask, current_app
+from flask.cli import AppGroup
+
+from app.models import PhotoJob
+from app.models.database import SessionLocal
+from app.services.photo_service import PhotoService
+
+photos_cli = AppGroup("photos", help="Photo processing and maintenance commands.")
+
+# Seconds between working copy scans of an idle worker
+TRIM_INTERVAL = 60
+
+
+@photos_cli.command("worker")
+@click.option("--once", is_flag=True, help="Exit once the queue is empty.")
+@click.option(
+    "--poll-interval",
+    default=2.0,
+    show_default=True,
+    help="Seconds to wait between polls while the queue is empty.",
+)
+def run_photo_worker(once, poll_interval):
+    """Processes photos queued by `?async=1` uploads, and deletes the files
+    of deleted photos and trims the working copy while the queue is empty.
+    """
+    trimmed_at = float("-inf")
+    while True:
+        db = SessionLocal()
+        reaped, requeued = 0, False
+        try:
+            photo_service = PhotoService(db)
+            job = photo_service.claim_next_job()
+            if job is not None:
+                ok = photo_service.run_job(job)
+                requeued = not ok and job.status == PhotoJob.STATUS_PENDING
+                if ok:
+                    outcome = "done"
+                elif requeued:
+                    outcome = f"requeued: {job.error}"
+                else:
+                    outcome = f"failed: {job.error}"
+                click.echo(f"Job {job.id} (photo {job.photo_id}): {outcome}")
+            else:
+                reaped = _reap(photo_service)
+                if not reaped and time.monotonic() - trimmed_at >= TRIM_INTERVAL:
+                    _trim(photo_service)
+                    trimmed_at = time.monotonic()
+        finally:
+            db.close()
+
+        # Back off before retrying a job put back in the queue
+        if requeued:
+            time.sleep(poll_interval)
+        elif job is None and not reaped:
+            if once:
+                return
+            time.sleep(poll_interval)
+
+
+@photos_cli.command("reap")
+@click.option(
+    "--batch-size",
+    default=500,
+    show_default=True,
+    help="Tombstones deleted per storage request.",
+)
+def reap_photo_files(batch_size):
+    """Deletes the files of every deleted photo, plant and care log still
+    queued. `photos worker` does the same while idle.
+    """
+    total = 0
+    while True:
+        db = SessionLocal()
+        try:
+            reaped = _reap(PhotoService(db), batch_size)
+        finally:
+            db.close()
+        if not reaped:
+            break
+        total += reaped
+    click.echo(f"Reaped {total} tombstones.")
+
+
+def _reap(photo_service, batch_size=500):
+    """Reaps one batch of tombstones, reporting storage errors instead of
+    raising so the caller keeps running.
+
+    Returns:
+        int: Number of tombstones reaped.
+    """
+    try:
+        reaped = photo_service.reap_tombstones(batch_size)
+    except Exception as error:
+        click.echo(f"Reaping failed, will retry: {error}", err=True)
+        return 0
+    if reaped:
+        click.echo(f"Reaped {reaped} tombstones.")
+    return reaped
+
+
+@photos_cli.command("trim")
+def trim_working_copy():
+    """Evicts the least recently verified files of this node's working copy
+    down to `PHOTO_WORKING_COPY_BYTES`. Only needed with a remote storage
+    backend, on nodes that run no `photos worker`.
+    """
+    db = SessionLocal()
+    try:
+        _trim(PhotoService(db))
+    finally:
+        db.close()
+
+
+def _trim(photo_service):
+    """Trims the working copy, reporting what it freed."""
+    freed = photo_service.trim_working_copy()
+    if freed:
+        click.echo(f"Evicted {freed / 1024 / 1024:.1f} MiB from the working copy.")
+
+
+@photos_cli.command("migrate-layout")
+@click.option(
+    "--workers",
+    default=4,
+    show_default=True,
+    help="Photos migrated in parallel.",
+)
+@click.option(
+    "--batch-size",
+    default=500,
+    show_default=True,
+    help="Photo IDs read per query.",
+)
+def migrate_photo_layout(workers, batch_size):
+    """Moves photos from the per-plant and per-care-log directories into the
+    sharded blob store. Safe to run while the app serves traffic, and to
+    interrupt and run again: migrated photos are skipped.
+    """
+    app = current_app._get_current_object()  # type: ignore[attr-defined]
+
+    def migrate(photo_id):
+        with app.app_context():
+            db = SessionLocal()
+            try:
+                return PhotoService(db).migrate_legacy_photo(photo_id)
+            finally:
+                db.close()
+
+    migrated, missing, after_id = 0, [], 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            db = SessionLocal()
+            try:
+                photo_ids = PhotoService(db).get_legacy_photo_ids(after_id, batch_size)
+            finally:
+                db.close()
+            if not photo_ids:
+                break
+            after_id = photo_ids[-1]
+
+            futures = {executor.submit(migrate, photo_id): photo_id for photo_id in photo_ids}
+            for future in as_completed(futures):
+                try:
+                    migrated += future.result()
+                except FileNotFoundError:
+                    missing.append(futures[future])
+            click.echo(f"Migrated {migrated} photos (up to ID {after_id}).")
+
+    if missing:
+        click.echo(
+            f"{len(missing)} photos have no original in storage and were left "
+            f"in place: {', '.join(map(str, sorted(missing)))}"
+        )
+    _remove_empty_directories(app.config["UPLOAD_FOLDER"])
+
+
+def _remove_empty_directories(upload_folder):
+    """Removes owner directories emptied by `migrate-layout` once the reaper
+    deleted their old files.
+    """
+    for owner_dir in ("plants", "care-logs"):
+        root = os.path.join(upload_folder, owner_dir)
+        if not os.path.isdir(root):
+            continue
+        for entry in os.scandir(root):
+            try:
+                os.rmdir(entry.path)
+            except OSError:
+                pass
+
+
+@photos_cli.command("placeholders")
+@click.option(
+    "--batch-size",
+    default=200,
+    show_default=True,
+    help="Photos filled in per commit.",
+)
+def backfill_photo_placeholders(batch_size):
+    """Computes the inline placeholder of every photo uploaded before
+    placeholders were stored. Safe to interrupt and run again: photos that
+    already have one are skipped.
+    """
+    filled, failed, after_id = 0, {}, 0
+    while True:
+        db = SessionLocal()
+        try:
+            photo_service = PhotoService(db)
+            photos = photo_service.get_placeholder_batch(after_id, batch_size)
+            if not photos:
+                break
+            after_id = photos[-1].id
+            count, errors = photo_service.backfill_placeholders(photos)
+        finally:
+            db.close()
+        filled += count
+        failed.update(errors)
+        click.echo(f"Filled in {filled} placeholders (up to ID {after_id}).")
+
+    for photo_id, error in sorted(failed.items()):
+        click.echo(f"Photo {photo_id} failed: {error}", err=True)
+
+
+@photos_cli.command("rebuild")
+@click.option(
+    "--width",
+    "widths",
+    multiple=True,
+    help="Rendition width to regenerate, or `full` for the full-size WebP and "
+    "AVIF variants. Repeatable. Defaults to every registered width.",
+)
+@click.option(
+    "--format",
+    "mimes",
+    multiple=True,
+    type=click.Choice(list(PhotoService.RENDITION_FORMATS)),
+    help="Rendition format to regenerate. Repeatable. Defaults to every "
+    "format this Pillow build can encode.",
+)
+@click.option(
+    "--workers",
+    default=os.cpu_count() or 1,
+    show_default="CPU count",
+    help="Worker processes.",
+)
+@click.option(
+    "--chunk-size",
+    default=200,
+    show_default=True,
+    help="Photos read per query and checkpointed together.",
+)
+@click.option(
+    "--max-rate",
+    default=0.0,
+    show_default=True,
+    help="Photos per second to stay under, leaving capacity for live "
+    "traffic. 0 means unthrottled.",
+)
+@click.option(
+    "--checkpoint",
+    type=click.Path(dir_okay=False),
+    help="Progress file. Defaults to .photos-rebuild.json in UPLOAD_FOLDER.",
+)
+@click.option(
+    "--restart", is_flag=True, help="Ignore a saved checkpoint and start over."
+)
+def rebuild_photo_renditions(
+    widths, mimes, workers, chunk_size, max_rate, checkpoint, restart
+):
+    """Generates renditions with the current settings, e.g. after changing a
+    width, a quality or adding a format, and queues the renditions they
+    supersede for the reaper.
+
+    Progress is checkpointed after every chunk; running the command again
+    resumes where it stopped.
+    """
+    app = current_app._get_current_object()  # type: ignore[attr-defined]
+    allowed = {str(width): width for width in PhotoService.RENDITION_WIDTHS}
+    allowed["full"] = None
+    for width in widths:
+        if str(width) not in allowed:
+            raise click.BadParameter(
+                f"must be one of {', '.join(allowed)}.", param_hint="--width"
+            )
+    widths = [allowed[str(width)] for width in widths or PhotoService.RENDITION_WIDTHS]
+    mimes = list(mimes or PhotoService.supported_output_mimes())
+    checkpoint = checkpoint or os.path.join(
+        app.config["UPLOAD_FOLDER"], ".photos-rebuild.json"
+    )
+
+    progress = _load_rebuild_checkpoint(checkpoint, widths, mimes, restart)
+    if progress["after_id"]:
+        click.echo(f"Resuming after photo {progress['after_id']}.")
+    elapsed_before = progress["elapsed"]
+    run_started = time.monotonic()
+    processed = 0
+    worker_config = {
+        key: value
+        for key, value in app.config.items()
+        if key == "UPLOAD_FOLDER" or key.startswith("PHOTO_")
+    }
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_rebuild_worker,
+        initargs=(worker_config,),
+    ) as executor:
+        while True:
+            db = SessionLocal()
+            try:
+                photo_service = PhotoService(db)
+                tasks = [
+                    (
+                        photo.id,
+                        photo_service.directory_for(photo),
+                        photo.filename,
+                        photo.width,
+                        widths,
+                        mimes,
+                    )
+                    for photo in photo_service.get_rebuild_batch(
+                        progress["after_id"], chunk_size
+                    )
+                ]
+            finally:
+                db.close()
+            if not tasks:
+                break
+
+            retired = []
+            for task, (photo_id, report, error) in zip(
+                tasks, executor.map(_rebuild_photo, tasks)
+            ):
+                if error:
+                    progress["failed"][str(photo_id)] = error
+                    continue
+                progress["photos"] += 1
+                retired.append((task[1], report.pop("superseded")))
+                for key, value in report.items():
+                    progress[key] += value
+            processed += len(tasks)
+
+            # Queue superseded renditions before the checkpoint moves past them
+            db = SessionLocal()
+            try:
+                photo_service = PhotoService(db)
+                for directory, names in retired:
+                    photo_service.retire_renditions(directory, names)
+                    progress["retired"] = progress.get("retired", 0) + len(names)
+            finally:
+                db.close()
+
+            if max_rate:
+                # Sleep off the time this run got ahead of the allowed rate
+                ahead = processed / max_rate - (time.monotonic() - run_started)
+                time.sleep(max(0.0, ahead))
+
+            progress["after_id"] = tasks[-1][0]
+            progress["elapsed"] = elapsed_before + time.monotonic() - run_started
+            _save_rebuild_checkpoint(checkpoint, progress)
+            click.echo(
+                f"Rebuilt {progress['photos']} photos up to ID {progress['after_id']}, "
+                f"{len(progress['failed'])} failed."
+            )
+
+    _print_rebuild_report(progress)
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
+
+
+def _init_rebuild_worker(config):
+    """Gives a `rebuild` worker process an app context of its own."""
+    app = Flask(__name__)
+    app.config.update(config)
+    app.app_context().push()
+
+
+def _rebuild_photo(task):
+    """Rebuilds one photo's renditions in a worker process.
+
+    Returns:
+        tuple: The photo ID, the size report (None on failure), and the
+            error message (None on success).
+    """
+    photo_id, directory, filename, width, widths, mimes = task
+    try:
+        report = PhotoService(None).rebuild_renditions(  # type: ignore[arg-type]
+            directory, filename, width, widths, mimes
+        )
+    except Exception as error:
+        return photo_id, None, str(error)
+    return photo_id, report, None
+
+
+def _load_rebuild_checkpoint(path, widths, mimes, restart):
+    """Returns the progress saved by an interrupted `rebuild` with the same
+    widths and formats, or a fresh one.
+    """
+    fresh = {
+        "widths": widths,
+        "mimes": mimes,
+        "after_id": 0,
+        "photos": 0,
+        "failed": {},
+        "files": 0,
+        "bytes_before": 0,
+        "bytes_after": 0,
+        "bytes_created": 0,
+        "retired": 0,
+        "elapsed": 0.0,
+    }
+    if restart or not os.path.exists(path):
+        return fresh
+    with open(path) as handle:
+        progress = json.load(handle)
+    if progress.get("widths") != widths or progress.get("mimes") != mimes:
+        raise click.ClickException(
+            f"{path} belongs to a rebuild with other widths or formats. "
+            "Pass --restart to discard it."
+        )
+    return progress
+
+
+def _save_rebuild_checkpoint(path, progress):
+    """Writes the checkpoint atomically, so an interrupt never corrupts it."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as handle:
+        json.dump(progress, handle)
+    os.replace(tmp_path, path)
+
+
+def _print_rebuild_report(progress):
+    elapsed = progress["elapsed"]
+    rate = progress["photos"] / elapsed if elapsed else 0.0
+    saved = progress["bytes_before"] - progress["bytes_after"]
+    click.echo(
+        f"Rebuilt {progress['photos']} photos ({progress['files']} files) "
+        f"in {elapsed:.1f}s, {rate:.1f} photos/s."
+    )
+    click.echo(
+        f"Replaced files: {progress['bytes_before']} -> {progress['bytes_after']} "
+        f"bytes ({saved} bytes saved). New files: {progress['bytes_created']} bytes."
+    )
+    click.echo(f"Queued {progress.get('retired', 0)} superseded files for the reaper.")
+    if progress["failed"]:
+        click.echo(f"{len(progress['failed'])} photos failed:")
+        for photo_id, error in progress["failed"].items():
+            click.echo(f"  {photo_id}: {error}")
@@ -1,5 +1,5 @@
 from functools import wraps
-from flask import jsonify
+from flask import g, jsonify
 from flask_jwt_extended import get_jwt_identity
 
 
@@ -18,6 +18,8 @@ def require_user_id(fn):
         except (TypeError, ValueError):
             return jsonify({"error": "Unauthorized: invalid identity"}), 401
 
+        # Lets after_request hooks attribute writes to the user
+        g.user_id = user_id
         return fn(user_id=user_id, *args, **kwargs)
 
     return wrapper
@@ -0,0 +1,89 @@
+import hashlib
+import time
+from datetime import date
+from functools import wraps
+
+from flask import current_app, g, make_response, request
+
+from app.models.database import SessionLocal
+from app.services.data_version_service import DataVersionService
+from app.services.photo_service import PhotoService
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+def conditional_json(scope):
+    """Answers conditional GETs of a JSON endpoint with a weak ETag.
+
+    `scope` maps the view's keyword arguments to the DataVersion scope whose
+    writes change the response. The ETag also covers the current day and the
+    signed photo URL window, which change the body without any write, and a
+    hash of the scope so that two users who share a browser cache and happen
+    to have the same version never match each other's ETags. A matching
+    `If-None-Match` returns 304 before the view runs.
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            scope_key = scope(**kwargs)
+            db = SessionLocal()
+            try:
+                version = DataVersionService(db).get_version(scope_key)
+            finally:
+                db.close()
+
+            ttl = current_app.config.get("PHOTO_URL_TTL", PhotoService.SIGNED_URL_TTL)
+            scope_hash = hashlib.sha256(scope_key.encode()).hexdigest()[:12]
+            etag = (
+                f"{scope_hash}-{version}-{date.today().isoformat()}"
+                f"-{int(time.time()) // ttl}"
+            )
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(fn(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            # Always revalidate, so a write is never hidden by a cached body
+            response.set_etag(etag, weak=True)
+            response.headers.set("Cache-Control", "private, no-cache")
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def read_only(fn):
+    """Marks a POST view that changes nothing, so `record_write` leaves the
+    data versions alone.
+    """
+    fn.read_only = True
+    return fn
+
+
+def record_write(response):
+    """Bumps the data version of whatever a successful write request touched.
+    Registered as an `after_request` hook.
+    """
+    if request.method not in WRITE_METHODS or response.status_code >= 400:
+        return response
+    view = current_app.view_functions.get(request.endpoint)  # type: ignore[arg-type]
+    if getattr(view, "read_only", False):
+        return response
+
+    if request.blueprint == "species":
+        scope = DataVersionService.SPECIES_SCOPE
+    elif g.get("user_id") is not None:
+        scope = DataVersionService.user_scope(g.user_id)
+    else:
+        return response
+
+    db = SessionLocal()
+    try:
+        DataVersionService(db).bump(scope)
+    finally:
+        db.close()
+    return response
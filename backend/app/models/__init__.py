@@ -1,6 +1,10 @@
 from app.models.care_plan import CarePlan
 from app.models.care_type import CareType
+from app.models.data_version import DataVersion
 from app.models.photo import Photo
+from app.models.photo_blob import PhotoBlob
+from app.models.photo_job import PhotoJob
+from app.models.photo_tombstone import PhotoTombstone
 from app.models.plant import Plant
 from app.models.plant_care import PlantCare
 from app.models.species import Species
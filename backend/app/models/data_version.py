@@ -0,0 +1,20 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from app.models.database import Base
+
+
+class DataVersion(Base):
+    """Represents a change counter for one scope of cached data, such as a
+    user's plants and photos or the shared species list"""
+
+    __tablename__ = "data_versions"
+
+    scope = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.models.database import Base
@@ -10,17 +10,45 @@ class Photo(Base):
     """Represents a photo attached to a Plant or a PlantCare"""
 
     __tablename__ = "photos"
+    # Galleries filter by owner and read in capture order
+    __table_args__ = (
+        Index("ix_photos_plant_id_taken_at", "plant_id", "taken_at", "created_at"),
+        Index(
+            "ix_photos_care_log_id_taken_at", "care_log_id", "taken_at", "created_at"
+        ),
+        Index(
+            "ix_photos_gallery_plant_id_taken_at",
+            "gallery_plant_id",
+            "taken_at",
+            "created_at",
+            "id",
+        ),
+    )
+
+    STATUS_PENDING = "pending"
+    STATUS_READY = "ready"
+    STATUS_FAILED = "failed"
 
     id = Column(Integer, primary_key=True, index=True)
     plant_id = Column(
         Integer,
         ForeignKey("plants.id", ondelete="CASCADE"),
-        index=True,
         nullable=True,
     )
     care_log_id = Column(
         Integer,
         ForeignKey("plant_care.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    # Plant whose gallery shows this photo, directly or through a care log
+    gallery_plant_id = Column(
+        Integer,
+        ForeignKey("plants.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    blob_id = Column(
+        Integer,
+        ForeignKey("photo_blobs.id", ondelete="SET NULL"),
         index=True,
         nullable=True,
     )
@@ -30,9 +58,21 @@ class Photo(Base):
     size_bytes = Column(Integer, nullable=False)
     width = Column(Integer)
     height = Column(Integer)
+    # Tiny base64 JPEG data URI shown while the real image loads
+    placeholder = Column(String)
     position = Column(Integer, default=0)
     taken_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    status = Column(
+        String, nullable=False, default=STATUS_READY, server_default=STATUS_READY
+    )
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
     plant = relationship("Plant", back_populates="photos", foreign_keys=[plant_id])
     care_log = relationship("PlantCare", back_populates="photos")
+    blob = relationship("PhotoBlob", back_populates="photos")
+    jobs = relationship(
+        "PhotoJob",
+        back_populates="photo",
+        cascade="all, delete",
+        passive_deletes=True,
+    )
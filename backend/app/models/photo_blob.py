@@ -0,0 +1,29 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.orm import relationship
+
+from app.models.database import Base
+
+
+class PhotoBlob(Base):
+    """Represents processed photo content shared by every Photo uploaded
+    with the same bytes"""
+
+    __tablename__ = "photo_blobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    sha256 = Column(String(64), nullable=False, unique=True, index=True)
+    filename = Column(String, nullable=False)
+    mime_type = Column(String, nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    width = Column(Integer)
+    height = Column(Integer)
+    # Tiny base64 JPEG data URI shown while the real image loads
+    placeholder = Column(String)
+    # EXIF capture date, if any; each Photo keeps its own taken_at
+    taken_at = Column(DateTime)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    photos = relationship("Photo", back_populates="blob", passive_deletes=True)
@@ -0,0 +1,35 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.orm import relationship
+
+from app.models.database import Base
+
+
+class PhotoJob(Base):
+    """Represents a queued image-processing job for a pending Photo"""
+
+    __tablename__ = "photo_jobs"
+
+    STATUS_PENDING = "pending"
+    STATUS_PROCESSING = "processing"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    id = Column(Integer, primary_key=True, index=True)
+    photo_id = Column(
+        Integer,
+        ForeignKey("photos.id", ondelete="CASCADE"),
+        index=True,
+        nullable=False,
+    )
+    status = Column(String, nullable=False, default=STATUS_PENDING, index=True)
+    source_path = Column(String, nullable=False)
+    taken_at = Column(DateTime)
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    photo = relationship("Photo", back_populates="jobs")
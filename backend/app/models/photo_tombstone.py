@@ -0,0 +1,21 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Integer, String, Text
+
+from app.models.database import Base
+
+
+class PhotoTombstone(Base):
+    """Represents photo files awaiting deletion by the reaper, recorded in
+    the same transaction as the rows they belonged to"""
+
+    __tablename__ = "photo_tombstones"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Relative to UPLOAD_FOLDER, so every node resolves the same files
+    directory = Column(String, nullable=False)
+    # Original whose variants are deleted; None deletes the whole directory
+    filename = Column(String)
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Text, Date, ForeignKey
+from sqlalchemy import Column, Integer, Text, Date, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.models.database import Base
 
@@ -7,6 +7,15 @@ class PlantCare(Base):
     """Represents a log/action of PlantCare performed by a User"""
 
     __tablename__ = "plant_care"
+    # Per-plant lookups: gallery care logs and latest log per care type
+    __table_args__ = (
+        Index(
+            "ix_plant_care_plant_id_care_type_id_care_date",
+            "plant_id",
+            "care_type_id",
+            "care_date",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     plant_id = Column(Integer, ForeignKey("plants.id"), nullable=False)
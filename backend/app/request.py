@@ -0,0 +1,65 @@
+from tempfile import SpooledTemporaryFile
+from typing import IO
+
+from flask import Request, current_app
+from werkzeug.exceptions import RequestEntityTooLarge
+
+# Parts up to this size stay in memory, larger ones spill to a temp file
+SPOOL_MAX_MEMORY = 512 * 1024
+
+
+class UploadTooLarge(RequestEntityTooLarge):
+    """Raised while parsing when one uploaded file exceeds MAX_UPLOAD_SIZE."""
+
+    def __init__(self, filename: str | None, limit: int):
+        name = f"'{filename}'" if filename else "An uploaded file"
+        super().__init__(
+            f"{name} is larger than the {_megabytes(limit)} MB limit per file."
+        )
+        self.filename = filename
+        self.limit = limit
+
+
+class LimitedSpool(SpooledTemporaryFile):
+    """Spools one multipart file part, aborting as soon as it grows past
+    `limit` bytes.
+    """
+
+    def __init__(self, filename: str | None, limit: int | None):
+        super().__init__(max_size=SPOOL_MAX_MEMORY, mode="rb+")
+        self.filename = filename
+        self.limit = limit
+        self.received = 0
+
+    def write(self, data: bytes) -> int:
+        self.received += len(data)
+        if self.limit is not None and self.received > self.limit:
+            self.close()
+            raise UploadTooLarge(self.filename, self.limit)
+        return super().write(data)
+
+
+class UploadRequest(Request):
+    """Request that checks each uploaded file against MAX_UPLOAD_SIZE while
+    the multipart body is parsed.
+
+    Werkzeug streams multipart bodies part by part, so the first file past the
+    limit stops parsing there; the rest of the body is never read. The request
+    as a whole is capped separately by MAX_CONTENT_LENGTH.
+    """
+
+    def _get_file_stream(
+        self,
+        total_content_length: int | None,
+        content_type: str | None,
+        filename: str | None = None,
+        content_length: int | None = None,
+    ) -> IO[bytes]:
+        limit = current_app.config.get("MAX_UPLOAD_SIZE")
+        if limit is not None and content_length and content_length > limit:
+            raise UploadTooLarge(filename, limit)
+        return LimitedSpool(filename, limit)
+
+
+def _megabytes(size: int) -> str:
+    return f"{size / (1024 * 1024):g}"
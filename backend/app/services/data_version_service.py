@@ -0,0 +1,63 @@
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import DataVersion
+
+
+class DataVersionService:
+    """Service class that tracks change counters used to answer conditional
+    GETs without rebuilding responses.
+
+    Attributes:
+        db (Session):
+            - SQLAlchemy session used to interact with the database.
+    """
+
+    SPECIES_SCOPE = "species"
+
+    def __init__(self, db: Session):
+        """Initializes the DataVersionService with a given SQLAlchemy session.
+
+        Args:
+            db (Session):
+                - An active SQLAlchemy session.
+        """
+        self.db = db
+
+    @staticmethod
+    def user_scope(user_id: int) -> str:
+        """Returns the scope covering everything a user owns."""
+        return f"user:{user_id}"
+
+    def get_version(self, scope: str) -> int:
+        """Returns the current version of a scope, 0 if it never changed.
+
+        Args:
+            scope (str): The data scope, e.g. from `user_scope`.
+
+        Returns:
+            int: The version counter.
+        """
+        row = self.db.query(DataVersion.version).filter_by(scope=scope).first()
+        return row[0] if row else 0
+
+    def bump(self, scope: str) -> None:
+        """Increments the version of a scope and commits.
+
+        Args:
+            scope (str): The data scope that changed.
+        """
+        for _ in range(2):
+            updated = (
+                self.db.query(DataVersion)
+                .filter_by(scope=scope)
+                .update({DataVersion.version: DataVersion.version + 1})
+            )
+            if not updated:
+                self.db.add(DataVersion(scope=scope, version=1))
+            try:
+                self.db.commit()
+                return
+            except IntegrityError:
+                # Another request created the row first; increment it instead
+                self.db.rollback()
@@ -0,0 +1,128 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from flask import current_app
+
+_create_lock = threading.Lock()
+
+
+class ImageWorkBusy(Exception):
+    """Raised when image work could not start within the queue timeout."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("The server is busy processing other images. Try again shortly.")
+        self.retry_after = retry_after
+
+
+class ImageWorkLimiter:
+    """Bounds the image decoding done at once in this process, both by the
+    number of images and by their combined estimated memory.
+
+    Work that cannot start right away waits in line for up to `max_wait`
+    seconds before giving up with ImageWorkBusy, so a burst of large uploads
+    is answered with 503s instead of exhausting the worker's memory.
+    """
+
+    def __init__(self, max_concurrent: int, max_bytes: int, max_wait: float):
+        """Initializes the limiter.
+
+        Args:
+            max_concurrent (int): Images decoded at once.
+            max_bytes (int): Combined estimated decode memory. A single image
+                above it runs alone rather than never.
+            max_wait (float): Seconds to wait in line before giving up.
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_bytes = max_bytes
+        self.max_wait = max_wait
+        self._condition = threading.Condition()
+        self._active = 0
+        self._bytes = 0
+        self._queued = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    @contextmanager
+    def acquire(self, cost: int) -> Iterator[None]:
+        """Holds a slot and `cost` bytes of the budget for the duration of
+        the block.
+
+        Raises:
+            ImageWorkBusy: If the work could not start within `max_wait`.
+        """
+        cost = min(cost, self.max_bytes)
+        started = time.monotonic()
+        deadline = started + self.max_wait
+        with self._condition:
+            self._queued += 1
+            try:
+                while (
+                    self._active >= self.max_concurrent
+                    or self._bytes + cost > self.max_bytes
+                ):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._rejected += 1
+                        raise ImageWorkBusy(self._retry_after())
+                    self._condition.wait(remaining)
+            finally:
+                self._queued -= 1
+            waited = time.monotonic() - started
+            self._wait_seconds += waited
+            self._max_wait_seconds = max(self._max_wait_seconds, waited)
+            self._active += 1
+            self._bytes += cost
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active -= 1
+                self._bytes -= cost
+                self._completed += 1
+                self._condition.notify_all()
+
+    def stats(self) -> dict:
+        """Returns the current load and the counters since startup."""
+        with self._condition:
+            started = self._completed + self._active
+            return {
+                "active": self._active,
+                "queued": self._queued,
+                "bytes_in_use": self._bytes,
+                "max_concurrent": self.max_concurrent,
+                "max_bytes": self.max_bytes,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "wait_seconds_total": round(self._wait_seconds, 3),
+                "wait_seconds_avg": round(self._wait_seconds / started, 3)
+                if started
+                else 0.0,
+                "wait_seconds_max": round(self._max_wait_seconds, 3),
+            }
+
+    def _retry_after(self) -> int:
+        """Returns the seconds a rejected client should wait: the time the
+        queue ahead of it is likely to take, at least one second.
+        """
+        return max(1, round(self.max_wait * (1 + self._queued / self.max_concurrent)))
+
+
+def get_image_limiter() -> ImageWorkLimiter:
+    """Returns the process-wide image work limiter, created on first use
+    from the `PHOTO_IMAGE_*` settings.
+    """
+    with _create_lock:
+        limiter = current_app.extensions.get("image_work_limiter")
+        if limiter is None:
+            config = current_app.config
+            limiter = ImageWorkLimiter(
+                config.get("PHOTO_IMAGE_CONCURRENCY", 4),
+                config.get("PHOTO_IMAGE_MEMORY_BUDGET", 1024 * 1024 * 1024),
+                config.get("PHOTO_IMAGE_QUEUE_TIMEOUT", 10.0),
+            )
+            current_app.extensions["image_work_limiter"] = limiter
+        return limiter
@@ -1,34 +1,140 @@
+import base64
+import fcntl
+import functools
+import hashlib
+import hmac
 import io
+import json
+import math
 import os
+import re
 import shutil
+import struct
+import tempfile
+import time
 import uuid
-from datetime import datetime, timezone
-from typing import List, Optional
+import zipfile
+import zlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import IO, Iterator, List, Optional, Sequence
+from urllib.parse import quote, urlencode
 
 import magic
 from flask import current_app
 from PIL import Image, ImageOps
 from pillow_heif import register_heif_opener
-from sqlalchemy import func
+from sqlalchemy import and_, func, or_, select, tuple_
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
-from werkzeug.datastructures import FileStorage
-
-from app.models import Photo, PlantCare
+from sqlalchemy.orm import Session, aliased
+from werkzeug.datastructures import FileStorage, MIMEAccept
+
+from app.models import (
+    CareType,
+    Photo,
+    PhotoBlob,
+    PhotoJob,
+    PhotoTombstone,
+    PlantCare,
+)
 from app.models.plant import Plant
+from app.services.data_version_service import DataVersionService
+from app.services.image_work_limiter import ImageWorkBusy, get_image_limiter
+from app.storage import LocalStorage, StorageDeleteError, get_storage
+from app.storage.base import write_file
 
 register_heif_opener()
 
 
+class PreviewUpload:
+    """An upload already processed by `cache_preview`, submitted by its
+    token in place of the file. `_store_batch` claims it from the preview
+    cache, filling in the remaining attributes.
+    """
+
+    def __init__(self, token: str, user_id: int):
+        self.token = token
+        self.user_id = user_id
+        self.filename: Optional[str] = None
+        self.sha256: Optional[str] = None
+        self.directory: Optional[str] = None
+        self.meta: dict = {}
+
+
+class ArchiveSink(io.RawIOBase):
+    """Write-only, unseekable buffer that `zipfile` writes an archive into
+    while `PhotoService.stream_archive` drains it chunk by chunk.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore[override]
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        """Returns and forgets everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
 class PhotoService:
     """Service class that handles business logic for Photo operations"""
 
     THUMBNAIL_WIDTH = 400
+    RENDITION_WIDTHS = (160, 400, 800, 1600)
+    RENDITION_LOCK_STRIPES = 64
     PREVIEW_MAX_DIMENSION = 1200
     JPEG_QUALITY_ORIGINAL = 85
     JPEG_QUALITY_THUMBNAIL = 80
+    PLACEHOLDER_WIDTH = 16
+    JPEG_QUALITY_PLACEHOLDER = 50
     OUTPUT_MIME = "image/jpeg"
     OUTPUT_EXT = ".jpg"
+    # Rendition formats in order of preference: MIME -> (extension, Pillow format, quality)
+    RENDITION_FORMATS = {
+        "image/avif": (".avif", "AVIF", 60),
+        "image/webp": (".webp", "WEBP", 80),
+        "image/jpeg": (OUTPUT_EXT, "JPEG", JPEG_QUALITY_THUMBNAIL),
+    }
+    RESIZE_FILTER = Image.Resampling.LANCZOS
+    RESIZE_REDUCING_GAP = 2.0
+    PROCESSING_WORKERS = 4
+    MIME_SNIFF_BYTES = 8192
+    SPOOL_CHUNK_SIZE = 64 * 1024
+    # JPEG originals in these modes are stored as uploaded; CMYK and YCCK
+    # decode differently across viewers, so those are re-encoded as RGB
+    PASSTHROUGH_MODES = ("L", "RGB")
+    # Decoding, transposing and converting briefly hold about two full bitmaps
+    DECODE_PEAK_FACTOR = 2
+    MAX_DECODE_BYTES = 512 * 1024 * 1024
+    UPLOAD_SUFFIX = ".upload"
+    PREVIEW_CACHE_DIR = "preview-cache"
+    PREVIEW_CACHE_MAX_BYTES = 256 * 1024 * 1024
+    PREVIEW_TOKEN_TTL = 60 * 60
+    BLOB_DIR = "blobs"
+    WORKING_COPY_MAX_BYTES = 5 * 1024 * 1024 * 1024
+    WORKING_COPY_REVALIDATE_AFTER = 5 * 60
+    SIGNED_URL_PREFIX = "/api/photos/signed/"
+    SIGNED_URL_TTL = 24 * 60 * 60
+    GALLERY_PAGE_MAX = 100
+    THUMBNAIL_BATCH_MAX = 100
+    BYTE_RANGES_MAX = 16
+    MAX_JOB_ATTEMPTS = 3
+    JOB_STALE_AFTER = timedelta(minutes=10)
 
     def __init__(self, db: Session):
         """Initializes the PhotoService with a given SQLAlchemy session.
@@ -38,6 +144,11 @@ class PhotoService:
         """
         self.db = db
         self.upload_folder = current_app.config["UPLOAD_FOLDER"]
+        self.storage = get_storage()
+        self.image_limiter = get_image_limiter()
+        self.revalidate_after = current_app.config.get(
+            "PHOTO_WORKING_COPY_REVALIDATE", self.WORKING_COPY_REVALIDATE_AFTER
+        )
 
     # --- UPLOAD ---
 
@@ -57,14 +168,19 @@ class PhotoService:
             Photo: The created Photo object.
 
         Raises:
-            ValueError: If MIME type is not allowed.
+            ValueError: If the file could not be stored.
             IntegrityError: If DB commit fails.
         """
-        target_dir = os.path.join(self.upload_folder, "plants", str(plant_id))
-        meta = self._process_and_save(file_storage, target_dir, taken_at)
-        meta["plant_id"] = plant_id
-        meta["position"] = self._next_position(plant_id=plant_id)
-        return self._create_photo_row(meta)
+        metas, errors = self._store_batch([file_storage], [taken_at])
+        if errors:
+            raise ValueError(errors[0])
+        metas[0]["plant_id"] = plant_id
+        metas[0]["gallery_plant_id"] = plant_id
+        metas[0]["position"] = self._next_position(plant_id=plant_id)
+        photos, errors = self._create_photo_rows(metas)
+        if errors:
+            raise ValueError(errors[0])
+        return photos[0]
 
     def upload_care_log_photo(
         self, care_log_id: int, file_storage: FileStorage
@@ -79,51 +195,372 @@ class PhotoService:
             Photo: The created Photo object.
 
         Raises:
-            ValueError: If MIME type is not allowed.
+            ValueError: If the file could not be stored.
             IntegrityError: If DB commit fails.
         """
-        target_dir = os.path.join(self.upload_folder, "care-logs", str(care_log_id))
         care_log = self.db.query(PlantCare).filter_by(id=care_log_id).first()
         taken_at = (
             datetime.combine(care_log.care_date, datetime.min.time())
             if care_log and care_log.care_date
             else None
         )
-        meta = self._process_and_save(file_storage, target_dir, taken_at)
-        meta["care_log_id"] = care_log_id
-        meta["position"] = self._next_position(care_log_id=care_log_id)
-        return self._create_photo_row(meta)
+        metas, errors = self._store_batch([file_storage], [taken_at])
+        if errors:
+            raise ValueError(errors[0])
+        metas[0]["care_log_id"] = care_log_id
+        metas[0]["gallery_plant_id"] = care_log.plant_id if care_log else None
+        metas[0]["position"] = self._next_position(care_log_id=care_log_id)
+        photos, errors = self._create_photo_rows(metas)
+        if errors:
+            raise ValueError(errors[0])
+        return photos[0]
+
+    def upload_plant_photos(
+        self,
+        plant_id: int,
+        files: Sequence[FileStorage | PreviewUpload],
+        taken_ats: Optional[Sequence[Optional[datetime]]] = None,
+    ) -> tuple[dict[int, Photo], dict[int, str]]:
+        """Processes a batch of uploads for a Plant concurrently and records
+        every successful one in a single commit.
 
-    # --- READ ---
+        Args:
+            plant_id (int): The owning Plant's ID.
+            files (Sequence[FileStorage or PreviewUpload]): The uploaded files,
+                or cached previews, in request order.
+            taken_ats (Sequence[datetime or None], optional): Per-file capture dates.
 
-    def create_preview(self, file_storage: FileStorage) -> io.BytesIO:
-        """Converts an upload to a JPEG preview without writing it to disk.
+        Returns:
+            tuple: Created photos and error messages, each keyed by upload index.
 
-        This lets browsers preview HEIC files using the same server-side decoder
-        used for the final upload.
+        Raises:
+            IntegrityError: If DB commit fails.
         """
-        allowed = current_app.config["ALLOWED_MIME_TYPES"]
-        file_storage.seek(0)
-        raw = file_storage.read()
-        detected_mime = magic.from_buffer(raw, mime=True)
-        if detected_mime not in allowed:
-            raise ValueError(f"Unsupported file type: {detected_mime}.")
+        metas, errors = self._store_batch(files, taken_ats)
+        position = self._next_position(plant_id=plant_id)
+        for index in sorted(metas):
+            metas[index]["plant_id"] = plant_id
+            metas[index]["gallery_plant_id"] = plant_id
+            metas[index]["position"] = position
+            position += 1
+        photos, lost = self._create_photo_rows(metas)
+        return photos, {**errors, **lost}
+
+    def upload_care_log_photos(
+        self, care_log_id: int, files: Sequence[FileStorage | PreviewUpload]
+    ) -> tuple[dict[int, Photo], dict[int, str]]:
+        """Processes a batch of uploads for a PlantCare log concurrently and
+        records every successful one in a single commit.
 
-        img = ImageOps.exif_transpose(Image.open(io.BytesIO(raw)))
-        if img.mode != "RGB":
-            img = img.convert("RGB")
-        img.thumbnail(
-            (self.PREVIEW_MAX_DIMENSION, self.PREVIEW_MAX_DIMENSION),
-            Image.Resampling.LANCZOS,
+        Args:
+            care_log_id (int): The owning PlantCare log's ID.
+            files (Sequence[FileStorage or PreviewUpload]): The uploaded files,
+                or cached previews, in request order.
+
+        Returns:
+            tuple: Created photos and error messages, each keyed by upload index.
+
+        Raises:
+            IntegrityError: If DB commit fails.
+        """
+        care_log = self.db.query(PlantCare).filter_by(id=care_log_id).first()
+        taken_at = (
+            datetime.combine(care_log.care_date, datetime.min.time())
+            if care_log and care_log.care_date
+            else None
         )
-        preview = io.BytesIO()
-        img.save(preview, format="JPEG", quality=self.JPEG_QUALITY_ORIGINAL)
-        preview.seek(0)
-        return preview
+        metas, errors = self._store_batch(files, [taken_at] * len(files))
+        position = self._next_position(care_log_id=care_log_id)
+        for index in sorted(metas):
+            metas[index]["care_log_id"] = care_log_id
+            metas[index]["gallery_plant_id"] = care_log.plant_id if care_log else None
+            metas[index]["position"] = position
+            position += 1
+        photos, lost = self._create_photo_rows(metas)
+        return photos, {**errors, **lost}
+
+    # --- ASYNC PROCESSING ---
+
+    def enqueue_plant_photos(
+        self,
+        plant_id: int,
+        files: Sequence[FileStorage],
+        taken_ats: Optional[Sequence[Optional[datetime]]] = None,
+    ) -> tuple[dict[int, PhotoJob], dict[int, str]]:
+        """Stores a batch of raw uploads for a Plant and queues them for the
+        photo worker instead of processing them inside the request.
+
+        Args:
+            plant_id (int): The owning Plant's ID.
+            files (Sequence[FileStorage]): The uploaded files, in request order.
+            taken_ats (Sequence[datetime or None], optional): Per-file capture dates.
+
+        Returns:
+            tuple: Queued jobs and error messages, each keyed by upload index.
+
+        Raises:
+            IntegrityError: If DB commit fails.
+        """
+        target_dir = os.path.join(self.upload_folder, "plants", str(plant_id))
+        return self._enqueue_batch(
+            files,
+            target_dir,
+            taken_ats,
+            owner={"plant_id": plant_id, "gallery_plant_id": plant_id},
+            position=self._next_position(plant_id=plant_id),
+        )
+
+    def enqueue_care_log_photos(
+        self, care_log_id: int, files: Sequence[FileStorage]
+    ) -> tuple[dict[int, PhotoJob], dict[int, str]]:
+        """Stores a batch of raw uploads for a PlantCare log and queues them
+        for the photo worker.
+
+        Args:
+            care_log_id (int): The owning PlantCare log's ID.
+            files (Sequence[FileStorage]): The uploaded files, in request order.
+
+        Returns:
+            tuple: Queued jobs and error messages, each keyed by upload index.
+
+        Raises:
+            IntegrityError: If DB commit fails.
+        """
+        target_dir = os.path.join(self.upload_folder, "care-logs", str(care_log_id))
+        care_log = self.db.query(PlantCare).filter_by(id=care_log_id).first()
+        taken_at = (
+            datetime.combine(care_log.care_date, datetime.min.time())
+            if care_log and care_log.care_date
+            else None
+        )
+        return self._enqueue_batch(
+            files,
+            target_dir,
+            [taken_at] * len(files),
+            owner={
+                "care_log_id": care_log_id,
+                "gallery_plant_id": care_log.plant_id if care_log else None,
+            },
+            position=self._next_position(care_log_id=care_log_id),
+        )
+
+    def get_job(self, job_id: int) -> Optional[PhotoJob]:
+        """Fetches a single PhotoJob by its ID."""
+        return self.db.query(PhotoJob).filter_by(id=job_id).first()
+
+    def get_queue_position(self, job: PhotoJob) -> Optional[int]:
+        """Returns how many pending jobs are ahead of the given job, or None
+        if the job is no longer waiting.
+        """
+        if job.status != PhotoJob.STATUS_PENDING:
+            return None
+        return (
+            self.db.query(func.count(PhotoJob.id))
+            .filter(
+                PhotoJob.status == PhotoJob.STATUS_PENDING,
+                PhotoJob.id < job.id,
+            )
+            .scalar()
+        )
+
+    def claim_next_job(self) -> Optional[PhotoJob]:
+        """Locks and claims the oldest runnable job for this worker.
+
+        Jobs left in `processing` by a worker that died are reclaimed once
+        they are older than JOB_STALE_AFTER, up to MAX_JOB_ATTEMPTS times.
+
+        Returns:
+            PhotoJob or None: The claimed job, or None if the queue is empty.
+        """
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        while True:
+            job = (
+                self.db.query(PhotoJob)
+                .filter(
+                    or_(
+                        PhotoJob.status == PhotoJob.STATUS_PENDING,
+                        and_(
+                            PhotoJob.status == PhotoJob.STATUS_PROCESSING,
+                            PhotoJob.started_at < now - self.JOB_STALE_AFTER,
+                        ),
+                    )
+                )
+                .order_by(PhotoJob.id.asc())
+                .with_for_update(skip_locked=True)
+                .first()
+            )
+            if job is None:
+                self.db.rollback()
+                return None
+
+            if job.attempts >= self.MAX_JOB_ATTEMPTS:
+                self._fail_job(job, f"Gave up after {job.attempts} attempts.")
+                continue
+
+            job.status = PhotoJob.STATUS_PROCESSING
+            job.attempts += 1
+            job.started_at = now
+            self.db.commit()
+            self.db.refresh(job)
+            return job
+
+    def run_job(self, job: PhotoJob) -> bool:
+        """Processes a claimed job's raw upload and marks its Photo ready.
+
+        Content that is already in the blob store is linked without decoding.
+
+        Args:
+            job (PhotoJob): A job returned by claim_next_job.
+
+        Returns:
+            bool: True if the photo was processed, False if processing failed
+                or the job was put back in the queue.
+        """
+        photo = job.photo
+        try:
+            # The upload may have been queued on another node
+            self._fetch(job.source_path)
+            with open(job.source_path, "rb") as source:
+                upload = FileStorage(source, filename=photo.original_filename)
+                digest = self._hash_upload(upload)
+                blob = self.db.query(PhotoBlob).filter_by(sha256=digest).first()
+                if blob is None:
+                    meta = self._process_and_save(
+                        upload,
+                        self._blob_directory(digest),
+                        filename=f"{digest}{self.OUTPUT_EXT}",
+                    )
+                    blob = self._new_blob(digest, meta)
+                    self._publish_variants(self._blob_directory(digest), meta["filename"])
+        except ImageWorkBusy as error:
+            # Not the upload's fault; try again once image work frees up
+            self._requeue_job(job, str(error), count_attempt=False)
+            return False
+        except Exception as error:
+            self._fail_job(job, str(error))
+            return False
+
+        try:
+            blob = self._link_blob(blob, 1)
+            if blob is None:
+                raise ValueError("The stored content was deleted while processing.")
+            photo.blob = blob
+            for key in ("filename", "mime_type", "size_bytes", "width", "height", "placeholder"):
+                setattr(photo, key, getattr(blob, key))
+            photo.taken_at = job.taken_at or blob.taken_at or photo.taken_at
+            photo.status = Photo.STATUS_READY
+            job.status = PhotoJob.STATUS_DONE
+            job.error = None
+            job.finished_at = datetime.now(timezone.utc).replace(tzinfo=None)
+            self.db.commit()
+        except Exception as error:
+            # Such as the blob being deleted meanwhile; the retry
+            # processes the upload again
+            self.db.rollback()
+            self._requeue_job(job, str(error))
+            return False
+        self._record_change(photo)
+
+        try:
+            os.remove(job.source_path)
+        except FileNotFoundError:
+            pass
+        self.storage.delete_many([self._storage_key(job.source_path)])
+        return True
+
+    # --- READ ---
+
+    def cache_preview(
+        self, user_id: int, file_storage: FileStorage
+    ) -> tuple[io.BytesIO, str]:
+        """Fully processes an upload into the preview cache and returns a
+        JPEG preview plus a short-lived upload token.
+
+        This lets browsers preview HEIC files using the same server-side
+        decoder used for the final upload.
+
+        Submitting the token in place of the file to a plant or care log
+        upload reuses the cached result, skipping sniffing, decoding and
+        transposing. The cache is bounded by `PHOTO_PREVIEW_CACHE_BYTES`,
+        evicting least recently used entries first, and tokens expire after
+        `PHOTO_PREVIEW_TTL` seconds.
+
+        Raises:
+            ValueError: If the file is not a supported image or is too large
+                to decode.
+        """
+        digest = self._hash_upload(file_storage)
+        token = uuid.uuid4().hex
+        entry = os.path.join(self._preview_cache_dir(), token)
+        try:
+            meta = self._process_and_save(
+                file_storage, entry, filename=f"{digest}{self.OUTPUT_EXT}"
+            )
+            with Image.open(os.path.join(entry, meta["filename"])) as img:
+                preview = self._render_preview(img)
+            record = {
+                "user_id": user_id,
+                "sha256": digest,
+                "filename": (file_storage.filename or "")[:255],
+                "meta": {
+                    **meta,
+                    "taken_at": None,
+                    "captured_at": meta["captured_at"].isoformat()
+                    if meta["captured_at"]
+                    else None,
+                },
+            }
+            with open(os.path.join(entry, "meta.json"), "w") as handle:
+                json.dump(record, handle)
+        except Exception:
+            shutil.rmtree(entry, ignore_errors=True)
+            raise
+        self._evict_previews(keep=token)
+        return preview, token
 
     def get_photo(self, photo_id: int) -> Optional[Photo]:
-        """Fetches a single Photo by its ID."""
-        return self.db.query(Photo).filter_by(id=photo_id).first()
+        """Fetches a single Photo by its ID, without a query if the session
+        already loaded it.
+        """
+        return self.db.get(Photo, photo_id)
+
+    def get_photo_for_user(
+        self, photo_id: int, user_id: int
+    ) -> tuple[Optional[Photo], bool]:
+        """Fetches a Photo together with its ownership in a single query,
+        joining the plant whose gallery shows it.
+
+        Args:
+            photo_id (int): ID of the photo.
+            user_id (int): ID of the requesting user.
+
+        Returns:
+            tuple: The photo (None if not found) and whether the user owns it.
+        """
+        row = (
+            self.db.query(Photo, Plant.user_id)
+            .outerjoin(Plant, Photo.gallery_plant_id == Plant.id)
+            .filter(Photo.id == photo_id)
+            .first()
+        )
+        if row is None:
+            return None, False
+        photo, owner_id = row
+        return photo, owner_id == user_id
+
+    def get_user_photos(self, user_id: int, photo_ids: Sequence[int]) -> List[Photo]:
+        """Fetches the given photos that belong to the user's plants, directly
+        or through a care log, in a single query. IDs the user does not own or
+        that do not exist are left out.
+        """
+        if not photo_ids:
+            return []
+        return (
+            self.db.query(Photo)
+            .join(Plant, Photo.gallery_plant_id == Plant.id)
+            .filter(Photo.id.in_(photo_ids), Plant.user_id == user_id)
+            .all()
+        )
 
     def get_plant_photos(self, plant_id: int) -> List[Photo]:
         """Returns only the photos that belong directly to the Plant
@@ -157,45 +594,207 @@ class PhotoService:
         every photo attached to any of its care logs.
 
         The selected cover photo is pinned first. All remaining direct and care
-        log photos form one chronological timeline.
+        log photos form one chronological timeline. Photos still queued for
+        processing are included and flagged through their `status`.
+
+        The gallery, care log context and cover are loaded in a single query,
+        however many care logs the plant has.
         """
         featured: Optional[dict] = None
-        timeline: List[tuple[datetime, dict]] = []
-        cover = self.get_cover_photo(plant_id)
-        cover_photo_id = cover.id if cover else None
-
-        for photo in self.get_plant_photos(plant_id):
-            serialized = self._serialize_photo(
-                photo,
-                source_type="plant",
-                is_cover=photo.id == cover_photo_id,
-            )
-            if photo.id == cover_photo_id:
+        timeline: List[dict] = []
+        for row in self._gallery_query(plant_id).all():
+            serialized = self._serialize_gallery_row(*row)
+            if serialized["is_cover"]:
                 featured = serialized
             else:
-                timeline.append((photo.taken_at, serialized))
+                timeline.append(serialized)
+
+        return [featured, *timeline] if featured else timeline
+
+    def get_plant_gallery_page(
+        self, plant_id: int, limit: int, cursor: Optional[str] = None
+    ) -> tuple[List[dict], Optional[str]]:
+        """Returns one page of a Plant's gallery using keyset pagination.
+
+        The timeline is walked in `(taken_at, created_at, id)` order straight
+        off the gallery index, so later pages cost the same as the first. The
+        cover photo is pinned ahead of the first page only and is left out of
+        the timeline.
+
+        Args:
+            plant_id (int): ID of the Plant.
+            limit (int): Maximum number of timeline photos to return.
+            cursor (str, optional): `next_cursor` from the previous page.
+
+        Returns:
+            tuple: Serialized photos and the cursor for the next page, or None
+                if this is the last page.
+
+        Raises:
+            ValueError: If `limit` is not positive or `cursor` is malformed.
+        """
+        if limit < 1:
+            raise ValueError("limit must be a positive integer")
+        limit = min(limit, self.GALLERY_PAGE_MAX)
+
+        cover_photo_id = (
+            select(Plant.cover_photo_id).where(Plant.id == plant_id).scalar_subquery()
+        )
+        query = self._gallery_query(plant_id).filter(
+            Photo.id.is_distinct_from(cover_photo_id)
+        )
+        if cursor:
+            query = query.filter(
+                tuple_(Photo.taken_at, Photo.created_at, Photo.id)
+                > tuple_(*self._decode_gallery_cursor(cursor))
+            )
+        rows = query.limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1][0]
+            next_cursor = self._encode_gallery_cursor(last)
+
+        photos = [self._serialize_gallery_row(*row) for row in rows]
+        if not cursor:
+            cover = self._gallery_query(plant_id).filter(Photo.id == cover_photo_id)
+            photos = [self._serialize_gallery_row(*row) for row in cover] + photos
+        return photos, next_cursor
+
+    def _gallery_query(self, plant_id: int):
+        """Builds the gallery query for a Plant: each photo with its care log
+        context and the Plant's cover photo ID, in timeline order.
+        """
+        cover_photo_id = (
+            select(Plant.cover_photo_id).where(Plant.id == plant_id).scalar_subquery()
+        )
+        return (
+            self.db.query(
+                Photo,
+                PlantCare.care_date,
+                PlantCare.note,
+                CareType.name,
+                cover_photo_id,
+            )
+            .outerjoin(PlantCare, Photo.care_log_id == PlantCare.id)
+            .outerjoin(CareType, PlantCare.care_type_id == CareType.id)
+            .filter(Photo.gallery_plant_id == plant_id)
+            .order_by(Photo.taken_at.asc(), Photo.created_at.asc(), Photo.id.asc())
+        )
 
+    def _serialize_gallery_row(
+        self,
+        photo: Photo,
+        care_date,
+        note: Optional[str],
+        care_type: Optional[str],
+        cover_id: Optional[int],
+    ) -> dict:
+        """Serializes one row of `_gallery_query`."""
+        is_cover = photo.id == cover_id
+        if photo.plant_id is not None:
+            return self._serialize_photo(photo, source_type="plant", is_cover=is_cover)
         # Photos from each care log, with care metadata for context
-        care_logs = self.db.query(PlantCare).filter_by(plant_id=plant_id).all()
-        for log in care_logs:
-            for photo in self.get_care_log_photos(log.id):  # type: ignore[arg-type]
-                serialized = self._serialize_photo(
-                    photo,
-                    source_type="care_log",
-                    care_log_id=log.id,  # type: ignore[arg-type]
-                    care_type=log.care_type.name if log.care_type else None,
-                    care_date=log.care_date.isoformat() if log.care_date else None,  # type: ignore
-                    note=log.note,  # type: ignore[arg-type]
-                    is_cover=photo.id == cover_photo_id,
-                )
-                if photo.id == cover_photo_id:
-                    featured = serialized
-                else:
-                    timeline.append((photo.taken_at, serialized))
+        return self._serialize_photo(
+            photo,
+            source_type="care_log",
+            care_log_id=photo.care_log_id,  # type: ignore[arg-type]
+            care_type=care_type,
+            care_date=care_date.isoformat() if care_date else None,
+            note=note,
+            is_cover=is_cover,
+        )
+
+    @staticmethod
+    def _encode_gallery_cursor(photo: Photo) -> str:
+        """Encodes a photo's timeline position as an opaque page cursor."""
+        key = [
+            photo.taken_at.isoformat(),
+            photo.created_at.isoformat() if photo.created_at else None,
+            photo.id,
+        ]
+        raw = base64.urlsafe_b64encode(json.dumps(key).encode())
+        return raw.decode().rstrip("=")
+
+    @staticmethod
+    def _decode_gallery_cursor(cursor: str) -> tuple:
+        """Decodes a page cursor into `(taken_at, created_at, id)`.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            taken_at, created_at, photo_id = json.loads(
+                base64.urlsafe_b64decode(padded)
+            )
+            return (
+                datetime.fromisoformat(taken_at),
+                datetime.fromisoformat(created_at) if created_at else None,
+                int(photo_id),
+            )
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+
+    # --- ARCHIVE ---
 
-        timeline.sort(key=lambda item: item[0])
-        results = [photo for _, photo in timeline]
-        return [featured, *results] if featured else results
+    def get_archive_entries(self, plant_id: int) -> List[tuple[str, str, datetime]]:
+        """Returns the ready photos of a Plant's gallery, care log photos
+        included, as `(name, path, taken_at)` in gallery order: the cover
+        first, then the timeline.
+
+        Names are numbered in that order and carry the capture date and the
+        source, such as `003_2024-05-01_watering.jpg`, so archive listings
+        sort the same way.
+        """
+        featured: list = []
+        timeline: list = []
+        query = self._gallery_query(plant_id).filter(Photo.status == Photo.STATUS_READY)
+        for photo, _, _, care_type, cover_id in query:
+            (featured if photo.id == cover_id else timeline).append((photo, care_type))
+
+        ordered = featured + timeline
+        digits = max(3, len(str(len(ordered))))
+        entries = []
+        for number, (photo, care_type) in enumerate(ordered, start=1):
+            label = "plant"
+            if photo.plant_id is None:
+                label = re.sub(r"[^a-z0-9]+", "-", (care_type or "").lower()).strip("-")
+            extension = os.path.splitext(photo.filename)[1] or self.OUTPUT_EXT  # type: ignore[type-var]
+            name = (
+                f"{number:0{digits}d}_{photo.taken_at:%Y-%m-%d}_{label or 'care'}{extension}"
+            )
+            path = os.path.join(self.directory_for(photo), photo.filename)  # type: ignore[arg-type]
+            entries.append((name, path, photo.taken_at))
+        return entries
+
+    def stream_archive(
+        self, entries: Sequence[tuple[str, str, datetime]]
+    ) -> Iterator[bytes]:
+        """Yields a ZIP archive of `get_archive_entries` while it is built.
+
+        Photos are JPEGs already, so entries are stored without compression.
+        Each file is read in `SPOOL_CHUNK_SIZE` chunks and handed on as soon
+        as it is written, so memory stays flat however large the archive
+        gets. Files missing from photo storage are left out.
+        """
+        sink = ArchiveSink()
+        with zipfile.ZipFile(sink, "w", zipfile.ZIP_STORED) as archive:
+            for name, path, taken_at in entries:
+                if not self._fetch(path):
+                    continue
+                # ZIP timestamps cannot predate 1980
+                stamp = max(taken_at, datetime(1980, 1, 1))
+                info = zipfile.ZipInfo(name, date_time=stamp.timetuple()[:6])
+                info.compress_type = zipfile.ZIP_STORED
+                info.file_size = os.path.getsize(path)
+                with open(path, "rb") as source, archive.open(info, "w") as target:
+                    while chunk := source.read(self.SPOOL_CHUNK_SIZE):
+                        target.write(chunk)
+                        yield sink.drain()
+                yield sink.drain()
+        yield sink.drain()
 
     # --- REORDER / DELETE ---
 
@@ -261,7 +860,9 @@ class PhotoService:
         return photo
 
     def delete_photo(self, photo_id: int) -> bool:
-        """Deletes a Photo row and its on-disk files (original + thumbnail).
+        """Deletes a Photo row and queues its files (original + renditions)
+        for the reaper. Shared blob files are only removed with their last
+        reference.
 
         Args:
             photo_id (int): ID of the photo to delete.
@@ -273,7 +874,7 @@ class PhotoService:
         if not photo:
             return False
 
-        # Remove files first (cheaper than querying after delete)
+        # Queue files first (cheaper than querying after delete)
         self._delete_photo_files(photo)
 
         self.db.delete(photo)
@@ -283,11 +884,13 @@ class PhotoService:
     # Disk cleanup on parent delete
 
     def cleanup_plant_files(self, plant_id: int) -> None:
-        """Removes all on-disk photo files for a Plant AND its care logs.
+        """Queues all photo files for a Plant AND its care logs for deletion,
+        and releases their references to shared blobs.
 
         MUST be called before the Plant row is deleted, because after the
         delete the care_log IDs are gone from the DB and their photo
-        directories become orphans on disk.
+        directories become orphans on disk. The tombstones are committed
+        with the delete, so files are only removed once it succeeds.
 
         Args:
             plant_id (int): ID of the plant about to be deleted.
@@ -298,167 +901,1270 @@ class PhotoService:
             for row in self.db.query(PlantCare.id).filter_by(plant_id=plant_id).all()
         ]
 
+        self._release_blobs(
+            self.db.query(Photo.blob_id)
+            .filter(Photo.plant_id == plant_id, Photo.blob_id.isnot(None))
+            .all()
+        )
+
         # Plant's own photo directory
         plant_dir = os.path.join(self.upload_folder, "plants", str(plant_id))
-        if os.path.isdir(plant_dir):
-            shutil.rmtree(plant_dir, ignore_errors=True)
+        self._tombstone_legacy_files(plant_dir, Photo.plant_id == plant_id)
 
         # Each care log's directory
         for cl_id in care_log_ids:
             self.cleanup_care_log_files(cl_id)
 
     def cleanup_care_log_files(self, care_log_id: int) -> None:
-        """Removes all on-disk photo files for a PlantCare log.
+        """Queues all photo files for a PlantCare log for deletion and
+        releases its references to shared blobs.
 
         MUST be called before the PlantCare row is deleted.
 
         Args:
             care_log_id (int): ID of the care log about to be deleted.
         """
+        self._release_blobs(
+            self.db.query(Photo.blob_id)
+            .filter(Photo.care_log_id == care_log_id, Photo.blob_id.isnot(None))
+            .all()
+        )
+
         cl_dir = os.path.join(self.upload_folder, "care-logs", str(care_log_id))
-        if os.path.isdir(cl_dir):
-            shutil.rmtree(cl_dir, ignore_errors=True)
+        self._tombstone_legacy_files(cl_dir, Photo.care_log_id == care_log_id)
 
-    # --- FILE SERVING HELPERS ---
+    # --- DEFERRED FILE DELETION ---
 
-    def directory_for(self, photo: Photo) -> str:
-        """Returns the absolute directory containing the photo's files."""
-        if photo.plant_id is not None:
-            return os.path.join(self.upload_folder, "plants", str(photo.plant_id))
-        if photo.care_log_id is not None:
-            return os.path.join(self.upload_folder, "care-logs", str(photo.care_log_id))
-        raise ValueError(f"Photo {photo.id} has neither plant_id nor care_log_id")
+    def reap_tombstones(self, limit: int = 500) -> int:
+        """Deletes the files of up to `limit` tombstones, oldest first, with
+        one batched delete against photo storage.
 
-    def file_name_for(self, photo: Photo, thumb: bool = False) -> str:
-        """Returns the on-disk filename for the photo (original or thumbnail)."""
-        filename: str = photo.filename  # type: ignore[assignment]
-        if not thumb:
-            return filename
-        name, _ = os.path.splitext(filename)
-        return f"{name}_thumb{self.OUTPUT_EXT}"
+        Tombstones naming a blob that was uploaded again since are dropped
+        without deleting anything. Tombstones whose files photo storage
+        failed to delete, or the whole batch if the request itself failed,
+        are kept for the next run with their attempt count raised.
 
-    def file_path_for(self, photo: Photo, thumb: bool = False) -> str:
-        """Returns the absolute path to the photo file on disk."""
-        return os.path.join(
-            self.directory_for(photo), self.file_name_for(photo, thumb=thumb)
-        )
+        Args:
+            limit (int): Maximum number of tombstones to reap.
 
-    # --- OWNERSHIP CHECK ---
+        Returns:
+            int: Number of tombstones reaped.
 
-    def user_owns_photo(self, user_id: int, photo: Photo) -> bool:
-        """Returns True if the given user owns the plant that owns this photo
-        (directly via plant_id, or transitively via care_log_id -> plant).
+        Raises:
+            Exception: Whatever photo storage raised, after recording it.
         """
-        if photo.plant_id is not None:
-            plant = self.db.query(Plant).filter_by(id=photo.plant_id).first()
-            return plant is not None and plant.user_id == user_id  # type: ignore[return-value]
-        if photo.care_log_id is not None:
-            care_log = self.db.query(PlantCare).filter_by(id=photo.care_log_id).first()
-            if care_log is None:
-                return False
-            plant = self.db.query(Plant).filter_by(id=care_log.plant_id).first()
-            return plant is not None and plant.user_id == user_id  # type: ignore[return-value]
-        return False
+        tombstones = (
+            self.db.query(PhotoTombstone)
+            .order_by(PhotoTombstone.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not tombstones:
+            return 0
 
-    # --- INTERNALS ---
+        live = {
+            row[0]
+            for row in self.db.query(PhotoBlob.filename).filter(
+                PhotoBlob.filename.in_([t.filename for t in tombstones if t.filename])
+            )
+        }
+        keys: dict[int, list[str]] = {}
+        for tombstone in tombstones:
+            directory = os.path.join(self.upload_folder, tombstone.directory)  # type: ignore[arg-type]
+            keys[tombstone.id] = []  # type: ignore[index]
+            if tombstone.filename is None:
+                shutil.rmtree(directory, ignore_errors=True)
+            elif tombstone.filename not in live:
+                # Renditions retired by a rebuild are queued one by one
+                names = (
+                    [tombstone.filename]
+                    if self._parse_rendition_name(tombstone.filename)  # type: ignore[arg-type]
+                    else self._variant_names(tombstone.filename)  # type: ignore[arg-type]
+                )
+                for name in names:
+                    path = os.path.join(directory, name)
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                    keys[tombstone.id].append(self._storage_key(path))  # type: ignore[index]
 
-    def _process_and_save(
+        try:
+            self.storage.delete_many([key for batch in keys.values() for key in batch])
+        except StorageDeleteError as error:
+            # Only tombstones with a file still stored are kept
+            failed = [
+                tombstone
+                for tombstone in tombstones
+                if any(key in error.keys for key in keys[tombstone.id])  # type: ignore[index]
+            ]
+            self._record_reap_failure(tombstones, failed, error)
+            raise
+        except Exception as error:
+            self._record_reap_failure(tombstones, tombstones, error)
+            raise
+
+        for tombstone in tombstones:
+            self.db.delete(tombstone)
+        self.db.commit()
+        return len(tombstones)
+
+    def _record_reap_failure(
         self,
-        file_storage: FileStorage,
-        target_dir: str,
-        taken_at: Optional[datetime] = None,
-    ) -> dict:
-        """Reads, validates, processes, and saves a single upload to disk.
+        tombstones: Sequence[PhotoTombstone],
+        failed: Sequence[PhotoTombstone],
+        error: Exception,
+    ) -> None:
+        """Drops the reaped tombstones of a batch and keeps the `failed` ones
+        for the next run, with their attempt count raised.
+        """
+        for tombstone in tombstones:
+            if tombstone in failed:
+                tombstone.attempts += 1  # type: ignore[assignment]
+                tombstone.error = str(error)  # type: ignore[assignment]
+            else:
+                self.db.delete(tombstone)
+        self.db.commit()
 
-        Always stores the result as JPEG (HEIC/HEIF/PNG/etc converted) for
-        browser compatibility. Generates a 400px-wide thumbnail alongside.
+    def trim_working_copy(self, limit: Optional[int] = None) -> int:
+        """Deletes the least recently verified files of the working copy until
+        it fits in `limit` bytes. They are fetched again from photo storage on
+        next use. Does nothing when photo storage is the working copy itself.
 
         Args:
-            file_storage (FileStorage): The uploaded file.
-            target_dir (str): Absolute directory to write into (created if missing).
+            limit (int, optional): Size cap in bytes. Defaults to the
+                `PHOTO_WORKING_COPY_BYTES` setting.
 
         Returns:
-            dict: Metadata for the Photo row (filename, mime_type, size, dims).
+            int: Number of bytes freed.
+        """
+        if self._working_copy_is_storage():
+            return 0
+        if limit is None:
+            limit = current_app.config.get(
+                "PHOTO_WORKING_COPY_BYTES", self.WORKING_COPY_MAX_BYTES
+            )
+        entries = []
+        for root, dirs, files in os.walk(self.upload_folder):
+            if root == self.upload_folder:
+                # Node-local state, and files such as rebuild checkpoints
+                dirs[:] = [d for d in dirs if d not in (self.PREVIEW_CACHE_DIR, ".locks")]
+                continue
+            for name in files:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        excess = sum(size for _, size, _ in entries) - limit  # type: ignore[operator]
+        freed = 0
+        for _, size, path in sorted(entries):
+            if freed >= excess:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            freed += size
+        return freed
 
-        Raises:
-            ValueError: If MIME type is not in `ALLOWED_MIME_TYPES`.
+    def _working_copy_is_storage(self) -> bool:
+        """Returns True if photo storage keeps its files in UPLOAD_FOLDER
+        itself, so the working copy can be neither stale nor evicted.
         """
-        allowed = current_app.config["ALLOWED_MIME_TYPES"]
+        return isinstance(self.storage, LocalStorage) and (
+            self.storage.root == os.path.abspath(self.upload_folder)
+        )
 
-        # Read full content into memory
-        file_storage.seek(0)
-        raw = file_storage.read()
+    # --- LAYOUT MIGRATION ---
 
-        # Sniff true MIME from content
-        detected_mime = magic.from_buffer(raw, mime=True)
-        if detected_mime not in allowed:
-            raise ValueError(
-                f"Unsupported file type: {detected_mime}. "
-                f"Allowed: {', '.join(sorted(allowed))}"
+    def get_legacy_photo_ids(self, after_id: int = 0, limit: int = 500) -> List[int]:
+        """Returns IDs of ready photos still stored in their owner's directory,
+        in ID order, starting after `after_id`.
+        """
+        rows = (
+            self.db.query(Photo.id)
+            .filter(
+                Photo.blob_id.is_(None),
+                Photo.status == Photo.STATUS_READY,
+                Photo.id > after_id,
             )
+            .order_by(Photo.id)
+            .limit(limit)
+            .all()
+        )
+        return [row[0] for row in rows]
 
-        # Open with Pillow
-        img = Image.open(io.BytesIO(raw))
-        taken_at = (
-            taken_at
-            or self._exif_taken_at(img)
-            or datetime.now(timezone.utc).replace(tzinfo=None)
+    def migrate_legacy_photo(self, photo_id: int) -> bool:
+        """Moves a photo stored in its owner's directory into the sharded
+        blob store, reusing an existing blob with the same content.
+
+        The files are copied and the photo re-pointed in one commit that also
+        queues the old files for the reaper, so the photo stays servable
+        throughout and an interrupted run can simply be started again. The
+        owner's data version is bumped so clients refetch the new names.
+
+        Args:
+            photo_id (int): ID of the photo to migrate.
+
+        Returns:
+            bool: True if migrated, False if not found, not ready or already
+                in the blob store.
+
+        Raises:
+            FileNotFoundError: If the original is missing from photo storage.
+        """
+        photo = self.get_photo(photo_id)
+        if not photo or photo.blob_id is not None or photo.status != Photo.STATUS_READY:
+            return False
+
+        directory = self.directory_for(photo)
+        original = os.path.join(directory, photo.filename)  # type: ignore[arg-type]
+        if not self._fetch(original):
+            raise FileNotFoundError(original)
+        with open(original, "rb") as stream:
+            digest = self._hash_upload(FileStorage(stream))
+
+        blob = self.db.query(PhotoBlob).filter_by(sha256=digest).first()
+        if blob is None:
+            blob = PhotoBlob(
+                sha256=digest,
+                filename=f"{digest}{self.OUTPUT_EXT}",
+                mime_type=photo.mime_type,
+                size_bytes=photo.size_bytes,
+                width=photo.width,
+                height=photo.height,
+                placeholder=photo.placeholder,
+                ref_count=0,
+            )
+            self._copy_variants(
+                directory, photo.filename, self._blob_directory(digest), blob.filename  # type: ignore[arg-type]
+            )
+
+        blob = self._link_blob(blob, 1)
+        if blob is None:
+            # Deleted and reaped since it was read; copy the files again
+            self.db.rollback()
+            return self.migrate_legacy_photo(photo_id)
+        # Clients may still hold URLs or cached lists naming the old files
+        self._tombstone(directory, photo.filename)  # type: ignore[arg-type]
+        photo.blob = blob
+        photo.filename = blob.filename
+        self.db.commit()
+        self._record_change(photo)
+        return True
+
+    # --- PLACEHOLDER BACKFILL ---
+
+    def get_placeholder_batch(self, after_id: int = 0, limit: int = 200) -> List[Photo]:
+        """Returns ready photos without a placeholder in ID order, starting
+        after `after_id`.
+        """
+        return (
+            self.db.query(Photo)
+            .filter(
+                Photo.placeholder.is_(None),
+                Photo.status == Photo.STATUS_READY,
+                Photo.id > after_id,
+            )
+            .order_by(Photo.id)
+            .limit(limit)
+            .all()
         )
-        img = ImageOps.exif_transpose(img)
 
-        # Capture original dimensions
-        original_width, original_height = img.size
+    def backfill_placeholders(
+        self, photos: Sequence[Photo]
+    ) -> tuple[int, dict[int, str]]:
+        """Computes placeholders for photos stored before they existed.
+
+        Each is shrunk from the photo's thumbnail, generated first if needed,
+        and kept on its blob too so other photos with the same content reuse
+        it. The owners' data versions are bumped once the batch is committed.
+
+        Returns:
+            tuple: The number of photos filled in, and error messages keyed by
+                photo ID.
+        """
+        filled: List[Photo] = []
+        errors: dict[int, str] = {}
+        for photo in photos:
+            placeholder = photo.blob.placeholder if photo.blob else None
+            if placeholder is None:
+                try:
+                    path = self.ensure_rendition(photo, self.THUMBNAIL_WIDTH)
+                    with Image.open(path) as thumb:
+                        placeholder = self._placeholder(thumb)
+                except ImageWorkBusy:
+                    raise
+                except Exception as error:
+                    errors[photo.id] = str(error)  # type: ignore[index]
+                    continue
+                if photo.blob:
+                    photo.blob.placeholder = placeholder
+            photo.placeholder = placeholder
+            filled.append(photo)
+        self.db.commit()
+
+        owners = {self.owner_user_id(photo) for photo in filled}
+        for owner_id in owners - {None}:
+            DataVersionService(self.db).bump(DataVersionService.user_scope(owner_id))
+        return len(filled), errors
+
+    # --- RENDITION REBUILD ---
+
+    def get_rebuild_batch(self, after_id: int = 0, limit: int = 200) -> List[Photo]:
+        """Returns ready photos after `after_id` in ID order, skipping photos
+        whose blob was already listed with a lower ID, so files shared by
+        several photos are rebuilt once.
+        """
+        first = aliased(Photo)
+        first_of_blob = (
+            select(func.min(first.id))
+            .where(first.blob_id == Photo.blob_id)
+            .scalar_subquery()
+        )
+        return (
+            self.db.query(Photo)
+            .filter(
+                Photo.status == Photo.STATUS_READY,
+                Photo.id > after_id,
+                or_(Photo.blob_id.is_(None), Photo.id == first_of_blob),
+            )
+            .order_by(Photo.id)
+            .limit(limit)
+            .all()
+        )
+
+    def rebuild_renditions(
+        self,
+        directory: str,
+        filename: str,
+        original_width: Optional[int],
+        widths: Sequence[Optional[int]],
+        mimes: Sequence[str],
+    ) -> dict:
+        """Generates renditions of one original with the current settings,
+        under their current names, and lists the files they supersede. The
+        original is decoded once, and only if a rendition is missing.
+
+        Existing files are never rewritten: renditions encoded with other
+        settings carry another tag, so they keep serving clients that cached
+        them until `retire_renditions` queues them for the reaper.
+
+        Widths the original is no wider than are skipped, as requests for
+        them are served the full-size variant. A width of None regenerates
+        the full-size variants in formats other than JPEG.
+
+        Args:
+            directory (str): Directory of the original.
+            filename (str): File name of the original.
+            original_width (int, optional): Width of the original, if known.
+            widths (Sequence[int | None]): Rendition widths to regenerate.
+            mimes (Sequence[str]): Rendition formats to regenerate.
+
+        Returns:
+            dict: `files` written, `bytes_before` of the files they supersede
+                and `bytes_after` of their replacements, `bytes_created` of
+                files that superseded nothing, and the names of the
+                `superseded` files.
+
+        Raises:
+            FileNotFoundError: If the original is missing from photo storage.
+        """
+        stem = os.path.splitext(filename)[0]
+        stored = {
+            key.rsplit("/", 1)[-1]: size
+            for key, size in self.storage.list_directory(self._storage_key(directory)).items()
+        }
+        renditions: dict[tuple[Optional[int], str], List[str]] = {}
+        for name in stored:
+            parsed = self._parse_rendition_name(name)
+            if parsed and parsed[0] == stem:
+                renditions.setdefault(parsed[1:], []).append(name)
+
+        report = {
+            "files": 0,
+            "bytes_before": 0,
+            "bytes_after": 0,
+            "bytes_created": 0,
+            "superseded": [],
+        }
+        missing = []
+        for width in widths:
+            if width and original_width and width >= original_width:
+                continue
+            for mime in mimes:
+                if width is None and mime == self.OUTPUT_MIME:
+                    continue
+                name = self._rendition_name(filename, width, mime)
+                superseded = [n for n in renditions.get((width, mime), []) if n != name]
+                report["superseded"].extend(superseded)
+                if name not in stored:
+                    missing.append((width, mime, name, superseded))
+        if not missing:
+            return report
+
+        original = os.path.join(directory, filename)
+        if not self._fetch(original):
+            raise FileNotFoundError(original)
+        with Image.open(original) as img:
+            upright = ImageOps.exif_transpose(img)
+            for width, mime, name, superseded in missing:
+                path = os.path.join(directory, name)
+                self._save_rendition(upright, path, width, mime)
+                self._publish(path)
+                size = os.path.getsize(path)
+                report["files"] += 1
+                if superseded:
+                    report["bytes_before"] += sum(stored[n] for n in superseded)
+                    report["bytes_after"] += size
+                else:
+                    report["bytes_created"] += size
+        return report
+
+    def retire_renditions(self, directory: str, names: Sequence[str]) -> None:
+        """Queues renditions superseded by `rebuild_renditions` for the
+        reaper, and commits.
+        """
+        for name in names:
+            self._tombstone(directory, name)
+        self.db.commit()
+
+    # --- FILE SERVING HELPERS ---
+
+    def directory_for(self, photo: Photo) -> str:
+        """Returns the absolute directory containing the photo's files.
+
+        Blob-backed photos are named after their content hash and live in the
+        blob store; older photos live in their owner's directory.
+        """
+        if photo.blob_id is not None:
+            return self._blob_directory(os.path.splitext(photo.filename)[0])  # type: ignore[arg-type]
+        if photo.plant_id is not None:
+            return os.path.join(self.upload_folder, "plants", str(photo.plant_id))
+        if photo.care_log_id is not None:
+            return os.path.join(self.upload_folder, "care-logs", str(photo.care_log_id))
+        raise ValueError(f"Photo {photo.id} has neither plant_id nor care_log_id")
+
+    def file_name_for(
+        self,
+        photo: Photo,
+        thumb: bool = False,
+        width: Optional[int] = None,
+        mime: str = OUTPUT_MIME,
+    ) -> str:
+        """Returns the on-disk filename for the photo's original, its thumbnail,
+        or the rendition registered for `width`, encoded as `mime`.
+        """
+        if thumb:
+            width = self.THUMBNAIL_WIDTH
+        return self._rendition_name(photo.filename, width, mime)  # type: ignore[arg-type]
+
+    def file_path_for(
+        self,
+        photo: Photo,
+        thumb: bool = False,
+        width: Optional[int] = None,
+        mime: str = OUTPUT_MIME,
+    ) -> str:
+        """Returns the absolute path to the photo file on disk."""
+        return os.path.join(
+            self.directory_for(photo),
+            self.file_name_for(photo, thumb=thumb, width=width, mime=mime),
+        )
+
+    @classmethod
+    def supported_output_mimes(cls) -> List[str]:
+        """Returns the rendition formats this Pillow build can encode, in
+        order of preference. JPEG is always last.
+        """
+        Image.init()
+        return [
+            mime
+            for mime, (_, image_format, _) in cls.RENDITION_FORMATS.items()
+            if image_format in Image.SAVE
+        ]
+
+    def negotiate_output_mime(self, accept: MIMEAccept) -> str:
+        """Picks the preferred rendition format the client explicitly accepts.
+
+        Wildcards such as `*/*` or `image/*` are not enough to opt into a
+        newer format, so clients that do not name one keep receiving JPEG.
+        """
+        explicit = {value.lower() for value, quality in accept if quality > 0}
+        for mime in self.supported_output_mimes():
+            if mime in explicit:
+                return mime
+        return self.OUTPUT_MIME
+
+    def rendition_width_for(self, photo: Photo, requested: int) -> Optional[int]:
+        """Maps a requested display width onto the rendition registry.
+
+        Returns the smallest registered width that covers `requested`, or None
+        when the original should be served instead because the request is
+        wider than every rendition or the original is no wider than the match.
+        """
+        width = next((w for w in self.RENDITION_WIDTHS if w >= requested), None)
+        if width is None or (photo.width is not None and width >= photo.width):
+            return None
+        return width
+
+    def ensure_rendition(
+        self, photo: Photo, width: Optional[int], mime: str = OUTPUT_MIME
+    ) -> str:
+        """Returns the absolute path of a rendition, generating it from the
+        original on first use. A `width` of None means full size.
 
-        # Normalize to RGB for JPEG output
+        Raises:
+            ValueError: If `width` or `mime` is not a supported rendition.
+            FileNotFoundError: If the original is missing on disk.
+        """
+        if width is not None and width not in self.RENDITION_WIDTHS:
+            raise ValueError(f"Unsupported rendition width: {width}.")
+        if mime not in self.supported_output_mimes():
+            raise ValueError(f"Unsupported rendition format: {mime}.")
+        return self._ensure_rendition(
+            self.directory_for(photo), photo.filename, width, mime  # type: ignore[arg-type]
+        )
+
+    def prewarm_renditions(
+        self, photo: Photo, widths: Optional[Sequence[int]] = None
+    ) -> List[str]:
+        """Generates any missing renditions ahead of the first request.
+
+        Args:
+            photo (Photo): The photo to pre-warm.
+            widths (Sequence[int], optional): Widths to generate. Defaults to
+                the `PHOTO_PREWARM_WIDTHS` setting.
+
+        Returns:
+            List[str]: Absolute paths of the requested renditions, in every
+                supported format.
+        """
+        if widths is None:
+            widths = current_app.config.get("PHOTO_PREWARM_WIDTHS", ())
+        return [
+            self.ensure_rendition(photo, width, mime)
+            for width in widths
+            if self.rendition_width_for(photo, width) == width
+            for mime in self.supported_output_mimes()
+        ]
+
+    # --- SIGNED URLS ---
+
+    def signed_urls_for(self, photo: Photo) -> Optional[dict]:
+        """Returns signed, expiring file URLs for a photo, keyed by rendition
+        width plus `original`, for use in plain `<img>` tags.
+
+        Expiry is rounded up to whole `PHOTO_URL_TTL` windows, so repeated list
+        requests hand out identical URLs that browsers can cache.
+
+        Returns:
+            dict or None: URLs by width, or None while the photo is not ready.
+        """
+        if photo.status != Photo.STATUS_READY:
+            return None
+        path = os.path.relpath(self.file_path_for(photo), self.upload_folder)
+        ttl = current_app.config.get("PHOTO_URL_TTL", self.SIGNED_URL_TTL)
+        expires = (int(time.time()) // ttl + 2) * ttl
+        urls = {"original": self._signed_url(path, None, expires)}
+        for width in self.RENDITION_WIDTHS:
+            if self.rendition_width_for(photo, width) == width:
+                urls[str(width)] = self._signed_url(path, width, expires)
+        return urls
+
+    def verify_signed_url(
+        self, path: str, width: Optional[int], expires: int, signature: str
+    ) -> bool:
+        """Returns True if a signed URL is authentic and unexpired. Needs no
+        database access.
+        """
+        expected = self._url_signature(path, width, expires)
+        return hmac.compare_digest(expected, signature) and expires >= time.time()
+
+    def resolve_signed_file(
+        self, path: str, width: Optional[int], mime: str = OUTPUT_MIME
+    ) -> str:
+        """Returns the absolute path of the rendition a verified signed URL
+        names, generating it on first use.
+
+        Raises:
+            FileNotFoundError: If the original is missing on disk.
+        """
+        directory, filename = os.path.split(os.path.join(self.upload_folder, path))
+        return self._ensure_rendition(directory, filename, width, mime)
+
+    def rendition_etag(
+        self, filename: str, width: Optional[int], mime: str = OUTPUT_MIME
+    ) -> str:
+        """Returns the strong ETag of a rendition of the original `filename`.
+
+        Rendition names carry the tag of the encoder settings and a file is
+        never rewritten under the same name, so the name alone identifies
+        the bytes and no file I/O is needed.
+        """
+        return self._rendition_name(filename, width, mime)
+
+    # --- OWNERSHIP CHECK ---
+
+    def user_owns_photo(self, user_id: int, photo: Photo) -> bool:
+        """Returns True if the given user owns the plant that owns this photo
+        (directly via plant_id, or transitively via care_log_id -> plant).
+        """
+        return self.owner_user_id(photo) == user_id
+
+    def owner_user_id(self, photo: Photo) -> Optional[int]:
+        """Returns the ID of the user owning the photo's plant, or None."""
+        if photo.plant_id is not None:
+            plant = self.db.query(Plant).filter_by(id=photo.plant_id).first()
+            return plant.user_id if plant else None  # type: ignore[return-value]
+        if photo.care_log_id is not None:
+            care_log = self.db.query(PlantCare).filter_by(id=photo.care_log_id).first()
+            if care_log is None:
+                return None
+            plant = self.db.query(Plant).filter_by(id=care_log.plant_id).first()
+            return plant.user_id if plant else None  # type: ignore[return-value]
+        return None
+
+    # --- INTERNALS ---
+
+    def _render_preview(self, img: Image.Image) -> io.BytesIO:
+        """Renders a not-yet-loaded image as an upright JPEG preview no larger
+        than `PREVIEW_MAX_DIMENSION`.
+        """
+        self._check_pixel_count(img)
+        self._draft(img, max_dimension=self.PREVIEW_MAX_DIMENSION)
+        self._check_decode_budget(img)
+        img = ImageOps.exif_transpose(img)
         if img.mode != "RGB":
             img = img.convert("RGB")
-
-        # Generate thumbnail preserving aspect ratio
-        thumb_ratio = self.THUMBNAIL_WIDTH / original_width
-        thumb_height = max(1, int(original_height * thumb_ratio))
-        thumb = img.resize(
-            (self.THUMBNAIL_WIDTH, thumb_height),
+        img.thumbnail(
+            (self.PREVIEW_MAX_DIMENSION, self.PREVIEW_MAX_DIMENSION),
             Image.Resampling.LANCZOS,
         )
+        preview = io.BytesIO()
+        img.save(preview, format="JPEG", quality=self.JPEG_QUALITY_ORIGINAL)
+        preview.seek(0)
+        return preview
 
-        # Generate stable UUID-based filename
-        filename = f"{uuid.uuid4().hex}{self.OUTPUT_EXT}"
+    def _preview_cache_dir(self) -> str:
+        """Returns the directory holding one subdirectory per cached preview."""
+        return os.path.join(self.upload_folder, self.PREVIEW_CACHE_DIR)
 
+    def _preview_ttl(self) -> int:
+        """Returns how many seconds an upload token stays valid."""
+        return current_app.config.get("PHOTO_PREVIEW_TTL", self.PREVIEW_TOKEN_TTL)
+
+    def _claim_preview(self, upload: PreviewUpload) -> None:
+        """Takes a cached preview out of the cache for `upload`'s token.
+
+        The entry is renamed before it is read, so a token is only ever
+        claimed once and eviction cannot remove it mid-upload.
+
+        Raises:
+            ValueError: If the token is unknown, expired, evicted or belongs
+                to another user.
+        """
+        expired = "Upload token is invalid or expired. Add the photo again."
+        if not re.fullmatch(r"[0-9a-f]{32}", upload.token):
+            raise ValueError(expired)
+        cache_dir = self._preview_cache_dir()
+        claimed = os.path.join(cache_dir, f"{upload.token}.claimed")
+        try:
+            os.rename(os.path.join(cache_dir, upload.token), claimed)
+        except FileNotFoundError:
+            raise ValueError(expired)
+        upload.directory = claimed
+
+        meta_path = os.path.join(claimed, "meta.json")
+        try:
+            with open(meta_path) as handle:
+                record = json.load(handle)
+            created = os.path.getmtime(meta_path)
+        except (OSError, ValueError):
+            raise ValueError(expired)
+        if record["user_id"] != upload.user_id:
+            raise ValueError(expired)
+        if created < time.time() - self._preview_ttl():
+            raise ValueError(expired)
+
+        upload.sha256 = record["sha256"]
+        upload.filename = record["filename"]
+        upload.meta = record["meta"]
+
+    def _adopt_preview(self, upload: PreviewUpload, target_dir: str) -> dict:
+        """Moves a claimed preview's processed files into `target_dir` and
+        returns its `_process_and_save` metadata.
+        """
         os.makedirs(target_dir, exist_ok=True)
+        for name in os.listdir(upload.directory):  # type: ignore[arg-type]
+            if name != "meta.json":
+                os.replace(
+                    os.path.join(upload.directory, name),  # type: ignore[arg-type]
+                    os.path.join(target_dir, name),
+                )
+        captured_at = upload.meta.get("captured_at")
+        return {
+            **upload.meta,
+            "captured_at": datetime.fromisoformat(captured_at) if captured_at else None,
+        }
+
+    def _evict_previews(self, keep: Optional[str] = None) -> None:
+        """Keeps the preview cache under `PHOTO_PREVIEW_CACHE_BYTES`.
+
+        Expired entries are removed first, then the least recently used
+        entries until the rest fit. The `keep` entry, just handed out, and
+        entries claimed by an upload in progress are left alone unless they
+        outlived the token TTL.
+        """
+        limit = current_app.config.get(
+            "PHOTO_PREVIEW_CACHE_BYTES", self.PREVIEW_CACHE_MAX_BYTES
+        )
+        oldest = time.time() - self._preview_ttl()
+        entries = []
+        try:
+            scan = list(os.scandir(self._preview_cache_dir()))
+        except FileNotFoundError:
+            return
+        for entry in scan:
+            try:
+                used = entry.stat().st_mtime
+                size = sum(f.stat().st_size for f in os.scandir(entry.path))
+            except OSError:
+                continue  # claimed or evicted concurrently
+            if used < oldest:
+                shutil.rmtree(entry.path, ignore_errors=True)
+            elif not entry.name.endswith(".claimed"):
+                entries.append((used, size, entry.path))
+
+        total = 0
+        for used, size, path in sorted(entries, reverse=True):
+            total += size
+            if total > limit and os.path.basename(path) != keep:
+                shutil.rmtree(path, ignore_errors=True)
 
-        original_path = os.path.join(target_dir, filename)
-        img.save(original_path, format="JPEG", quality=self.JPEG_QUALITY_ORIGINAL)
+    def _process_and_save(
+        self,
+        file_storage: FileStorage,
+        target_dir: str,
+        taken_at: Optional[datetime] = None,
+        filename: Optional[str] = None,
+    ) -> dict:
+        """Reads, validates, processes, and saves a single upload to disk.
 
-        thumb_filename = self._thumb_name(filename)
-        thumb_path = os.path.join(target_dir, thumb_filename)
-        thumb.save(thumb_path, format="JPEG", quality=self.JPEG_QUALITY_THUMBNAIL)
+        Always stores the result as JPEG (HEIC/HEIF/PNG/etc converted) for
+        browser compatibility. JPEG uploads keep their encoded pixels and
+        only have their metadata rewritten. Generates a 400px-wide thumbnail alongside,
+        plus any rendition widths listed in `PHOTO_PREWARM_WIDTHS`, and a tiny
+        inline placeholder shrunk from the thumbnail.
 
-        size_on_disk = os.path.getsize(original_path)
+        Args:
+            file_storage (FileStorage): The uploaded file.
+            target_dir (str): Absolute directory to write into (created if missing).
+            filename (str, optional): Name to store under, for queued photos
+                whose row already exists. Defaults to a new UUID-based name.
 
-        # Preserve user's original name for display only
-        original_name = (file_storage.filename or "")[:255]
+        Returns:
+            dict: Metadata for the stored file (filename, mime_type, size, dims,
+                placeholder, taken_at, and the EXIF-only `captured_at`).
 
-        return {
-            "filename": filename,
-            "original_filename": original_name,
-            "mime_type": self.OUTPUT_MIME,
-            "size_bytes": size_on_disk,
-            "width": original_width,
-            "height": original_height,
-            "taken_at": taken_at,
+        Raises:
+            ValueError: If MIME type is not in `ALLOWED_MIME_TYPES`, or decoding
+                would exceed `PHOTO_MAX_DECODE_BYTES` or the pixel limit.
+            ImageWorkBusy: If other image work kept it waiting too long.
+        """
+        with ExitStack() as work:
+            # Sniff true MIME from the first bytes, then decode from a spooled file
+            with self._spooled_upload(file_storage) as (detected_mime, spool):
+                img = Image.open(spool)
+                captured_at = self._exif_taken_at(img)
+                taken_at = (
+                    taken_at
+                    or captured_at
+                    or datetime.now(timezone.utc).replace(tzinfo=None)
+                )
+
+                # Capture original (displayed) dimensions before any draft
+                orientation = img.getexif().get(0x0112)
+                original_width, original_height = img.size
+                if orientation in (5, 6, 7, 8):
+                    original_width, original_height = original_height, original_width
+
+                # Always write the thumbnail; other renditions are generated on
+                # first request unless pre-warmed
+                prewarm = current_app.config.get("PHOTO_PREWARM_WIDTHS", ())
+                widths = [
+                    width
+                    for width in self.RENDITION_WIDTHS
+                    if width == self.THUMBNAIL_WIDTH
+                    or (width in prewarm and width < original_width)
+                ]
+
+                # JPEG originals are stored as uploaded, so only the renditions
+                # need pixels and those can be decoded at reduced resolution
+                passthrough = (
+                    detected_mime == self.OUTPUT_MIME and img.mode in self.PASSTHROUGH_MODES
+                )
+                self._check_pixel_count(img)
+                if passthrough:
+                    self._draft(img, width=max(widths))
+                # Queue behind other image work until memory allows
+                work.enter_context(
+                    self.image_limiter.acquire(self._check_decode_budget(img))
+                )
+                img = ImageOps.exif_transpose(img)
+
+                # Generate stable UUID-based filename
+                filename = filename or f"{uuid.uuid4().hex}{self.OUTPUT_EXT}"
+
+                os.makedirs(target_dir, exist_ok=True)
+
+                original_path = os.path.join(target_dir, filename)
+                if passthrough:
+                    spool.seek(0)
+                    self._copy_jpeg_without_metadata(spool, original_path, orientation)
+
+            # Normalize to RGB for JPEG output
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+
+            if not passthrough:
+                img.save(original_path, format="JPEG", quality=self.JPEG_QUALITY_ORIGINAL)
+
+            placeholder = None
+            for width in widths:
+                thumb = self._resize_to_width(img, width)
+                if width == self.THUMBNAIL_WIDTH:
+                    placeholder = self._placeholder(thumb)
+                for mime in self.supported_output_mimes():
+                    self._save_rendition(
+                        thumb,
+                        os.path.join(target_dir, self._rendition_name(filename, width, mime)),
+                        None,
+                        mime,
+                    )
+
+            size_on_disk = os.path.getsize(original_path)
+
+            # Preserve user's original name for display only
+            original_name = (file_storage.filename or "")[:255]
+
+            return {
+                "filename": filename,
+                "original_filename": original_name,
+                "mime_type": self.OUTPUT_MIME,
+                "size_bytes": size_on_disk,
+                "width": original_width,
+                "height": original_height,
+                "placeholder": placeholder,
+                "taken_at": taken_at,
+                "captured_at": captured_at,
+            }
+
+    def _store_batch(
+        self,
+        files: Sequence[FileStorage | PreviewUpload],
+        taken_ats: Optional[Sequence[Optional[datetime]]] = None,
+    ) -> tuple[dict[int, dict], dict[int, str]]:
+        """Stores each upload's content once in the content-addressed blob store.
+
+        Uploads are hashed before decoding. Content that is already stored, or
+        repeated within the batch, reuses the existing blob and its renditions;
+        only new content is processed. Cached previews are claimed by token
+        and moved into the blob store as they are.
+
+        Returns:
+            tuple: Photo metadata referencing a blob, and error messages, each
+                keyed by file index.
+        """
+        taken_ats = list(taken_ats or [None] * len(files))
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        errors: dict[int, str] = {}
+        digests: dict[int, str] = {}
+        for index, upload in enumerate(files):
+            try:
+                if isinstance(upload, PreviewUpload):
+                    self._claim_preview(upload)
+                    digests[index] = upload.sha256  # type: ignore[assignment]
+                    continue
+                self._sniff_mime(upload)
+            except ValueError as error:
+                errors[index] = str(error)
+                continue
+            digests[index] = self._hash_upload(upload)
+
+        blobs = {
+            blob.sha256: blob
+            for blob in self.db.query(PhotoBlob)
+            .filter(PhotoBlob.sha256.in_(set(digests.values())))
+            .all()
         }
 
-    def _create_photo_row(self, meta: dict) -> Photo:
-        """Inserts a Photo row from the metadata dict returned by _process_and_save."""
-        photo = Photo(**meta)
-        self.db.add(photo)
+        # Process each new digest once, from its first upload in the batch,
+        # unless that upload was already processed into the preview cache
+        new: dict[str, int] = {}
+        for index, digest in digests.items():
+            if digest not in blobs:
+                new.setdefault(digest, index)
+        for digest, index in list(new.items()):
+            upload = files[index]
+            if isinstance(upload, PreviewUpload):
+                meta = self._adopt_preview(upload, self._blob_directory(digest))
+                blobs[digest] = self._new_blob(digest, meta)
+                del new[digest]
+        for upload in files:
+            if isinstance(upload, PreviewUpload) and upload.directory:
+                shutil.rmtree(upload.directory, ignore_errors=True)
+
+        processed, failures = self._process_batch(
+            [files[index] for index in new.values()],
+            [self._blob_directory(digest) for digest in new],
+            filenames=[f"{digest}{self.OUTPUT_EXT}" for digest in new],
+        )
+        failed: dict[str, str] = {}
+        for i, digest in enumerate(new):
+            if i in failures:
+                failed[digest] = failures[i]
+            else:
+                blobs[digest] = self._new_blob(digest, processed[i])
+        for digest, blob in blobs.items():
+            if blob.id is None:
+                self._publish_variants(self._blob_directory(digest), blob.filename)  # type: ignore[arg-type]
+
+        metas: dict[int, dict] = {}
+        for index, digest in digests.items():
+            if digest in failed:
+                errors[index] = failed[digest]
+                continue
+            blob = blobs[digest]
+            metas[index] = {
+                "blob": blob,
+                "filename": blob.filename,
+                "original_filename": (files[index].filename or "")[:255],
+                "mime_type": blob.mime_type,
+                "size_bytes": blob.size_bytes,
+                "width": blob.width,
+                "height": blob.height,
+                "placeholder": blob.placeholder,
+                "taken_at": taken_ats[index] or blob.taken_at or now,
+            }
+        return metas, errors
+
+    def _new_blob(self, digest: str, meta: dict) -> PhotoBlob:
+        """Builds an unsaved PhotoBlob from _process_and_save metadata."""
+        return PhotoBlob(
+            sha256=digest,
+            filename=meta["filename"],
+            mime_type=meta["mime_type"],
+            size_bytes=meta["size_bytes"],
+            width=meta["width"],
+            height=meta["height"],
+            # Previews cached before placeholders existed have none
+            placeholder=meta.get("placeholder"),
+            taken_at=meta["captured_at"],
+            ref_count=0,
+        )
+
+    def _link_blob(self, blob: PhotoBlob, references: int) -> Optional[PhotoBlob]:
+        """Adds `references` to the stored blob with `blob`'s content, holding
+        its row lock until the caller commits so _release_blobs cannot delete
+        it in the meantime. New content is inserted from `blob`, claiming any
+        tombstone still queued for the same files so the reaper skips it.
+
+        Returns:
+            PhotoBlob or None: The stored blob, or None if it was deleted since
+                `blob` was read, or a reaper deleted the files just stored
+                for it, and its files are already gone.
+        """
+        stored = (
+            self.db.query(PhotoBlob)
+            .filter_by(sha256=blob.sha256)
+            .with_for_update()
+            .populate_existing()
+            .first()
+        )
+        if stored is None:
+            # Waits for a reaper already deleting these files to finish
+            tombstone = (
+                self.db.query(PhotoTombstone)
+                .filter_by(
+                    directory=os.path.relpath(
+                        self._blob_directory(blob.sha256), self.upload_folder  # type: ignore[arg-type]
+                    ),
+                    filename=blob.filename,
+                )
+                .with_for_update()
+                .first()
+            )
+            if tombstone is not None:
+                self.db.delete(tombstone)
+            elif not self.storage.exists(
+                self._storage_key(
+                    os.path.join(self._blob_directory(blob.sha256), blob.filename)  # type: ignore[arg-type]
+                )
+            ):
+                return None
+            if blob.id is not None:
+                # Deleted since it was read; revive it
+                self.db.expunge(blob)
+                blob = PhotoBlob(
+                    **{
+                        key: getattr(blob, key)
+                        for key in (
+                            "sha256",
+                            "filename",
+                            "mime_type",
+                            "size_bytes",
+                            "width",
+                            "height",
+                            "placeholder",
+                            "taken_at",
+                        )
+                    },
+                    ref_count=0,
+                )
+            try:
+                with self.db.begin_nested():
+                    self.db.add(blob)
+                stored = blob
+            except IntegrityError:
+                # Another upload stored the same content first, under the
+                # same filenames
+                stored = (
+                    self.db.query(PhotoBlob)
+                    .filter_by(sha256=blob.sha256)
+                    .with_for_update()
+                    .one()
+                )
+        stored.ref_count += references  # type: ignore[assignment]
+        return stored
+
+    def _process_batch(
+        self,
+        files: Sequence[FileStorage],
+        target_dirs: Sequence[str],
+        taken_ats: Optional[Sequence[Optional[datetime]]] = None,
+        filenames: Optional[Sequence[Optional[str]]] = None,
+    ) -> tuple[dict[int, dict], dict[int, str]]:
+        """Runs _process_and_save for every file on a bounded thread pool.
+
+        Pillow releases the GIL while decoding, resizing and encoding, so the
+        files of one batch are processed in parallel. Failures are collected
+        per file instead of aborting the batch.
+
+        Returns:
+            tuple: File metadata and error messages, each keyed by file index.
+
+        Raises:
+            ImageWorkBusy: If any file waited too long for image work to free
+                up. Files already processed are removed again.
+        """
+        if not files:
+            return {}, {}
+        taken_ats = list(taken_ats or [None] * len(files))
+        filenames = list(filenames or [None] * len(files))
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+        workers = min(
+            len(files),
+            app.config.get("PHOTO_PROCESSING_WORKERS", self.PROCESSING_WORKERS),
+        )
+
+        def process(
+            file_storage: FileStorage,
+            target_dir: str,
+            taken_at: Optional[datetime],
+            filename: Optional[str],
+        ) -> dict:
+            with app.app_context():
+                return self._process_and_save(
+                    file_storage, target_dir, taken_at, filename=filename
+                )
+
+        metas: dict[int, dict] = {}
+        errors: dict[int, str] = {}
+        busy: Optional[ImageWorkBusy] = None
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = [
+                executor.submit(process, *args)
+                for args in zip(files, target_dirs, taken_ats, filenames)
+            ]
+            for index, future in enumerate(futures):
+                try:
+                    metas[index] = future.result()
+                except ImageWorkBusy as error:
+                    busy = error
+                except Exception as error:
+                    errors[index] = str(error)
+
+        # The whole batch is retried later, so keep nothing written for it
+        if busy is not None:
+            for index, meta in metas.items():
+                self._remove_variants(target_dirs[index], meta["filename"])
+            raise busy
+        return metas, errors
+
+    def _create_photo_rows(
+        self, metas: dict[int, dict]
+    ) -> tuple[dict[int, Photo], dict[int, str]]:
+        """Inserts one Photo row per metadata dict, together with any new
+        blobs they reference, and commits them together.
+
+        Blobs are linked under their row lock, so concurrent uploads of the
+        same content share one blob. If the commit fails, files written for
+        new blobs are removed unless another upload stored the same content
+        in the meantime.
+
+        Returns:
+            tuple: Created photos, and error messages for uploads whose blob
+                was deleted while they were stored, each keyed by file index.
+        """
+        new_blobs = {
+            meta["blob"].sha256: meta["blob"]
+            for meta in metas.values()
+            if meta["blob"].id is None
+        }
+        errors: dict[int, str] = {}
+        if not metas:
+            return {}, errors
+        digests = {index: meta["blob"].sha256 for index, meta in metas.items()}
+        blobs = {meta["blob"].sha256: meta["blob"] for meta in metas.values()}
+        # Lock in a fixed order so concurrent batches cannot deadlock
+        for digest, count in sorted(Counter(digests.values()).items()):
+            blobs[digest] = self._link_blob(blobs[digest], count)  # type: ignore[assignment]
+        for index, digest in digests.items():
+            if blobs[digest] is None:
+                errors[index] = "This photo was deleted while uploading. Please try again."
+            else:
+                metas[index]["blob"] = blobs[digest]
+        photos = {
+            index: Photo(**metas[index]) for index in sorted(metas) if index not in errors
+        }
+        self.db.add_all(photos.values())
         try:
             self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            stored = {
+                row[0]
+                for row in self.db.query(PhotoBlob.sha256)
+                .filter(PhotoBlob.sha256.in_(list(new_blobs)))
+                .all()
+            }
+            for digest, blob in new_blobs.items():
+                if digest not in stored:
+                    self._remove_variants(self._blob_directory(digest), blob.filename)
+            raise
+        for photo in photos.values():
             self.db.refresh(photo)
+        return photos, errors
+
+    def _enqueue_batch(
+        self,
+        files: Sequence[FileStorage],
+        target_dir: str,
+        taken_ats: Optional[Sequence[Optional[datetime]]],
+        owner: dict,
+        position: int,
+    ) -> tuple[dict[int, PhotoJob], dict[int, str]]:
+        """Validates each file's type, stores its raw bytes next to where the
+        processed photo will live, and records a pending Photo plus its job.
+
+        Returns:
+            tuple: Queued jobs and error messages, each keyed by file index.
+        """
+        taken_ats = list(taken_ats or [None] * len(files))
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        jobs: dict[int, PhotoJob] = {}
+        errors: dict[int, str] = {}
+
+        for index, (file_storage, taken_at) in enumerate(zip(files, taken_ats)):
+            try:
+                self._sniff_mime(file_storage)
+            except ValueError as error:
+                errors[index] = str(error)
+                continue
+
+            os.makedirs(target_dir, exist_ok=True)
+            filename = f"{uuid.uuid4().hex}{self.OUTPUT_EXT}"
+            source_path = os.path.join(target_dir, self._upload_name(filename))
+            file_storage.save(source_path)
+            self._publish(source_path)
+
+            photo = Photo(
+                **owner,
+                filename=filename,
+                original_filename=(file_storage.filename or "")[:255],
+                mime_type=self.OUTPUT_MIME,
+                size_bytes=os.path.getsize(source_path),
+                position=position,
+                taken_at=taken_at or now,
+                status=Photo.STATUS_PENDING,
+            )
+            jobs[index] = PhotoJob(
+                photo=photo, source_path=source_path, taken_at=taken_at
+            )
+            position += 1
+
+        if not jobs:
+            return jobs, errors
+        self.db.add_all(jobs.values())
+        try:
+            self.db.commit()
         except IntegrityError:
             self.db.rollback()
+            for job in jobs.values():
+                try:
+                    os.remove(job.source_path)
+                except FileNotFoundError:
+                    pass
+            self.storage.delete_many(
+                self._storage_key(job.source_path) for job in jobs.values()
+            )
             raise
-        return photo
+        for job in jobs.values():
+            self.db.refresh(job)
+        return jobs, errors
+
+    def _fail_job(self, job: PhotoJob, error: str) -> None:
+        """Marks a job and its Photo as failed. The raw upload is kept on disk
+        until the photo is deleted.
+        """
+        job.status = PhotoJob.STATUS_FAILED
+        job.error = error
+        job.finished_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        job.photo.status = Photo.STATUS_FAILED
+        self.db.commit()
+        self._record_change(job.photo)
+
+    def _requeue_job(self, job: PhotoJob, error: str, count_attempt: bool = True) -> None:
+        """Puts a job back in the queue after a transient failure. Jobs that
+        used up MAX_JOB_ATTEMPTS are failed by claim_next_job instead.
+
+        Args:
+            job (PhotoJob): The job to requeue.
+            error (str): Why this attempt did not finish.
+            count_attempt (bool): Whether the attempt counts towards
+                MAX_JOB_ATTEMPTS. Waiting for image work does not.
+        """
+        if not count_attempt:
+            job.attempts -= 1  # type: ignore[assignment]
+        job.status = PhotoJob.STATUS_PENDING
+        job.error = error
+        job.started_at = None
+        self.db.commit()
+
+    def _record_change(self, photo: Photo) -> None:
+        """Bumps the owner's data version after a change made outside a
+        request, so conditional GETs of their lists stop matching.
+        """
+        owner_id = self.owner_user_id(photo)
+        if owner_id is not None:
+            DataVersionService(self.db).bump(DataVersionService.user_scope(owner_id))
 
     def _next_position(
         self, plant_id: Optional[int] = None, care_log_id: Optional[int] = None
@@ -493,23 +2199,599 @@ class PhotoService:
             pass
         return None
 
+    def _sniff_mime(self, file_storage: FileStorage) -> str:
+        """Detects the upload's true MIME type from its first bytes and
+        rewinds the stream.
+
+        Raises:
+            ValueError: If MIME type is not in `ALLOWED_MIME_TYPES`.
+        """
+        allowed = current_app.config["ALLOWED_MIME_TYPES"]
+        file_storage.seek(0)
+        head = file_storage.read(self.MIME_SNIFF_BYTES)
+        file_storage.seek(0)
+        detected_mime = magic.from_buffer(head, mime=True)
+        if detected_mime not in allowed:
+            raise ValueError(
+                f"Unsupported file type: {detected_mime}. "
+                f"Allowed: {', '.join(sorted(allowed))}"
+            )
+        return detected_mime
+
+    @contextmanager
+    def _spooled_upload(
+        self, file_storage: FileStorage
+    ) -> Iterator[tuple[str, IO[bytes]]]:
+        """Sniffs an upload's MIME type and yields it with a seekable file to
+        decode from, without ever reading the whole upload into memory.
+
+        Uploads that Werkzeug already buffered to disk are used in place;
+        anything else is copied to a temporary file in fixed-size chunks.
+
+        Raises:
+            ValueError: If MIME type is not in `ALLOWED_MIME_TYPES`.
+        """
+        detected_mime = self._sniff_mime(file_storage)
+        stream = file_storage.stream
+        try:
+            stream.fileno()
+            on_disk = stream.seekable()
+        except (AttributeError, OSError, ValueError):
+            on_disk = False
+
+        if on_disk:
+            stream.seek(0)
+            yield detected_mime, stream  # type: ignore[misc]
+            return
+
+        with tempfile.TemporaryFile() as spool:
+            shutil.copyfileobj(stream, spool, self.SPOOL_CHUNK_SIZE)
+            spool.seek(0)
+            yield detected_mime, spool
+
+    @classmethod
+    def _decode_cost(cls, img: Image.Image) -> int:
+        """Estimates the peak memory in bytes needed to decode `img` at its
+        current (possibly drafted) size, from the header alone.
+        """
+        return img.width * img.height * max(len(img.getbands()), 3) * cls.DECODE_PEAK_FACTOR
+
+    def _check_pixel_count(self, img: Image.Image) -> None:
+        """Rejects images whose header declares more pixels than
+        `PHOTO_MAX_IMAGE_PIXELS` (Pillow's `MAX_IMAGE_PIXELS` decompression
+        bomb limit by default). Call it before drafting, which shrinks
+        `img.size`.
+
+        Raises:
+            ValueError: If the image has too many pixels.
+        """
+        # Pillow only warns between MAX_IMAGE_PIXELS and twice that
+        max_pixels = current_app.config.get("PHOTO_MAX_IMAGE_PIXELS") or Image.MAX_IMAGE_PIXELS
+        if max_pixels and img.width * img.height > max_pixels:
+            raise ValueError(
+                f"Image has too many pixels to process ({img.width}x{img.height})."
+            )
+
+    def _check_decode_budget(self, img: Image.Image) -> int:
+        """Estimates the peak memory needed to decode `img` at its current,
+        possibly drafted, size and rejects images above the
+        `PHOTO_MAX_DECODE_BYTES` cap.
+
+        Returns:
+            int: The estimated peak in bytes.
+
+        Raises:
+            ValueError: If the estimate exceeds the cap.
+        """
+        limit = current_app.config.get("PHOTO_MAX_DECODE_BYTES", self.MAX_DECODE_BYTES)
+        estimate = self._decode_cost(img)
+        current_app.logger.debug(
+            "Decoding %sx%s %s image, estimated peak %.1f MB",
+            img.width,
+            img.height,
+            img.format,
+            estimate / (1024 * 1024),
+        )
+        if estimate > limit:
+            raise ValueError(
+                f"Image is too large to process ({img.width}x{img.height} pixels)."
+            )
+        return estimate
+
     @staticmethod
-    def _thumb_name(filename: str) -> str:
-        """Returns the thumbnail variant's filename for a given original filename."""
+    def _upload_name(filename: str) -> str:
+        """Returns the filename of a queued photo's raw upload."""
+        name, _ = os.path.splitext(filename)
+        return f"{name}{PhotoService.UPLOAD_SUFFIX}"
+
+    @classmethod
+    def _rendition_name(
+        cls,
+        filename: str,
+        width: Optional[int],
+        mime: str = OUTPUT_MIME,
+        tag: Optional[str] = None,
+    ) -> str:
+        """Returns the filename of a rendition for a given original filename.
+        A `width` of None names the full-size variant; as JPEG that is the
+        original itself.
+
+        Names carry the `tag` of the encoder settings, the current ones by
+        default, so a name never refers to two different encodings and a
+        cached rendition never goes stale. An empty `tag` gives the names
+        renditions had before they were tagged.
+        """
+        if width is None and mime == cls.OUTPUT_MIME:
+            return filename
         name, _ = os.path.splitext(filename)
-        return f"{name}_thumb{PhotoService.OUTPUT_EXT}"
+        ext = cls.RENDITION_FORMATS[mime][0]
+        tag = cls._rendition_tag() if tag is None else tag
+        suffix = f".{tag}{ext}" if tag else ext
+        if width is None:
+            return f"{name}{suffix}"
+        if width == cls.THUMBNAIL_WIDTH:
+            return f"{name}_thumb{suffix}"
+        return f"{name}_w{width}{suffix}"
+
+    @classmethod
+    @functools.cache
+    def _rendition_tag(cls) -> str:
+        """Returns a short hash of every setting that affects rendition bytes,
+        including the widths, since thumbnail names do not carry their width.
+        """
+        settings = repr(
+            (
+                sorted(cls.RENDITION_FORMATS.items()),
+                cls.RESIZE_FILTER,
+                cls.RESIZE_REDUCING_GAP,
+                cls.THUMBNAIL_WIDTH,
+                cls.RENDITION_WIDTHS,
+            )
+        )
+        return hashlib.sha256(settings.encode()).hexdigest()[:8]
+
+    @classmethod
+    def _parse_rendition_name(cls, name: str) -> Optional[tuple[str, Optional[int], str]]:
+        """Returns the original's stem, the width and the MIME type a
+        rendition name encodes, with any tag, or None for originals and other
+        files.
+        """
+        match = re.fullmatch(
+            r"(?P<stem>[^._]+)(?P<size>_thumb|_w\d+)?(?:\.(?P<tag>[0-9a-f]{8}))?(?P<ext>\.\w+)",
+            name,
+        )
+        if not match:
+            return None
+        mime = next(
+            (m for m, (ext, _, _) in cls.RENDITION_FORMATS.items() if ext == match["ext"]),
+            None,
+        )
+        size = match["size"]
+        width = None if not size else cls.THUMBNAIL_WIDTH if size == "_thumb" else int(size[2:])
+        if mime is None or (width is None and mime == cls.OUTPUT_MIME and not match["tag"]):
+            return None
+        return match["stem"], width, mime
+
+    @classmethod
+    def _variant_names(cls, filename: str) -> List[str]:
+        """Returns every on-disk filename that may exist for a photo, under
+        the current tag and without one.
+        """
+        return list(
+            dict.fromkeys(
+                [
+                    *(
+                        cls._rendition_name(filename, width, mime, tag)
+                        for tag in (None, "")
+                        for mime in cls.RENDITION_FORMATS
+                        for width in (None, *cls.RENDITION_WIDTHS)
+                    ),
+                    cls._upload_name(filename),
+                ]
+            )
+        )
+
+    def _ensure_rendition(
+        self,
+        directory: str,
+        filename: str,
+        width: Optional[int],
+        mime: str = OUTPUT_MIME,
+    ) -> str:
+        """Returns the working copy path of a rendition, fetching it from
+        photo storage or generating it if missing.
+
+        Generation happens under a lock so concurrent requests for the same
+        missing rendition decode the original only once.
+
+        Raises:
+            FileNotFoundError: If the original is missing from photo storage.
+            ImageWorkBusy: If other image work kept it waiting too long.
+        """
+        path = os.path.join(directory, self._rendition_name(filename, width, mime))
+        if self._fetch(path):
+            return path
+        with self._rendition_lock(path):
+            if not self._fetch(path):
+                original = os.path.join(directory, filename)
+                if not self._fetch(original):
+                    raise FileNotFoundError(original)
+                with Image.open(original) as img:
+                    if width:
+                        self._draft(img, width=width)
+                    with self.image_limiter.acquire(self._decode_cost(img)):
+                        self._save_rendition(
+                            ImageOps.exif_transpose(img), path, width, mime
+                        )
+                self._publish(path)
+        return path
+
+    def _save_rendition(
+        self,
+        img: Image.Image,
+        path: str,
+        width: Optional[int],
+        mime: str = OUTPUT_MIME,
+    ) -> None:
+        """Resizes a decoded image to `width` (if given) and writes it
+        atomically in the requested format.
+        """
+        rendition = self._resize_to_width(img, width) if width else img
+        if rendition.mode != "RGB":
+            rendition = rendition.convert("RGB")
+        _, image_format, quality = self.RENDITION_FORMATS[mime]
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        rendition.save(tmp_path, format=image_format, quality=quality)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def _copy_jpeg_without_metadata(
+        cls, src: IO[bytes], path: str, orientation: Optional[int]
+    ) -> None:
+        """Writes a JPEG to `path` without re-encoding it.
+
+        EXIF (including GPS) and XMP segments in APP1 and IPTC in APP13 are
+        dropped; everything else, including the ICC profile and the scan data,
+        is copied byte for byte. Copying stops at the end of the primary
+        image, so MPF secondary images, gain maps and trailers are dropped as
+        well. A non-default orientation is written back as a minimal EXIF
+        segment so the stored file still displays upright.
+
+        Raises:
+            ValueError: If the file is not a well-formed JPEG.
+        """
+        exif_segment = b""
+        if orientation not in (None, 1):
+            exif = Image.Exif()
+            exif[0x0112] = orientation
+            payload = exif.tobytes()
+            exif_segment = b"\xff\xe1" + struct.pack(">H", len(payload) + 2) + payload
+
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "wb") as dst:
+                if src.read(2) != b"\xff\xd8":
+                    raise ValueError("Corrupt JPEG file.")
+                dst.write(b"\xff\xd8")
+                marker = src.read(2)
+                while True:
+                    if len(marker) < 2 or marker[0] != 0xFF:
+                        raise ValueError("Corrupt JPEG file.")
+                    code = marker[1]
+                    # JFIF requires APP0 first, so add EXIF after it
+                    if code != 0xE0 and exif_segment:
+                        dst.write(exif_segment)
+                        exif_segment = b""
+                    if code == 0xD9:
+                        # End of the primary image
+                        dst.write(marker)
+                        break
+                    if code == 0x01 or 0xD0 <= code <= 0xD7:
+                        # Standalone markers carry no length
+                        dst.write(marker)
+                        marker = src.read(2)
+                        continue
+                    length = src.read(2)
+                    if len(length) < 2:
+                        raise ValueError("Corrupt JPEG file.")
+                    body = src.read(struct.unpack(">H", length)[0] - 2)
+                    if code not in (0xE1, 0xED):
+                        dst.write(marker + length + body)
+                    if code == 0xDA:
+                        # Start of scan: pixel data runs up to the next marker
+                        marker = cls._copy_scan_data(src, dst)
+                    else:
+                        marker = src.read(2)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def _copy_scan_data(cls, src: IO[bytes], dst: IO[bytes]) -> bytes:
+        """Copies the entropy-coded data of a scan to `dst` and returns the
+        marker that ends it, leaving `src` just past that marker.
+
+        Raises:
+            ValueError: If the file ends inside the scan.
+        """
+        pending = b""
+        while True:
+            chunk = src.read(cls.SPOOL_CHUNK_SIZE)
+            if not chunk:
+                raise ValueError("Corrupt JPEG file.")
+            data = pending + chunk
+            pending = b""
+            start = 0
+            while True:
+                index = data.find(b"\xff", start)
+                if index == -1:
+                    dst.write(data)
+                    break
+                if index == len(data) - 1:
+                    # The byte after 0xFF is in the next chunk
+                    dst.write(data[:index])
+                    pending = data[index:]
+                    break
+                code = data[index + 1]
+                # Stuffed zero bytes, restart markers and fill bytes belong
+                # to the scan
+                if code == 0x00 or 0xD0 <= code <= 0xD7 or code == 0xFF:
+                    start = index + 1 if code == 0xFF else index + 2
+                    continue
+                dst.write(data[:index])
+                src.seek(index + 2 - len(data), os.SEEK_CUR)
+                return data[index : index + 2]
+
+    @classmethod
+    def _resize_to_width(cls, img: Image.Image, width: int) -> Image.Image:
+        """Resizes an image to `width`, preserving its aspect ratio.
+
+        Large reductions first shrink by an integer factor with reduce(), which
+        is far cheaper than LANCZOS over the full bitmap and visually identical
+        once the final resample keeps a 2x margin.
+        """
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        height = max(1, int(img.height * width / img.width))
+        return img.resize(
+            (width, height), cls.RESIZE_FILTER, reducing_gap=cls.RESIZE_REDUCING_GAP
+        )
+
+    @classmethod
+    def _placeholder(cls, thumb: Image.Image) -> str:
+        """Returns a `PLACEHOLDER_WIDTH`-wide JPEG of an already decoded
+        thumbnail as a data URI, a few hundred bytes that clients can show
+        blurred while the real image loads.
+        """
+        tiny = cls._resize_to_width(thumb, cls.PLACEHOLDER_WIDTH)
+        buffer = io.BytesIO()
+        tiny.save(buffer, format="JPEG", quality=cls.JPEG_QUALITY_PLACEHOLDER, optimize=True)
+        return "data:image/jpeg;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+    @staticmethod
+    def _draft(
+        img: Image.Image,
+        width: Optional[int] = None,
+        max_dimension: Optional[int] = None,
+    ) -> None:
+        """Configures a not-yet-loaded image to decode at reduced resolution
+        when only a `width`-wide rendition or a `max_dimension` preview is needed.
+
+        JPEG decodes at 1/2, 1/4 or 1/8 scale, and HEIF decodes an embedded
+        thumbnail when one covers the requested size. The result is never
+        smaller than the requested size. Other formats ignore the draft.
+        """
+        image_width, image_height = img.size
+        if width is not None:
+            # EXIF orientations 5-8 swap the displayed width and height
+            rotated = img.getexif().get(0x0112) in (5, 6, 7, 8)
+            scale = width / (image_height if rotated else image_width)
+        elif max_dimension is not None:
+            scale = max_dimension / max(image_width, image_height)
+        else:
+            return
+        if scale < 1:
+            img.draft(
+                None,
+                (math.ceil(image_width * scale), math.ceil(image_height * scale)),
+            )
+
+    @contextmanager
+    def _rendition_lock(self, path: str) -> Iterator[None]:
+        """Serializes rendition generation across threads and processes.
+
+        Paths hash onto a fixed set of lock files, so locking never leaves a
+        stray file behind per image.
+        """
+        lock_dir = os.path.join(self.upload_folder, ".locks")
+        os.makedirs(lock_dir, exist_ok=True)
+        stripe = zlib.crc32(path.encode()) % self.RENDITION_LOCK_STRIPES
+        with open(os.path.join(lock_dir, f"{stripe}.lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
 
     def _delete_photo_files(self, photo: Photo) -> None:
-        """Deletes the on-disk original and thumbnail for a photo (best-effort)."""
-        for thumb in (False, True):
-            path = self.file_path_for(photo, thumb=thumb)
+        """Queues the original, every rendition, and any queued raw upload
+        of a photo for deletion. Blob-backed photos release their reference
+        instead.
+        """
+        if photo.blob_id is not None:
+            self._release_blobs([(photo.blob_id,)])
+            return
+        self._tombstone(self.directory_for(photo), photo.filename)  # type: ignore[arg-type]
+
+    def _release_blobs(self, rows: Sequence[tuple]) -> None:
+        """Drops one reference per `(blob_id,)` row. Blobs left without
+        references are deleted and their files queued for deletion.
+
+        The caller commits, together with the Photo deletes that released them.
+        """
+        counts = Counter(row[0] for row in rows)
+        if not counts:
+            return
+        blobs = (
+            self.db.query(PhotoBlob)
+            .filter(PhotoBlob.id.in_(list(counts)))
+            .with_for_update()
+            .populate_existing()
+            .all()
+        )
+        for blob in blobs:
+            blob.ref_count -= counts[blob.id]
+            if blob.ref_count <= 0:
+                self._tombstone(
+                    self._blob_directory(blob.sha256), blob.filename  # type: ignore[arg-type]
+                )
+                self.db.delete(blob)
+
+    def _remove_variants(self, directory: str, filename: str) -> None:
+        """Removes every file that may exist for `filename` in `directory`,
+        from the working copy and, in one batch, from photo storage.
+        """
+        paths = [os.path.join(directory, name) for name in self._variant_names(filename)]
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.storage.delete_many(self._storage_key(path) for path in paths)
+
+    def _tombstone(self, directory: str, filename: Optional[str] = None) -> None:
+        """Queues the variants of `filename` in `directory`, just the file if
+        it names a rendition, or the whole directory, for the reaper. The
+        caller commits.
+        """
+        self.db.add(
+            PhotoTombstone(
+                directory=os.path.relpath(directory, self.upload_folder),
+                filename=filename,
+            )
+        )
+
+    def _tombstone_legacy_files(self, directory: str, owner_filter) -> None:
+        """Queues the files of an owner's photos stored before the blob
+        store, then the owner's directory itself, for deletion.
+        """
+        for (filename,) in self.db.query(Photo.filename).filter(
+            owner_filter, Photo.blob_id.is_(None)
+        ):
+            self._tombstone(directory, filename)
+        self._tombstone(directory)
+
+    def _copy_variants(
+        self, directory: str, filename: str, target_dir: str, target_filename: str
+    ) -> None:
+        """Copies the original and every rendition present in the working copy
+        under their names for `target_filename`, and publishes them. Missing
+        renditions are generated again on first request.
+        """
+        for name, target_name in zip(
+            self._variant_names(filename), self._variant_names(target_filename)
+        ):
+            source = os.path.join(directory, name)
+            if not os.path.isfile(source):
+                continue
+            target = os.path.join(target_dir, target_name)
+            with open(source, "rb") as stream:
+                write_file(target, stream)
+            self._publish(target)
+
+    def _storage_key(self, path: str) -> str:
+        """Returns the photo storage key of a working copy path."""
+        return os.path.relpath(path, self.upload_folder).replace(os.sep, "/")
+
+    def _publish(self, path: str) -> None:
+        """Copies a file written to the working copy into photo storage."""
+        self.storage.put_file(self._storage_key(path), path, self._content_type(path))
+
+    def _publish_variants(self, directory: str, filename: str) -> None:
+        """Publishes every file written for `filename` in `directory`."""
+        for name in self._variant_names(filename):
+            path = os.path.join(directory, name)
+            if os.path.isfile(path):
+                self._publish(path)
+
+    def _fetch(self, path: str) -> bool:
+        """Makes sure a file in photo storage is present in the working copy,
+        downloading it when another node wrote it. A copy not verified for
+        `PHOTO_WORKING_COPY_REVALIDATE` seconds is checked against photo
+        storage, and dropped if photo storage no longer has it.
+
+        Returns:
+            bool: False if photo storage has no such file.
+        """
+        try:
+            verified = os.stat(path).st_mtime
+        except FileNotFoundError:
+            verified = None
+        if verified is not None:
+            if self._working_copy_is_storage() or time.time() - verified < self.revalidate_after:
+                return True
+            if self.storage.exists(self._storage_key(path)):
+                os.utime(path)
+                return True
+            # Deleted from photo storage, e.g. reaped on another node
             try:
                 os.remove(path)
             except FileNotFoundError:
                 pass
+            return False
+        try:
+            self.storage.download(self._storage_key(path), path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    @classmethod
+    def _content_type(cls, path: str) -> str:
+        """Returns the MIME type of a stored photo file from its extension."""
+        extension = os.path.splitext(path)[1]
+        for mime, (rendition_ext, _, _) in cls.RENDITION_FORMATS.items():
+            if extension == rendition_ext:
+                return mime
+        return "application/octet-stream"
+
+    def _signed_url(self, path: str, width: Optional[int], expires: int) -> str:
+        """Builds the signed URL of a file path relative to the upload folder."""
+        params = {"exp": expires, "sig": self._url_signature(path, width, expires)}
+        if width is not None:
+            params = {"w": width, **params}
+        # Changes with the encoder settings, so browsers never reuse a
+        # rendition cached under the old ones. Not signed, nor checked
+        params["v"] = self._rendition_tag()
+        return f"{self.SIGNED_URL_PREFIX}{quote(path)}?{urlencode(params)}"
 
     @staticmethod
+    def _url_signature(path: str, width: Optional[int], expires: int) -> str:
+        """Returns the HMAC-SHA256 of a signed URL's path, width and expiry."""
+        key = (
+            current_app.config.get("PHOTO_URL_SIGNING_KEY")
+            or current_app.config["JWT_SECRET_KEY"]
+        )
+        message = f"{path}\n{width or ''}\n{expires}".encode()
+        digest = hmac.new(key.encode(), message, hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+    def _blob_directory(self, digest: str) -> str:
+        """Returns the sharded blob store directory for a content hash."""
+        return os.path.join(self.upload_folder, self.BLOB_DIR, digest[:2], digest[2:4])
+
+    def _hash_upload(self, file_storage: FileStorage) -> str:
+        """Returns the SHA-256 of an upload's raw bytes and rewinds the stream."""
+        digest = hashlib.sha256()
+        file_storage.seek(0)
+        for chunk in iter(lambda: file_storage.read(self.SPOOL_CHUNK_SIZE), b""):
+            digest.update(chunk)
+        file_storage.seek(0)
+        return digest.hexdigest()
+
     def _serialize_photo(
+        self,
         photo: Photo,
         source_type: str,
         care_log_id: Optional[int] = None,
@@ -529,9 +2811,12 @@ class PhotoService:
             "original_filename": photo.original_filename,
             "width": photo.width,
             "height": photo.height,
+            "placeholder": photo.placeholder,
             "position": photo.position,
             "taken_at": photo.taken_at.isoformat() if photo.taken_at else None,
             "created_at": photo.created_at.isoformat() if photo.created_at else None,  # type: ignore
+            "status": photo.status,
+            "urls": self.signed_urls_for(photo),
             "is_cover": is_cover,
             "source": {"type": source_type},
         }
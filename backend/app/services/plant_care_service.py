@@ -4,7 +4,7 @@ from typing import List, Optional
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.models import CarePlan, PlantCare
+from app.models import CarePlan, Photo, PlantCare
 from app.services.photo_service import PhotoService
 
 
@@ -224,7 +224,8 @@ class PlantCareService:
             # Include care that is overdue, due soon, or upcoming within 30 days
             days_until_due = (next_due - today).days
             if days_until_due <= 30:
-                cover_photo = PhotoService(self.db).get_cover_photo(plan.plant_id)
+                photo_service = PhotoService(self.db)
+                cover_photo = photo_service.get_cover_photo(plan.plant_id)
 
                 upcoming_logs.append(
                     {
@@ -236,6 +237,12 @@ class PlantCareService:
                         "due_date": next_due.isoformat(),
                         "days_until_due": days_until_due,
                         "cover_photo_id": cover_photo.id if cover_photo else None,
+                        "cover_photo_urls": photo_service.signed_urls_for(cover_photo)
+                        if cover_photo
+                        else None,
+                        "cover_photo_placeholder": cover_photo.placeholder
+                        if cover_photo
+                        else None,
                     }
                 )
 
@@ -258,6 +265,12 @@ class PlantCareService:
         for key, value in updates.items():
             if hasattr(care_log, key):
                 setattr(care_log, key, value)
+        if "plant_id" in updates:
+            # Care log photos follow their log into the new plant's gallery
+            self.db.query(Photo).filter_by(care_log_id=care_id).update(
+                {Photo.gallery_plant_id: care_log.plant_id},
+                synchronize_session=False,
+            )
 
         try:
             self.db.commit()
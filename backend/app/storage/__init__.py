@@ -0,0 +1,28 @@
+from flask import current_app
+
+from app.storage.base import Storage, StorageDeleteError
+from app.storage.local import LocalStorage
+from app.storage.s3 import S3Storage
+
+
+def get_storage() -> Storage:
+    """Returns the app's photo storage backend, created on first use from
+    `PHOTO_STORAGE_BACKEND`: `local` (default) or `s3`.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    storage = current_app.extensions.get("photo_storage")
+    if storage is None:
+        backend = current_app.config.get("PHOTO_STORAGE_BACKEND") or "local"
+        if backend == "local":
+            storage = LocalStorage(
+                current_app.config.get("PHOTO_STORAGE_ROOT")
+                or current_app.config["UPLOAD_FOLDER"]
+            )
+        elif backend == "s3":
+            storage = S3Storage.from_config(current_app.config)
+        else:
+            raise ValueError(f"Unknown PHOTO_STORAGE_BACKEND: {backend}")
+        current_app.extensions["photo_storage"] = storage
+    return storage
@@ -0,0 +1,105 @@
+import abc
+import os
+import shutil
+import uuid
+from typing import IO, Iterable, Optional
+
+CHUNK_SIZE = 64 * 1024
+
+
+def write_file(path: str, stream: IO[bytes]) -> None:
+    """Copies a readable stream into a local file in chunks, creating its
+    directory. The file appears atomically once complete.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "wb") as target:
+            shutil.copyfileobj(stream, target, CHUNK_SIZE)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class StorageDeleteError(Exception):
+    """Raised by `Storage.delete_many` when some objects could not be
+    deleted. The others were deleted.
+
+    Attributes:
+        keys (dict): Error message per key that is still stored.
+    """
+
+    def __init__(self, keys: dict[str, str]):
+        super().__init__(
+            f"Could not delete {len(keys)} objects: "
+            + "; ".join(f"{key}: {error}" for key, error in list(keys.items())[:5])
+        )
+        self.keys = keys
+
+
+class Storage(abc.ABC):
+    """Interface of a photo storage backend.
+
+    Objects are addressed by `/`-separated keys relative to the storage root,
+    matching their paths relative to `UPLOAD_FOLDER`.
+    """
+
+    @abc.abstractmethod
+    def put(self, key: str, stream: IO[bytes], content_type: Optional[str] = None) -> None:
+        """Stores the contents of a readable stream under `key`, replacing
+        any existing object. The stream is read in chunks, never all at once.
+        """
+
+    def put_file(self, key: str, path: str, content_type: Optional[str] = None) -> None:
+        """Stores a local file under `key`."""
+        with open(path, "rb") as stream:
+            self.put(key, stream, content_type)
+
+    @abc.abstractmethod
+    def open(self, key: str) -> IO[bytes]:
+        """Returns a readable stream of the object stored under `key`.
+
+        Raises:
+            FileNotFoundError: If no object is stored under `key`.
+        """
+
+    @abc.abstractmethod
+    def download(self, key: str, path: str) -> None:
+        """Streams the object stored under `key` into a local file, written
+        atomically.
+
+        Raises:
+            FileNotFoundError: If no object is stored under `key`.
+        """
+
+    @abc.abstractmethod
+    def exists(self, key: str) -> bool:
+        """Returns True if an object is stored under `key`."""
+
+    @abc.abstractmethod
+    def list_directory(self, prefix: str) -> dict[str, int]:
+        """Returns the size of every object directly under the `/`-separated
+        directory `prefix`, by key. Unknown directories are empty.
+        """
+
+    @abc.abstractmethod
+    def delete_many(self, keys: Iterable[str]) -> None:
+        """Deletes every object in `keys`, in as few requests as the backend
+        allows. Keys with no object are ignored.
+
+        Raises:
+            StorageDeleteError: If some objects could not be deleted, after
+                attempting every key.
+        """
+
+    def presigned_url(
+        self, key: str, expires_in: int, content_type: Optional[str] = None
+    ) -> Optional[str]:
+        """Returns a URL that reads `key` without credentials for
+        `expires_in` seconds, or None if the backend cannot serve reads itself.
+        """
+        return None
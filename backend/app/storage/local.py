@@ -0,0 +1,76 @@
+import os
+from typing import IO, Iterable, Optional
+
+from app.storage.base import Storage, StorageDeleteError, write_file
+
+
+class LocalStorage(Storage):
+    """Stores objects as files under a root directory.
+
+    Rooted at `UPLOAD_FOLDER` (the default), objects and the working copy
+    are the same files, so publishing and fetching them costs nothing.
+    Rooted at a shared mount, it stands in for an object store between
+    nodes. Presigned reads are not supported; files are served through the
+    app's own signed URLs instead.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+
+    def path(self, key: str) -> str:
+        """Returns the absolute path of `key`.
+
+        Raises:
+            ValueError: If `key` resolves outside the root.
+        """
+        path = os.path.abspath(os.path.join(self.root, key))
+        if not path.startswith(self.root + os.sep):
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    def put(self, key: str, stream: IO[bytes], content_type: Optional[str] = None) -> None:
+        write_file(self.path(key), stream)
+
+    def put_file(self, key: str, path: str, content_type: Optional[str] = None) -> None:
+        if os.path.abspath(path) == self.path(key):
+            return
+        super().put_file(key, path, content_type)
+
+    def open(self, key: str) -> IO[bytes]:
+        return open(self.path(key), "rb")
+
+    def download(self, key: str, path: str) -> None:
+        source = self.path(key)
+        if os.path.abspath(path) == source:
+            if not os.path.isfile(source):
+                raise FileNotFoundError(key)
+            return
+        with self.open(key) as stream:
+            write_file(path, stream)
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(self.path(key))
+
+    def list_directory(self, prefix: str) -> dict[str, int]:
+        try:
+            entries = list(os.scandir(self.path(prefix)))
+        except (FileNotFoundError, NotADirectoryError):
+            return {}
+        return {
+            f"{prefix}/{entry.name}": entry.stat().st_size
+            for entry in entries
+            # Skip files still being written
+            if entry.is_file() and not entry.name.endswith(".tmp")
+        }
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        failed = {}
+        for key in keys:
+            try:
+                os.remove(self.path(key))
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as error:
+                failed[key] = str(error)
+        if failed:
+            raise StorageDeleteError(failed)
@@ -0,0 +1,130 @@
+from contextlib import closing
+from typing import IO, Iterable, Optional
+
+from app.storage.base import Storage, StorageDeleteError, write_file
+
+
+class S3Storage(Storage):
+    """Stores objects in an S3-compatible bucket (AWS S3, MinIO, ...).
+
+    Requires the optional `boto3` package. Uploads stream through boto3's
+    managed transfers, switching to multipart for large files.
+    """
+
+    # DeleteObjects accepts at most 1000 keys per request
+    DELETE_BATCH_SIZE = 1000
+    MISSING_CODES = {"404", "NoSuchKey", "NotFound"}
+
+    def __init__(self, client, bucket: str, prefix: str = ""):
+        """Initializes the backend with a boto3 S3 client.
+
+        Args:
+            client: A boto3 S3 client.
+            bucket (str): Name of an existing bucket.
+            prefix (str): Prepended to every key, e.g. `photos/`.
+        """
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+
+    @classmethod
+    def from_config(cls, config) -> "S3Storage":
+        """Creates the backend from the `PHOTO_S3_*` settings. Credentials are
+        read by boto3 from its usual sources, e.g. `AWS_ACCESS_KEY_ID`.
+
+        Raises:
+            RuntimeError: If boto3 is not installed or no bucket is configured.
+        """
+        try:
+            import boto3
+        except ImportError as error:
+            raise RuntimeError(
+                "PHOTO_STORAGE_BACKEND=s3 requires boto3 (pip install boto3)."
+            ) from error
+        if not config.get("PHOTO_S3_BUCKET"):
+            raise RuntimeError("PHOTO_STORAGE_BACKEND=s3 requires PHOTO_S3_BUCKET.")
+        client = boto3.client(
+            "s3",
+            endpoint_url=config.get("PHOTO_S3_ENDPOINT_URL") or None,
+            region_name=config.get("PHOTO_S3_REGION") or None,
+        )
+        return cls(client, config["PHOTO_S3_BUCKET"], config.get("PHOTO_S3_PREFIX", ""))
+
+    def put(self, key: str, stream: IO[bytes], content_type: Optional[str] = None) -> None:
+        self.client.upload_fileobj(
+            stream,
+            self.bucket,
+            self.prefix + key,
+            ExtraArgs={"ContentType": content_type} if content_type else None,
+        )
+
+    def open(self, key: str) -> IO[bytes]:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self.prefix + key)
+        except Exception as error:
+            if self._is_missing(error):
+                raise FileNotFoundError(key) from error
+            raise
+        return response["Body"]
+
+    def download(self, key: str, path: str) -> None:
+        with closing(self.open(key)) as body:
+            write_file(path, body)
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.prefix + key)
+        except Exception as error:
+            if self._is_missing(error):
+                return False
+            raise
+        return True
+
+    def list_directory(self, prefix: str) -> dict[str, int]:
+        sizes = {}
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(
+            Bucket=self.bucket, Prefix=f"{self.prefix}{prefix}/", Delimiter="/"
+        ):
+            for item in page.get("Contents", []):
+                sizes[item["Key"][len(self.prefix) :]] = item["Size"]
+        return sizes
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        keys = [self.prefix + key for key in keys]
+        failed = {}
+        for start in range(0, len(keys), self.DELETE_BATCH_SIZE):
+            # Quiet mode still lists every key that failed
+            response = self.client.delete_objects(
+                Bucket=self.bucket,
+                Delete={
+                    "Objects": [
+                        {"Key": key}
+                        for key in keys[start : start + self.DELETE_BATCH_SIZE]
+                    ],
+                    "Quiet": True,
+                },
+            )
+            for error in response.get("Errors", []):
+                if str(error.get("Code")) in self.MISSING_CODES:
+                    continue
+                key = error["Key"][len(self.prefix) :]
+                failed[key] = f"{error.get('Code')}: {error.get('Message')}"
+        if failed:
+            raise StorageDeleteError(failed)
+
+    def presigned_url(
+        self, key: str, expires_in: int, content_type: Optional[str] = None
+    ) -> Optional[str]:
+        params = {"Bucket": self.bucket, "Key": self.prefix + key}
+        if content_type:
+            params["ResponseContentType"] = content_type
+        return self.client.generate_presigned_url(
+            "get_object", Params=params, ExpiresIn=expires_in
+        )
+
+    @classmethod
+    def _is_missing(cls, error: Exception) -> bool:
+        """Returns True if a botocore ClientError reports a missing object."""
+        response = getattr(error, "response", None) or {}
+        return str(response.get("Error", {}).get("Code")) in cls.MISSING_CODES
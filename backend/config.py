@@ -32,7 +32,10 @@ class Config:
 
     # Photo uploads
     UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER", "/app/uploads")
-    MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10 MB
+    # Limit per uploaded file, checked as each multipart part arrives
+    MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE", str(10 * 1024 * 1024)))
+    # Limit on a whole request, so one batch can carry several large photos
+    MAX_REQUEST_SIZE = int(os.getenv("MAX_REQUEST_SIZE", str(200 * 1024 * 1024)))
     ALLOWED_MIME_TYPES = {
         "image/jpeg",
         "image/png",
@@ -40,3 +43,50 @@ class Config:
         "image/heic",
         "image/heif",
     }
+    # Upper bound on images decoded concurrently for one batch upload
+    PHOTO_PROCESSING_WORKERS = int(os.getenv("PHOTO_PROCESSING_WORKERS", "4"))
+    # Cap on the estimated memory needed to decode a single upload
+    PHOTO_MAX_DECODE_BYTES = int(
+        os.getenv("PHOTO_MAX_DECODE_BYTES", str(512 * 1024 * 1024))
+    )
+    # Rendition widths written at upload time instead of on first request
+    PHOTO_PREWARM_WIDTHS = tuple(
+        int(width) for width in os.getenv("PHOTO_PREWARM_WIDTHS", "").split(",") if width
+    )
+    # Hand photo transfers to the front proxy: "x-accel" (nginx) or
+    # "x-sendfile" (Apache, lighttpd), or redirect to a presigned storage URL:
+    # "redirect". Empty sends files from Flask.
+    PHOTO_SEND_FILE_MODE = os.getenv("PHOTO_SEND_FILE_MODE", "")
+    # Internal nginx location that maps onto UPLOAD_FOLDER in x-accel mode
+    PHOTO_ACCEL_PREFIX = os.getenv("PHOTO_ACCEL_PREFIX", "/protected-uploads/")
+    # Key and lifetime (seconds) of signed photo URLs in list responses.
+    # The key defaults to JWT_SECRET_KEY.
+    PHOTO_URL_SIGNING_KEY = os.getenv("PHOTO_URL_SIGNING_KEY")
+    PHOTO_URL_TTL = int(os.getenv("PHOTO_URL_TTL", str(24 * 60 * 60)))
+    # Size cap (bytes) of the processed preview cache and the lifetime
+    # (seconds) of the upload tokens it hands out
+    PHOTO_PREVIEW_CACHE_BYTES = int(
+        os.getenv("PHOTO_PREVIEW_CACHE_BYTES", str(256 * 1024 * 1024))
+    )
+    PHOTO_PREVIEW_TTL = int(os.getenv("PHOTO_PREVIEW_TTL", str(60 * 60)))
+    # Where photo files live: "local" (a directory, UPLOAD_FOLDER by default)
+    # or "s3" (any S3-compatible store; needs boto3). With several app nodes,
+    # point every node at the same store; UPLOAD_FOLDER is then each node's
+    # working copy of the files it serves.
+    PHOTO_STORAGE_BACKEND = os.getenv("PHOTO_STORAGE_BACKEND", "local")
+    PHOTO_STORAGE_ROOT = os.getenv("PHOTO_STORAGE_ROOT")
+    PHOTO_S3_BUCKET = os.getenv("PHOTO_S3_BUCKET")
+    PHOTO_S3_ENDPOINT_URL = os.getenv("PHOTO_S3_ENDPOINT_URL")
+    PHOTO_S3_REGION = os.getenv("PHOTO_S3_REGION")
+    PHOTO_S3_PREFIX = os.getenv("PHOTO_S3_PREFIX", "")
+    # Image work running at once per process: images decoded, their combined
+    # estimated memory, and the seconds to queue before answering 503
+    PHOTO_IMAGE_CONCURRENCY = int(os.getenv("PHOTO_IMAGE_CONCURRENCY", "4"))
+    PHOTO_IMAGE_MEMORY_BUDGET = int(
+        os.getenv("PHOTO_IMAGE_MEMORY_BUDGET", str(1024 * 1024 * 1024))
+    )
+    PHOTO_IMAGE_QUEUE_TIMEOUT = float(os.getenv("PHOTO_IMAGE_QUEUE_TIMEOUT", "10"))
+    # Pixel cap per image; 0 keeps Pillow's MAX_IMAGE_PIXELS (about 89 MP)
+    PHOTO_MAX_IMAGE_PIXELS = int(os.getenv("PHOTO_MAX_IMAGE_PIXELS", "0"))
+    # Lifetime (seconds) of presigned URLs in PHOTO_SEND_FILE_MODE=redirect
+    PHOTO_PRESIGNED_URL_TTL = int(os.getenv("PHOTO_PRESIGNED_URL_TTL", str(15 * 60)))
@@ -0,0 +1,143 @@
+"""Setup shared by the photo tests.
+
+Service tests subclass ``PhotoServiceTestCase`` and API tests subclass
+``PhotoApiTestCase``; both run against an in-memory SQLite database and a
+temporary upload folder.
+"""
+
+from io import BytesIO
+import os
+from tempfile import TemporaryDirectory
+import unittest
+from unittest.mock import patch
+
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from PIL import Image
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from werkzeug.datastructures import FileStorage
+
+from app.api.photos import photo_bp
+from app.models import Photo, Plant, User
+from app.models.database import Base
+
+
+def jpeg_bytes(color="green", size=(800, 600)):
+    image = BytesIO()
+    Image.new("RGB", size, color).save(image, format="JPEG")
+    return image.getvalue()
+
+
+def jpeg_upload(color="green", size=(800, 600), filename="a.jpg"):
+    return FileStorage(BytesIO(jpeg_bytes(color, size)), filename)
+
+
+def noisy_jpeg(side):
+    """A JPEG that barely compresses, for tests that need a predictable size."""
+    image = BytesIO()
+    Image.frombytes("RGB", (side, side), os.urandom(side * side * 3)).save(
+        image, format="JPEG", quality=95
+    )
+    return image.getvalue()
+
+
+def read_file(path):
+    with open(path, "rb") as handle:
+        return handle.read()
+
+
+def session_factory(**engine_options):
+    """Return a sessionmaker bound to a fresh in-memory database."""
+    engine = create_engine("sqlite://", **engine_options)
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+def add_plant(db, username="fern", nickname="Monstera"):
+    """Add a user owning one plant and flush it so the plant has an id."""
+    user = User(username=username, email=f"{username}@example.com", password_hash="x")
+    plant = Plant(user=user, nickname=nickname)
+    db.add(plant)
+    db.flush()
+    return plant
+
+
+class PhotoServiceTestCase(unittest.TestCase):
+    """Runs each test inside an app context with ``self.db`` and ``self.plant``."""
+
+    config = {}
+
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.app = Flask(__name__)
+        self.app.config.update(
+            UPLOAD_FOLDER=self.tmp.name,
+            ALLOWED_MIME_TYPES={"image/jpeg"},
+            **self.config,
+        )
+        ctx = self.app.app_context()
+        ctx.push()
+        self.addCleanup(ctx.pop)
+
+        Session = session_factory()
+        self.engine = Session.kw["bind"]
+        self.db = Session()
+        self.addCleanup(self.db.close)
+        self.plant = add_plant(self.db)
+        self.user = self.plant.user
+        self.db.commit()
+
+
+class PhotoApiTestCase(unittest.TestCase):
+    """Serves the photo blueprint through ``self.client``.
+
+    ``self.Session`` replaces the blueprint's ``SessionLocal`` so tests can
+    seed the database the requests read from.
+    """
+
+    config = {}
+
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.Session = session_factory()
+        self.engine = self.Session.kw["bind"]
+        patcher = patch("app.api.photos.SessionLocal", self.Session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.app = Flask(__name__)
+        self.app.config.update(
+            UPLOAD_FOLDER=self.tmp.name,
+            ALLOWED_MIME_TYPES={"image/jpeg"},
+            JWT_SECRET_KEY="photo-api-test-signing-secret-key",
+            **self.config,
+        )
+        JWTManager(self.app)
+        self.app.register_blueprint(photo_bp, url_prefix="/api/photos")
+        self.client = self.app.test_client()
+
+    def auth_headers(self, user_id, **headers):
+        """Return request headers carrying a token for ``user_id``."""
+        with self.app.app_context():
+            token = create_access_token(identity=str(user_id))
+        return {"Authorization": f"Bearer {token}", **headers}
+
+    def add_photo_file(self, db, plant, filename="a.jpg", size=(1000, 750)):
+        """Write an image into the legacy plant folder and add its Photo row."""
+        directory = os.path.join(self.tmp.name, "plants", str(plant.id))
+        os.makedirs(directory, exist_ok=True)
+        Image.new("RGB", size).save(os.path.join(directory, filename))
+        photo = Photo(
+            plant_id=plant.id,
+            gallery_plant_id=plant.id,
+            filename=filename,
+            mime_type="image/jpeg",
+            size_bytes=1,
+            width=size[0],
+        )
+        db.add(photo)
+        db.flush()
+        return photo
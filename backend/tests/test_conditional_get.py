@@ -0,0 +1,101 @@
+import os
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+import unittest
+from unittest.mock import patch
+
+from flask import Flask, g, jsonify
+from PIL import Image
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.photos import photo_bp
+from app.decorators.caching import conditional_json, record_write
+from app.models.database import Base
+from app.services.data_version_service import DataVersionService
+from app.services.photo_service import PhotoService
+
+
+class ConditionalJsonTests(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        patcher = patch(
+            "app.decorators.caching.SessionLocal", sessionmaker(bind=engine)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.calls = 0
+        self.app = Flask(__name__)
+        self.app.after_request(record_write)
+
+        @self.app.route("/plants/<int:user_id>", methods=["GET"])
+        @conditional_json(lambda user_id: DataVersionService.user_scope(user_id))
+        def list_plants(user_id):
+            self.calls += 1
+            return jsonify({"plants": []}), 200
+
+        @self.app.route("/plants/<int:user_id>", methods=["POST"])
+        def create_plant(user_id):
+            g.user_id = user_id
+            return jsonify({}), 201
+
+        self.client = self.app.test_client()
+
+    def test_matching_etag_short_circuits_until_the_user_writes(self):
+        first = self.client.get("/plants/1")
+        etag = first.headers["ETag"]
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertEqual(first.headers["Cache-Control"], "private, no-cache")
+
+        cached = self.client.get("/plants/1", headers={"If-None-Match": etag})
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(self.calls, 1)
+
+        self.client.post("/plants/2")
+        self.assertEqual(
+            self.client.get("/plants/1", headers={"If-None-Match": etag}).status_code,
+            304,
+        )
+
+        self.client.post("/plants/1")
+        refreshed = self.client.get("/plants/1", headers={"If-None-Match": etag})
+        self.assertEqual(refreshed.status_code, 200)
+        self.assertNotEqual(refreshed.headers["ETag"], etag)
+        self.assertEqual(self.calls, 2)
+
+    def test_etag_of_one_user_does_not_match_another(self):
+        etag = self.client.get("/plants/1").headers["ETag"]
+
+        other = self.client.get("/plants/2", headers={"If-None-Match": etag})
+
+        self.assertEqual(other.status_code, 200)
+        self.assertNotEqual(other.headers["ETag"], etag)
+        self.assertEqual(self.calls, 2)
+
+
+class SignedPhotoConditionalTests(unittest.TestCase):
+    def test_matching_etag_skips_file_io(self):
+        with TemporaryDirectory() as upload_folder:
+            app = Flask(__name__)
+            app.config.update(UPLOAD_FOLDER=upload_folder, JWT_SECRET_KEY="secret")
+            app.register_blueprint(photo_bp, url_prefix="/api/photos")
+            os.makedirs(f"{upload_folder}/plants/1")
+            Image.new("RGB", (1000, 750)).save(f"{upload_folder}/plants/1/a.jpg")
+            with app.app_context():
+                photo = SimpleNamespace(
+                    status="ready", blob_id=None, plant_id=1, filename="a.jpg", width=1000
+                )
+                url = PhotoService(None).signed_urls_for(photo)["400"]
+            client = app.test_client()
+
+            first = client.get(url)
+            first.close()
+            self.assertEqual(first.status_code, 200)
+            with patch.object(PhotoService, "resolve_signed_file") as resolve:
+                cached = client.get(
+                    url, headers={"If-None-Match": first.headers["ETag"]}
+                )
+            self.assertEqual(cached.status_code, 304)
+            resolve.assert_not_called()
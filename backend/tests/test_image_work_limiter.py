@@ -0,0 +1,113 @@
+import os
+import threading
+import unittest
+
+from app.services.image_work_limiter import ImageWorkBusy, ImageWorkLimiter
+from app.services.photo_service import PhotoService
+from helpers import PhotoApiTestCase, add_plant, jpeg_upload
+
+
+class ImageWorkLimiterTests(unittest.TestCase):
+    def test_waiting_work_starts_when_a_slot_frees_up(self):
+        limiter = ImageWorkLimiter(max_concurrent=1, max_bytes=100, max_wait=5)
+        started = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with limiter.acquire(10):
+                started.set()
+                release.wait()
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        started.wait()
+        threading.Timer(0.05, release.set).start()
+        with limiter.acquire(10):
+            self.assertEqual(limiter.stats()["active"], 1)
+        holder.join()
+
+        stats = limiter.stats()
+        self.assertEqual((stats["completed"], stats["rejected"]), (2, 0))
+        self.assertGreater(stats["wait_seconds_max"], 0)
+
+    def test_work_over_the_memory_budget_is_rejected_after_the_timeout(self):
+        limiter = ImageWorkLimiter(max_concurrent=4, max_bytes=100, max_wait=0.01)
+
+        with limiter.acquire(80):
+            with self.assertRaises(ImageWorkBusy) as busy:
+                with limiter.acquire(40):
+                    pass
+            self.assertEqual(limiter.stats()["queued"], 0)
+        # An image above the whole budget still runs once it is alone
+        with limiter.acquire(500):
+            self.assertEqual(limiter.stats()["bytes_in_use"], 100)
+
+        self.assertGreaterEqual(busy.exception.retry_after, 1)
+        self.assertEqual(limiter.stats()["rejected"], 1)
+
+
+class ImageWorkBackpressureTests(PhotoApiTestCase):
+    config = {"PHOTO_IMAGE_CONCURRENCY": 1, "PHOTO_IMAGE_QUEUE_TIMEOUT": 0.01}
+
+    def setUp(self):
+        super().setUp()
+        db = self.Session()
+        plant = add_plant(db)
+        photo = self.add_photo_file(db, plant)
+        db.commit()
+        self.photo_id, self.plant_id = photo.id, plant.id
+        self.headers = self.auth_headers(plant.user_id, Accept="image/jpeg")
+        with self.app.app_context():
+            self.limiter = PhotoService(db).image_limiter
+        db.close()
+
+    def test_saturated_limiter_answers_503_with_retry_after(self):
+        with self.limiter.acquire(1):
+            response = self.client.get(
+                f"/api/photos/{self.photo_id}/file?w=400", headers=self.headers
+            )
+            metrics = self.client.get("/api/photos/metrics", headers=self.headers).get_json()
+
+        self.assertEqual(response.status_code, 503)
+        self.assertGreaterEqual(int(response.headers["Retry-After"]), 1)
+        self.assertEqual(metrics["image_work"]["active"], 1)
+        self.assertEqual(metrics["image_work"]["rejected"], 1)
+
+        response = self.client.get(
+            f"/api/photos/{self.photo_id}/file?w=400", headers=self.headers
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get("/api/photos/metrics").status_code, 401)
+
+    def test_busy_batch_upload_keeps_no_files(self):
+        with self.limiter.acquire(1):
+            response = self.client.post(
+                f"/api/photos/plant/{self.plant_id}",
+                data={"files": [jpeg_upload("red")]},
+                headers=self.headers,
+            )
+
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, "blobs")))
+
+    def test_images_over_the_pixel_limit_are_rejected(self):
+        self.app.config["PHOTO_MAX_IMAGE_PIXELS"] = 100 * 100
+
+        with self.app.app_context():
+            with self.assertRaisesRegex(ValueError, "too many pixels"):
+                PhotoService(None).cache_preview(1, jpeg_upload(size=(200, 200)))
+
+    def test_pixel_limit_applies_to_the_header_size_before_drafting(self):
+        # Drafting would decode it at 1200x1200, under the limit
+        self.app.config["PHOTO_MAX_IMAGE_PIXELS"] = 2000 * 2000
+
+        with self.app.app_context():
+            with self.assertRaisesRegex(ValueError, "too many pixels"):
+                PhotoService(None).cache_preview(1, jpeg_upload(size=(2400, 2400)))
+        response = self.client.post(
+            f"/api/photos/plant/{self.plant_id}",
+            data={"files": [jpeg_upload(size=(2400, 2400))]},
+            headers=self.headers,
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("too many pixels", str(response.get_json()))
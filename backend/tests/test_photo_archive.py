@@ -0,0 +1,75 @@
+from datetime import date, datetime
+from io import BytesIO
+import zipfile
+
+from app.models import CareType, PlantCare
+from app.services.photo_service import PhotoService
+from helpers import PhotoApiTestCase, add_plant, jpeg_upload, read_file
+
+
+class PlantPhotoArchiveTests(PhotoApiTestCase):
+    def setUp(self):
+        super().setUp()
+        db = self.Session()
+        plant = add_plant(db, nickname="Monstera Deliciosa")
+        care_log = PlantCare(
+            plant=plant,
+            care_type=CareType(user=plant.user, name="Watering"),
+            care_date=date(2024, 5, 2),
+        )
+        db.add(care_log)
+        db.commit()
+        with self.app.app_context():
+            service = PhotoService(db)
+            photos, _ = service.upload_plant_photos(
+                plant.id,
+                [jpeg_upload("green"), jpeg_upload("red")],
+                [datetime(2024, 5, 1), datetime(2024, 5, 3)],
+            )
+            care_photos, _ = service.upload_care_log_photos(
+                care_log.id, [jpeg_upload("blue")]
+            )
+            care_photos[0].taken_at = datetime(2024, 5, 2)
+            service.make_featured(photos[1].id)
+            self.files = {
+                color: read_file(service.file_path_for(photo))
+                for color, photo in (
+                    ("green", photos[0]),
+                    ("red", photos[1]),
+                    ("blue", care_photos[0]),
+                )
+            }
+        self.plant_id = plant.id
+        self.url = f"/api/photos/plant/{plant.id}/archive"
+        self.headers = self.auth_headers(plant.user_id)
+        db.close()
+
+    def test_archive_streams_stored_entries_in_gallery_order(self):
+        response = self.client.get(self.url, headers=self.headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        self.assertIn("Monstera_Deliciosa-photos.zip", response.headers["Content-Disposition"])
+        with zipfile.ZipFile(BytesIO(response.data)) as archive:
+            self.assertEqual(
+                archive.namelist(),
+                [
+                    "001_2024-05-03_plant.jpg",
+                    "002_2024-05-01_plant.jpg",
+                    "003_2024-05-02_watering.jpg",
+                ],
+            )
+            self.assertEqual(
+                [archive.read(name) for name in archive.namelist()],
+                [self.files["red"], self.files["green"], self.files["blue"]],
+            )
+            self.assertTrue(
+                all(info.compress_type == zipfile.ZIP_STORED for info in archive.infolist())
+            )
+
+    def test_archive_of_a_missing_plant_is_refused(self):
+        response = self.client.get(
+            f"/api/photos/plant/{self.plant_id + 1}/archive", headers=self.headers
+        )
+
+        self.assertEqual(response.status_code, 404)
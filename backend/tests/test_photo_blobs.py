@@ -0,0 +1,308 @@
+import base64
+from io import BytesIO
+import os
+import shutil
+from unittest.mock import patch
+
+from PIL import Image
+from sqlalchemy.orm import sessionmaker
+from werkzeug.datastructures import FileStorage
+
+from app.models import CareType, Photo, PhotoBlob, PhotoTombstone, PlantCare
+from app.services.data_version_service import DataVersionService
+from app.services.photo_service import PhotoService
+from app.services.plant_service import PlantService
+from app.storage import StorageDeleteError
+from helpers import PhotoServiceTestCase, jpeg_bytes, jpeg_upload
+
+
+class PhotoBlobStoreTests(PhotoServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.care_log = PlantCare(
+            plant=self.plant, care_type=CareType(user=self.user, name="Watering")
+        )
+        self.db.add(self.care_log)
+        self.db.commit()
+
+    def test_duplicate_uploads_share_one_processed_blob(self):
+        service = PhotoService(self.db)
+        upload = jpeg_bytes()
+
+        with patch.object(
+            service, "_process_and_save", wraps=service._process_and_save
+        ) as process:
+            photos, errors = service.upload_plant_photos(
+                self.plant.id,
+                [
+                    FileStorage(BytesIO(upload), "a.jpg"),
+                    FileStorage(BytesIO(upload), "b.jpg"),
+                ],
+            )
+            care_photos, _ = service.upload_care_log_photos(
+                self.care_log.id, [FileStorage(BytesIO(upload), "c.jpg")]
+            )
+
+        self.assertEqual(errors, {})
+        self.assertEqual(process.call_count, 1)
+        blob = self.db.query(PhotoBlob).one()
+        self.assertEqual(blob.ref_count, 3)
+        self.assertEqual(
+            {photos[0].blob_id, photos[1].blob_id, care_photos[0].blob_id}, {blob.id}
+        )
+        self.assertEqual(photos[1].original_filename, "b.jpg")
+        self.assertEqual(
+            service.file_path_for(care_photos[0], thumb=True),
+            service.file_path_for(photos[0], thumb=True),
+        )
+
+    def test_blob_files_are_removed_with_the_last_reference(self):
+        service = PhotoService(self.db)
+        upload = jpeg_bytes()
+        photos, _ = service.upload_plant_photos(
+            self.plant.id, [FileStorage(BytesIO(upload), "a.jpg")]
+        )
+        care_photos, _ = service.upload_care_log_photos(
+            self.care_log.id, [FileStorage(BytesIO(upload), "b.jpg")]
+        )
+        original = service.file_path_for(photos[0])
+
+        service.delete_photo(photos[0].id)
+        service.reap_tombstones()
+        self.assertTrue(os.path.isfile(original))
+        self.assertEqual(self.db.query(PhotoBlob).one().ref_count, 1)
+
+        service.cleanup_care_log_files(self.care_log.id)
+        self.db.delete(care_photos[0])
+        self.db.commit()
+        self.assertTrue(os.path.isfile(original))
+        service.reap_tombstones()
+        self.assertFalse(os.path.exists(original))
+        self.assertEqual(self.db.query(PhotoBlob).count(), 0)
+
+    def test_plant_files_are_deleted_by_the_reaper_after_the_commit(self):
+        service = PhotoService(self.db)
+        photos, _ = service.upload_plant_photos(
+            self.plant.id, [jpeg_upload("red")]
+        )
+        legacy = self.legacy_photo({"care_log_id": self.care_log.id}, "b.jpg")
+        files = [service.file_path_for(photos[0]), service.file_path_for(legacy)]
+        care_log_dir = service.directory_for(legacy)
+
+        service.cleanup_plant_files(self.plant.id)
+        self.db.rollback()
+        self.assertEqual(self.db.query(PhotoTombstone).count(), 0)
+
+        self.assertTrue(PlantService(self.db).delete_plant(self.plant.id))
+        self.assertTrue(all(os.path.isfile(path) for path in files))
+
+        self.assertEqual(service.reap_tombstones(), 4)
+        self.assertFalse(any(os.path.exists(path) for path in files))
+        self.assertFalse(os.path.exists(care_log_dir))
+        self.assertEqual(service.reap_tombstones(), 0)
+
+    def test_reaper_keeps_files_of_a_blob_uploaded_again(self):
+        service = PhotoService(self.db)
+        upload = jpeg_bytes()
+        photos, _ = service.upload_plant_photos(
+            self.plant.id, [FileStorage(BytesIO(upload), "a.jpg")]
+        )
+        original = service.file_path_for(photos[0])
+
+        service.delete_photo(photos[0].id)
+        service.upload_plant_photos(self.plant.id, [FileStorage(BytesIO(upload), "a.jpg")])
+        service.reap_tombstones()
+
+        self.assertTrue(os.path.isfile(original))
+        self.assertEqual(self.db.query(PhotoTombstone).count(), 0)
+
+    def test_concurrent_uploads_of_new_content_share_one_blob(self):
+        service = PhotoService(self.db)
+        other = PhotoService(sessionmaker(bind=self.db.get_bind())())
+        upload = jpeg_bytes()
+        store_batch = service._store_batch
+
+        def store_then_race(*args):
+            # Another request stores the same new content before this one commits
+            stored = store_batch(*args)
+            other.upload_plant_photos(self.plant.id, [FileStorage(BytesIO(upload), "b.jpg")])
+            return stored
+
+        with patch.object(service, "_store_batch", side_effect=store_then_race):
+            photos, errors = service.upload_plant_photos(
+                self.plant.id, [FileStorage(BytesIO(upload), "a.jpg")]
+            )
+        other.db.close()
+
+        self.assertEqual(errors, {})
+        blob = self.db.query(PhotoBlob).one()
+        self.assertEqual(blob.ref_count, 2)
+        self.assertEqual(photos[0].blob_id, blob.id)
+        self.assertTrue(os.path.isfile(service.file_path_for(photos[0])))
+
+    def test_upload_revives_a_blob_released_while_it_was_stored(self):
+        service = PhotoService(self.db)
+        other = PhotoService(sessionmaker(bind=self.db.get_bind())())
+        upload = jpeg_bytes()
+        photos, _ = other.upload_plant_photos(
+            self.plant.id, [FileStorage(BytesIO(upload), "a.jpg")]
+        )
+        store_batch = service._store_batch
+
+        def store_then_release(*args):
+            # Another request deletes the last reference before this one commits
+            stored = store_batch(*args)
+            other.delete_photo(photos[0].id)
+            return stored
+
+        with patch.object(service, "_store_batch", side_effect=store_then_release):
+            again, errors = service.upload_plant_photos(
+                self.plant.id, [FileStorage(BytesIO(upload), "b.jpg")]
+            )
+        other.db.close()
+
+        self.assertEqual(errors, {})
+        self.assertEqual(self.db.query(PhotoBlob).one().ref_count, 1)
+        self.assertEqual(self.db.query(PhotoTombstone).count(), 0)
+        service.reap_tombstones()
+        self.assertTrue(os.path.isfile(service.file_path_for(again[0])))
+
+    def test_upload_of_new_content_claims_its_pending_tombstone(self):
+        service = PhotoService(self.db)
+        upload = jpeg_bytes()
+        photos, _ = service.upload_plant_photos(
+            self.plant.id, [FileStorage(BytesIO(upload), "a.jpg")]
+        )
+        service.delete_photo(photos[0].id)
+        self.assertEqual(self.db.query(PhotoTombstone).count(), 1)
+
+        again, errors = service.upload_plant_photos(
+            self.plant.id, [FileStorage(BytesIO(upload), "b.jpg")]
+        )
+
+        self.assertEqual(errors, {})
+        # A reaper that already read which blobs are live cannot pick it up
+        self.assertEqual(self.db.query(PhotoTombstone).count(), 0)
+        self.assertEqual(service.reap_tombstones(), 0)
+        self.assertTrue(os.path.isfile(service.file_path_for(again[0])))
+
+    def test_upload_fails_if_a_reaper_deleted_its_new_files_first(self):
+        service = PhotoService(self.db)
+        link_blob = service._link_blob
+
+        def reap_then_link(blob, references):
+            # A reaper holding a tombstone for the same content unlinks the
+            # files this upload just stored, then commits
+            shutil.rmtree(service._blob_directory(blob.sha256))
+            return link_blob(blob, references)
+
+        with patch.object(service, "_link_blob", side_effect=reap_then_link):
+            photos, errors = service.upload_plant_photos(self.plant.id, [jpeg_upload()])
+
+        self.assertEqual(photos, {})
+        self.assertIn("Please try again", errors[0])
+        self.assertEqual(self.db.query(PhotoBlob).count(), 0)
+
+    def test_reaper_keeps_only_tombstones_whose_files_were_not_deleted(self):
+        service = PhotoService(self.db)
+        photos, _ = service.upload_plant_photos(
+            self.plant.id,
+            [
+                jpeg_upload("red"),
+                jpeg_upload("blue", filename="b.jpg"),
+            ],
+        )
+        failed_key = os.path.relpath(service.file_path_for(photos[1]), self.tmp.name)
+        service.delete_photo(photos[0].id)
+        service.delete_photo(photos[1].id)
+
+        error = StorageDeleteError({failed_key: "AccessDenied: Denied"})
+        with patch.object(service.storage, "delete_many", side_effect=error):
+            with self.assertRaises(StorageDeleteError):
+                service.reap_tombstones()
+
+        tombstone = self.db.query(PhotoTombstone).one()
+        self.assertEqual(tombstone.filename, photos[1].filename)
+        self.assertEqual(tombstone.attempts, 1)
+        self.assertIn("AccessDenied", tombstone.error)
+        self.assertEqual(service.reap_tombstones(), 1)
+
+    def legacy_photo(self, owner, name):
+        """Writes a photo the way uploads were stored before the blob store."""
+        photo = Photo(filename=name, mime_type="image/jpeg", size_bytes=1, **owner)
+        self.db.add(photo)
+        self.db.commit()
+        service = PhotoService(self.db)
+        os.makedirs(service.directory_for(photo), exist_ok=True)
+        with open(service.file_path_for(photo), "wb") as original:
+            original.write(jpeg_bytes())
+        service.ensure_rendition(photo, PhotoService.THUMBNAIL_WIDTH)
+        return photo
+
+    def test_legacy_photos_move_into_the_blob_store(self):
+        service = PhotoService(self.db)
+        photos = [
+            self.legacy_photo({"plant_id": self.plant.id}, "a.jpg"),
+            self.legacy_photo({"care_log_id": self.care_log.id}, "b.jpg"),
+        ]
+        legacy_dirs = [service.directory_for(photo) for photo in photos]
+
+        scope = DataVersionService.user_scope(self.plant.user_id)
+        version = DataVersionService(self.db).get_version(scope)
+
+        self.assertEqual(service.get_legacy_photo_ids(), [p.id for p in photos])
+        for photo in photos:
+            self.assertTrue(service.migrate_legacy_photo(photo.id))
+
+        blob = self.db.query(PhotoBlob).one()
+        self.assertEqual(blob.ref_count, 2)
+        for photo in photos:
+            self.assertEqual(photo.blob_id, blob.id)
+            self.assertTrue(os.path.isfile(service.file_path_for(photo)))
+            self.assertTrue(os.path.isfile(service.file_path_for(photo, thumb=True)))
+        self.assertEqual(DataVersionService(self.db).get_version(scope), version + 2)
+
+        # Old files stay servable to clients holding their names until reaped
+        self.assertTrue(all(os.listdir(directory) for directory in legacy_dirs))
+        self.assertEqual(service.reap_tombstones(), 2)
+        for directory in legacy_dirs:
+            self.assertEqual(os.listdir(directory), [])
+
+        # Resuming skips photos already migrated
+        self.assertEqual(service.get_legacy_photo_ids(), [])
+        self.assertFalse(service.migrate_legacy_photo(photos[0].id))
+
+    def test_placeholder_is_stored_and_reused_for_duplicates(self):
+        service = PhotoService(self.db)
+        upload = jpeg_bytes(size=(800, 400))
+        photos, _ = service.upload_plant_photos(
+            self.plant.id,
+            [FileStorage(BytesIO(upload), "a.jpg"), FileStorage(BytesIO(upload), "b.jpg")],
+        )
+
+        prefix = "data:image/jpeg;base64,"
+        placeholder = photos[0].placeholder
+        self.assertTrue(placeholder.startswith(prefix))
+        with Image.open(BytesIO(base64.b64decode(placeholder[len(prefix):]))) as tiny:
+            self.assertEqual(tiny.size, (16, 8))
+        self.assertEqual(photos[1].placeholder, placeholder)
+        self.app.config["JWT_SECRET_KEY"] = "photo-blob-test-signing-secret"
+        self.assertEqual(
+            service.get_aggregated_plant_photos(self.plant.id)[0]["placeholder"],
+            placeholder,
+        )
+
+    def test_placeholders_are_backfilled_for_existing_photos(self):
+        service = PhotoService(self.db)
+        photos = [
+            self.legacy_photo({"plant_id": self.plant.id}, "a.jpg"),
+            self.legacy_photo({"care_log_id": self.care_log.id}, "b.jpg"),
+        ]
+        os.remove(service.file_path_for(photos[1], thumb=True))
+
+        batch = service.get_placeholder_batch()
+        self.assertEqual(batch, photos)
+        self.assertEqual(service.backfill_placeholders(batch), (2, {}))
+
+        self.assertTrue(all(photo.placeholder for photo in photos))
+        self.assertEqual(service.get_placeholder_batch(), [])
@@ -0,0 +1,136 @@
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import event
+
+from app.models import CareType, Photo, PlantCare
+from app.services.photo_service import PhotoService
+from helpers import PhotoServiceTestCase
+
+
+class GalleryTestCase(PhotoServiceTestCase):
+    config = {"JWT_SECRET_KEY": "secret"}
+
+    def setUp(self):
+        super().setUp()
+        self.care_type = CareType(user=self.user, name="Watering")
+        self.db.add(self.care_type)
+        self.db.commit()
+        self.start = datetime(2026, 1, 1)
+
+    def add_logs_with_photos(self, count):
+        for i in range(count):
+            log = PlantCare(
+                plant=self.plant,
+                care_type=self.care_type,
+                care_date=date(2026, 1, 1) + timedelta(days=i),
+                note=f"log {i}",
+            )
+            self.db.add(log)
+            self.db.flush()
+            self.db.add(
+                self.photo(care_log_id=log.id, gallery_plant_id=self.plant.id, days=i)
+            )
+        self.db.commit()
+
+    def photo(self, days, **owner):
+        return Photo(
+            **owner,
+            filename=f"{days}.jpg",
+            mime_type="image/jpeg",
+            size_bytes=1,
+            width=100,
+            taken_at=self.start + timedelta(days=days, hours=12),
+        )
+
+    def add_cover(self):
+        cover = self.photo(
+            days=-1, plant_id=self.plant.id, gallery_plant_id=self.plant.id
+        )
+        self.db.add(cover)
+        self.db.commit()
+        self.plant.cover_photo_id = cover.id
+        self.db.commit()
+
+    def count_queries(self, load):
+        plant_id = self.plant.id
+        self.db.expire_all()
+        statements = []
+
+        def record(*args):
+            statements.append(args[2])
+
+        event.listen(self.engine, "before_cursor_execute", record)
+        try:
+            result = load(PhotoService(self.db), plant_id)
+        finally:
+            event.remove(self.engine, "before_cursor_execute", record)
+        return result, len(statements)
+
+    def count_gallery_queries(self):
+        return self.count_queries(
+            lambda service, plant_id: service.get_aggregated_plant_photos(plant_id)
+        )
+
+
+class AggregatedGalleryTests(GalleryTestCase):
+    def test_gallery_query_count_does_not_grow_with_care_logs(self):
+        self.add_cover()
+        self.add_logs_with_photos(2)
+        _, few = self.count_gallery_queries()
+
+        self.add_logs_with_photos(30)
+        gallery, many = self.count_gallery_queries()
+
+        self.assertEqual(few, 1)
+        self.assertEqual(many, few)
+        self.assertEqual(len(gallery), 33)
+        self.assertTrue(gallery[0]["is_cover"])
+        self.assertEqual(gallery[1]["source"]["care_type"], "Watering")
+        self.assertEqual(gallery[1]["source"]["note"], "log 0")
+        taken = [photo["taken_at"] for photo in gallery[1:]]
+        self.assertEqual(taken, sorted(taken))
+
+
+class GalleryPaginationTests(GalleryTestCase):
+    def page(self, cursor=None, limit=10):
+        return self.count_queries(
+            lambda service, plant_id: service.get_plant_gallery_page(
+                plant_id, limit, cursor
+            )
+        )
+
+    def test_pages_walk_the_timeline_with_the_cover_on_the_first_page_only(self):
+        self.add_cover()
+        self.add_logs_with_photos(25)
+        for days in (3, 3, 3):
+            self.db.add(
+                self.photo(
+                    days=days, plant_id=self.plant.id, gallery_plant_id=self.plant.id
+                )
+            )
+        self.db.commit()
+
+        (first, cursor), _ = self.page()
+        self.assertTrue(first[0]["is_cover"])
+        self.assertEqual(len(first), 11)
+
+        seen = [photo["id"] for photo in first[1:]]
+        counts = []
+        while cursor:
+            (photos, cursor), queries = self.page(cursor)
+            counts.append(queries)
+            self.assertFalse(any(photo["is_cover"] for photo in photos))
+            seen.extend(photo["id"] for photo in photos)
+
+        expected = self.service_timeline_ids()
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(seen), 28)
+        self.assertEqual(set(counts), {1})
+
+    def test_rejects_malformed_cursors(self):
+        with self.assertRaises(ValueError):
+            PhotoService(self.db).get_plant_gallery_page(self.plant.id, 10, "nope")
+
+    def service_timeline_ids(self):
+        gallery = PhotoService(self.db).get_aggregated_plant_photos(self.plant.id)
+        return [photo["id"] for photo in gallery if not photo["is_cover"]]
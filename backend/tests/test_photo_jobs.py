@@ -0,0 +1,67 @@
+from io import BytesIO
+import os
+from unittest.mock import patch
+
+from werkzeug.datastructures import FileStorage
+
+from app.models import Photo, PhotoJob
+from app.services.image_work_limiter import ImageWorkBusy
+from app.services.photo_service import PhotoService
+from helpers import PhotoServiceTestCase, jpeg_upload
+
+
+class PhotoJobQueueTests(PhotoServiceTestCase):
+    def test_queued_upload_is_pending_until_the_worker_runs_it(self):
+        service = PhotoService(self.db)
+        jobs, errors = service.enqueue_plant_photos(
+            self.plant.id, [jpeg_upload(), FileStorage(BytesIO(b"nope"), "a.txt")]
+        )
+
+        self.assertEqual(list(jobs), [0])
+        self.assertEqual(list(errors), [1])
+        photo = self.db.get(Photo, jobs[0].photo_id)
+        self.assertEqual(photo.status, Photo.STATUS_PENDING)
+        self.assertTrue(os.path.isfile(jobs[0].source_path))
+        self.assertEqual(
+            service.get_aggregated_plant_photos(self.plant.id)[0]["status"],
+            Photo.STATUS_PENDING,
+        )
+
+        job = service.claim_next_job()
+        self.assertEqual(job.status, PhotoJob.STATUS_PROCESSING)
+        self.assertIsNone(service.claim_next_job())
+        self.assertTrue(service.run_job(job))
+
+        self.db.refresh(photo)
+        self.assertEqual(photo.status, Photo.STATUS_READY)
+        self.assertEqual((photo.width, photo.height), (800, 600))
+        self.assertEqual(job.status, PhotoJob.STATUS_DONE)
+        self.assertFalse(os.path.exists(job.source_path))
+        self.assertTrue(os.path.isfile(service.file_path_for(photo, thumb=True)))
+
+    def test_undecodable_upload_marks_job_and_photo_failed(self):
+        service = PhotoService(self.db)
+        broken = FileStorage(BytesIO(b"\xff\xd8\xff\xe0" + b"\0" * 64), "broken.jpg")
+        jobs, _ = service.enqueue_plant_photos(self.plant.id, [broken])
+
+        job = service.claim_next_job()
+        self.assertFalse(service.run_job(job))
+        self.assertEqual(job.status, PhotoJob.STATUS_FAILED)
+        self.assertEqual(job.photo.status, Photo.STATUS_FAILED)
+        self.assertTrue(job.error)
+
+    def test_busy_image_work_puts_the_job_back_without_using_an_attempt(self):
+        service = PhotoService(self.db)
+        jobs, _ = service.enqueue_plant_photos(self.plant.id, [jpeg_upload()])
+
+        job = service.claim_next_job()
+        busy = ImageWorkBusy(retry_after=5)
+        with patch.object(PhotoService, "_process_and_save", side_effect=busy):
+            self.assertFalse(service.run_job(job))
+        self.assertEqual(job.status, PhotoJob.STATUS_PENDING)
+        self.assertEqual(job.attempts, 0)
+        self.assertEqual(job.photo.status, Photo.STATUS_PENDING)
+
+        job = service.claim_next_job()
+        self.assertEqual(job.attempts, 1)
+        self.assertTrue(service.run_job(job))
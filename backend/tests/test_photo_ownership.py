@@ -0,0 +1,67 @@
+import os
+
+from PIL import Image
+from sqlalchemy import event
+
+from app.models import CareType, Photo, PlantCare
+from helpers import PhotoApiTestCase, add_plant
+
+
+class PhotoOwnershipTests(PhotoApiTestCase):
+    def setUp(self):
+        super().setUp()
+        db = self.Session()
+        plant = add_plant(db)
+        care_log = PlantCare(
+            plant=plant, care_type=CareType(user=plant.user, name="Watering")
+        )
+        db.add(care_log)
+        other_plant = add_plant(db, username="moss", nickname="Pothos")
+        self.care_photo_id = self.add_photo(db, care_log=care_log)
+        self.foreign_id = self.add_photo(db, plant=other_plant)
+        db.commit()
+        self.headers = self.auth_headers(plant.user_id, Accept="image/jpeg")
+        db.close()
+
+    def add_photo(self, db, plant=None, care_log=None):
+        owner_dir = f"plants/{plant.id}" if plant else f"care-logs/{care_log.id}"
+        os.makedirs(os.path.join(self.tmp.name, owner_dir), exist_ok=True)
+        Image.new("RGB", (100, 75)).save(os.path.join(self.tmp.name, owner_dir, "a.jpg"))
+        photo = Photo(
+            plant_id=plant.id if plant else None,
+            care_log_id=care_log.id if care_log else None,
+            gallery_plant_id=plant.id if plant else care_log.plant_id,
+            filename="a.jpg",
+            mime_type="image/jpeg",
+            size_bytes=1,
+        )
+        db.add(photo)
+        db.flush()
+        return photo.id
+
+    def get_file(self, photo_id):
+        statements = []
+
+        def record(*args):
+            statements.append(args[2])
+
+        event.listen(self.engine, "before_cursor_execute", record)
+        try:
+            response = self.client.get(f"/api/photos/{photo_id}/file", headers=self.headers)
+        finally:
+            event.remove(self.engine, "before_cursor_execute", record)
+        return response, len(statements)
+
+    def test_serving_a_care_log_photo_checks_ownership_in_one_query(self):
+        response, queries = self.get_file(self.care_photo_id)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, 1)
+
+    def test_missing_and_foreign_photos_are_refused(self):
+        response, queries = self.get_file(self.foreign_id)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(queries, 1)
+
+        response, _ = self.get_file(self.foreign_id + 100)
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,69 @@
+import os
+from unittest.mock import patch
+
+from PIL import Image
+
+from app.services.photo_service import PhotoService, PreviewUpload
+from helpers import PhotoServiceTestCase, jpeg_upload
+
+
+class PreviewCacheTests(PhotoServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.service = PhotoService(self.db)
+        self.cache_dir = os.path.join(self.tmp.name, PhotoService.PREVIEW_CACHE_DIR)
+
+    def test_upload_by_token_reuses_the_processed_preview(self):
+        preview, token = self.service.cache_preview(self.user.id, jpeg_upload(size=(1600, 1200)))
+        with Image.open(preview) as image:
+            self.assertEqual(image.size, (1200, 900))
+
+        with patch.object(self.service, "_process_and_save") as process:
+            photos, errors = self.service.upload_plant_photos(
+                self.plant.id, [PreviewUpload(token, self.user.id)]
+            )
+
+        process.assert_not_called()
+        self.assertEqual(errors, {})
+        photo = photos[0]
+        self.assertEqual((photo.width, photo.height), (1600, 1200))
+        self.assertEqual(photo.original_filename, "a.jpg")
+        self.assertTrue(os.path.isfile(self.service.file_path_for(photo)))
+        self.assertTrue(os.path.isfile(self.service.file_path_for(photo, thumb=True)))
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+        _, errors = self.service.upload_plant_photos(
+            self.plant.id, [PreviewUpload(token, self.user.id)]
+        )
+        self.assertIn("expired", errors[0])
+
+    def test_tokens_are_bound_to_their_user(self):
+        _, token = self.service.cache_preview(self.user.id, jpeg_upload(size=(1600, 1200)))
+
+        photos, errors = self.service.upload_plant_photos(
+            self.plant.id, [PreviewUpload(token, self.user.id + 1)]
+        )
+
+        self.assertEqual(photos, {})
+        self.assertIn(0, errors)
+
+    def test_cache_evicts_least_recently_used_entries_over_the_cap(self):
+        self.app.config["PHOTO_PREVIEW_TTL"] = 10**10
+        tokens = []
+        for age, color in enumerate(["red", "green", "blue"]):
+            _, token = self.service.cache_preview(self.user.id, jpeg_upload(color, (1600, 1200)))
+            os.utime(os.path.join(self.cache_dir, token), (1_000 + age, 1_000 + age))
+            tokens.append(token)
+        sizes = [
+            sum(f.stat().st_size for f in os.scandir(os.path.join(self.cache_dir, t)))
+            for t in tokens
+        ]
+
+        self.app.config["PHOTO_PREVIEW_CACHE_BYTES"] = sizes[1] + sizes[2]
+        self.service._evict_previews()
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), sorted(tokens[1:]))
+
+        # The entry just handed out survives even when it alone is over the cap
+        self.app.config["PHOTO_PREVIEW_CACHE_BYTES"] = 1
+        _, token = self.service.cache_preview(self.user.id, jpeg_upload("white", (1600, 1200)))
+        self.assertEqual(os.listdir(self.cache_dir), [token])
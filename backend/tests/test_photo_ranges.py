@@ -0,0 +1,73 @@
+import os
+
+from helpers import PhotoApiTestCase, add_plant, read_file
+
+
+class PhotoRangeRequestTests(PhotoApiTestCase):
+    def setUp(self):
+        super().setUp()
+        db = self.Session()
+        plant = add_plant(db)
+        photo = self.add_photo_file(db, plant, size=(300, 200))
+        self.content = read_file(
+            os.path.join(self.tmp.name, "plants", str(plant.id), photo.filename)
+        )
+        photo.size_bytes = len(self.content)
+        db.commit()
+        self.url = f"/api/photos/{photo.id}/file"
+        self.headers = self.auth_headers(plant.user_id, Accept="image/jpeg")
+        db.close()
+
+    def get(self, **headers):
+        return self.client.get(self.url, headers={**self.headers, **headers})
+
+    def test_single_range_resumes_with_a_matching_if_range(self):
+        full = self.get()
+        self.assertEqual(full.headers["Accept-Ranges"], "bytes")
+        self.assertEqual(full.headers["Cache-Control"], "private, no-cache")
+        etag = full.headers["ETag"]
+
+        partial = self.get(Range="bytes=100-", **{"If-Range": etag})
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(partial.data, self.content[100:])
+        self.assertEqual(
+            partial.headers["Content-Range"],
+            f"bytes 100-{len(self.content) - 1}/{len(self.content)}",
+        )
+
+        stale = self.get(Range="bytes=100-", **{"If-Range": '"other.jpg"'})
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(stale.data, self.content)
+
+    def test_several_ranges_are_sent_as_multipart_byteranges(self):
+        response = self.get(Range="bytes=0-9, -5, 5-14")
+
+        self.assertEqual(response.status_code, 206)
+        self.assertTrue(response.mimetype.startswith("multipart/byteranges"))
+        boundary = response.mimetype_params["boundary"]
+        size = len(self.content)
+        self.assertEqual(
+            response.data,
+            (
+                f"--{boundary}\r\nContent-Type: image/jpeg\r\n"
+                f"Content-Range: bytes 0-14/{size}\r\n\r\n"
+            ).encode()
+            + self.content[:15]
+            + (
+                f"\r\n--{boundary}\r\nContent-Type: image/jpeg\r\n"
+                f"Content-Range: bytes {size - 5}-{size - 1}/{size}\r\n\r\n"
+            ).encode()
+            + self.content[-5:]
+            + f"\r\n--{boundary}--\r\n".encode(),
+        )
+        self.assertEqual(int(response.headers["Content-Length"]), len(response.data))
+
+        merged = self.get(Range="bytes=0-9, 10-19")
+        self.assertEqual(merged.status_code, 206)
+        self.assertEqual(merged.data, self.content[:20])
+
+    def test_unsatisfiable_range_is_refused_with_the_length(self):
+        response = self.get(Range=f"bytes={len(self.content)}-")
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response.headers["Content-Range"], f"bytes */{len(self.content)}")
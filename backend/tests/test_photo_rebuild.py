@@ -0,0 +1,173 @@
+import json
+import os
+from tempfile import TemporaryDirectory
+import unittest
+from unittest.mock import patch
+
+from flask import Flask
+from PIL import Image
+from sqlalchemy.pool import StaticPool
+
+from app.cli import photos_cli
+from app.models import Photo
+from app.services.photo_service import PhotoService
+from helpers import add_plant, jpeg_upload, session_factory
+
+
+class RenditionRebuildTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.app = Flask(__name__)
+        self.app.config["UPLOAD_FOLDER"] = self.tmp.name
+        self.app.config["ALLOWED_MIME_TYPES"] = {"image/jpeg"}
+        self.app.cli.add_command(photos_cli)
+
+        self.Session = session_factory(poolclass=StaticPool)
+        patcher = patch("app.cli.SessionLocal", self.Session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        db = self.Session()
+        plant = add_plant(db)
+        db.commit()
+        with self.app.app_context():
+            service = PhotoService(db)
+            photos, _ = service.upload_plant_photos(
+                plant.id, [jpeg_upload("green"), jpeg_upload("green"), jpeg_upload("red")]
+            )
+            self.photos = [photos[i] for i in range(3)]
+            self.paths = [
+                service.file_path_for(photo, width=160) for photo in self.photos
+            ]
+        self.photo_ids = [photo.id for photo in self.photos]
+        db.close()
+        self.checkpoint = os.path.join(self.tmp.name, ".photos-rebuild.json")
+
+    def rebuild(self, *args):
+        return self.app.test_cli_runner().invoke(
+            args=[
+                "photos",
+                "rebuild",
+                "--width",
+                "160",
+                "--format",
+                "image/jpeg",
+                "--workers",
+                "1",
+                "--chunk-size",
+                "1",
+                *args,
+            ]
+        )
+
+    def test_photos_sharing_a_blob_are_rebuilt_once(self):
+        db = self.Session()
+        with self.app.app_context():
+            batch = PhotoService(db).get_rebuild_batch()
+        db.close()
+
+        self.assertEqual([photo.id for photo in batch], [self.photo_ids[0], self.photo_ids[2]])
+
+    def test_rebuild_writes_renditions_and_reports(self):
+        result = self.rebuild()
+
+        self.assertIsNone(result.exception, result.output)
+        self.assertIn("Rebuilt 2 photos (2 files)", result.output)
+        self.assertTrue(all(os.path.isfile(path) for path in self.paths))
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+        result = self.rebuild()
+        self.assertIn("bytes saved", result.output)
+
+    def test_rebuild_resumes_after_the_checkpoint(self):
+        with open(self.checkpoint, "w") as handle:
+            json.dump(
+                {
+                    "widths": [160],
+                    "mimes": ["image/jpeg"],
+                    "after_id": self.photo_ids[1],
+                    "photos": 1,
+                    "failed": {},
+                    "files": 1,
+                    "bytes_before": 0,
+                    "bytes_after": 0,
+                    "bytes_created": 0,
+                    "elapsed": 1.0,
+                },
+                handle,
+            )
+
+        result = self.rebuild()
+
+        self.assertIn("Resuming after photo", result.output)
+        self.assertFalse(os.path.isfile(self.paths[0]))
+        self.assertTrue(os.path.isfile(self.paths[2]))
+
+        with open(self.checkpoint, "w") as handle:
+            json.dump({"widths": [400], "mimes": ["image/jpeg"]}, handle)
+        self.assertEqual(self.rebuild().exit_code, 1)
+
+    def test_new_settings_write_new_names_and_retire_the_old_ones(self):
+        db = self.Session()
+        self.addCleanup(db.close)
+        self.addCleanup(PhotoService._rendition_tag.cache_clear)
+        with self.app.app_context():
+            service = PhotoService(db)
+            photo = db.get(Photo, self.photo_ids[2])
+            directory = service.directory_for(photo)
+            old_path = service.ensure_rendition(photo, 160)
+            old_etag = service.rendition_etag(photo.filename, 160)
+            thumb = service.file_path_for(photo, thumb=True)
+
+            formats = {**PhotoService.RENDITION_FORMATS, "image/jpeg": (".jpg", "JPEG", 60)}
+            with patch.object(PhotoService, "RENDITION_FORMATS", formats):
+                PhotoService._rendition_tag.cache_clear()
+                report = service.rebuild_renditions(
+                    directory, photo.filename, photo.width, [160], ["image/jpeg"]
+                )
+                new_path = service.file_path_for(photo, width=160)
+                self.assertNotEqual(service.rendition_etag(photo.filename, 160), old_etag)
+
+                self.assertEqual(report["files"], 1)
+                self.assertEqual(report["superseded"], [os.path.basename(old_path)])
+                self.assertTrue(os.path.isfile(new_path))
+                # Clients that cached the old rendition keep it until reaped
+                self.assertTrue(os.path.isfile(old_path))
+
+                service.retire_renditions(directory, report["superseded"])
+                self.assertEqual(service.reap_tombstones(), 1)
+                self.assertFalse(os.path.exists(old_path))
+                self.assertTrue(os.path.isfile(new_path))
+                self.assertTrue(os.path.isfile(thumb))
+                self.assertTrue(os.path.isfile(service.file_path_for(photo)))
+
+                again = service.rebuild_renditions(
+                    directory, photo.filename, photo.width, [160], ["image/jpeg"]
+                )
+                self.assertEqual((again["files"], again["superseded"]), (0, []))
+
+    def test_new_thumbnail_width_renames_the_thumbnail(self):
+        self.addCleanup(PhotoService._rendition_tag.cache_clear)
+        with self.app.app_context():
+            db = self.Session()
+            self.addCleanup(db.close)
+            service = PhotoService(db)
+            photo = db.get(Photo, self.photo_ids[2])
+            directory = service.directory_for(photo)
+            old_thumb = service.file_path_for(photo, thumb=True)
+
+            with patch.object(PhotoService, "THUMBNAIL_WIDTH", 320), patch.object(
+                PhotoService, "RENDITION_WIDTHS", (160, 320, 800, 1600)
+            ):
+                PhotoService._rendition_tag.cache_clear()
+                report = service.rebuild_renditions(
+                    directory, photo.filename, photo.width, [320], ["image/jpeg"]
+                )
+                new_thumb = service.file_path_for(photo, thumb=True)
+
+                self.assertNotEqual(new_thumb, old_thumb)
+                self.assertEqual(report["files"], 1)
+                self.assertIn(os.path.basename(old_thumb), report["superseded"])
+                with Image.open(new_thumb) as image:
+                    self.assertEqual(image.width, 320)
@@ -1,15 +1,20 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from io import BytesIO
 from tempfile import TemporaryDirectory
+import os
+import time
+from types import SimpleNamespace
 import unittest
-from unittest.mock import patch
+from urllib.parse import parse_qs, unquote, urlsplit
+from unittest.mock import MagicMock, patch
 
 from flask import Flask
-from PIL import Image
-from werkzeug.datastructures import FileStorage
+from PIL import Image, ImageFile
+from werkzeug.datastructures import FileStorage, MIMEAccept
 
 from app.services.photo_service import PhotoService
-from app.api.photos import _parse_taken_at
+from app.api.photos import _parse_taken_at, _send_photo_file
 
 
 class FakeExif(dict):
@@ -67,3 +72,284 @@ class PhotoMetadataTests(unittest.TestCase):
 
         with self.assertRaisesRegex(ValueError, "cannot be in the future"):
             _parse_taken_at(tomorrow)
+
+
+class PhotoBatchProcessingTests(unittest.TestCase):
+    def test_reports_failures_by_index_while_processing_the_rest(self):
+        good = BytesIO()
+        Image.new("RGB", (800, 600)).save(good, format="JPEG")
+        files = [
+            FileStorage(BytesIO(good.getvalue()), filename="first.jpg"),
+            FileStorage(BytesIO(b"not an image"), filename="notes.txt"),
+            FileStorage(BytesIO(good.getvalue()), filename="third.jpg"),
+        ]
+
+        with TemporaryDirectory() as upload_folder:
+            app = Flask(__name__)
+            app.config["UPLOAD_FOLDER"] = upload_folder
+            app.config["ALLOWED_MIME_TYPES"] = {"image/jpeg"}
+            app.config["PHOTO_PROCESSING_WORKERS"] = 2
+            with app.app_context():
+                metas, errors = PhotoService(None)._process_batch(files, [upload_folder] * len(files))
+
+        self.assertEqual(sorted(metas), [0, 2])
+        self.assertEqual(sorted(errors), [1])
+        self.assertIn("Unsupported file type", errors[1])
+        self.assertEqual(metas[0]["original_filename"], "first.jpg")
+        self.assertNotEqual(metas[0]["filename"], metas[2]["filename"])
+
+
+class PhotoRenditionTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.app = Flask(__name__)
+        self.app.config["UPLOAD_FOLDER"] = self.tmp.name
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        Image.new("RGB", (2000, 1500)).save(f"{self.tmp.name}/original.jpg")
+
+    def tearDown(self):
+        self.ctx.pop()
+        self.tmp.cleanup()
+
+    def test_maps_requested_widths_onto_the_registry(self):
+        service = PhotoService(None)
+        photo = SimpleNamespace(width=2000)
+
+        self.assertEqual(service.rendition_width_for(photo, 100), 160)
+        self.assertEqual(service.rendition_width_for(photo, 401), 800)
+        self.assertIsNone(service.rendition_width_for(photo, 1700))
+        self.assertIsNone(
+            service.rendition_width_for(SimpleNamespace(width=700), 600)
+        )
+
+    def test_concurrent_requests_generate_a_missing_rendition_once(self):
+        service = PhotoService(None)
+        calls = []
+        save_rendition = service._save_rendition
+
+        def slow_save(*args):
+            calls.append(args[2])
+            time.sleep(0.05)
+            save_rendition(*args)
+
+        with patch.object(service, "_save_rendition", side_effect=slow_save):
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                paths = list(
+                    executor.map(
+                        lambda _: service._ensure_rendition(
+                            self.tmp.name, "original.jpg", 800
+                        ),
+                        range(4),
+                    )
+                )
+
+        self.assertEqual(calls, [800])
+        self.assertEqual(len(set(paths)), 1)
+        with Image.open(paths[0]) as rendition:
+            self.assertEqual(rendition.size, (800, 600))
+
+    def test_negotiates_only_formats_the_client_names(self):
+        service = PhotoService(None)
+        supported = service.supported_output_mimes()
+
+        self.assertEqual(supported[-1], "image/jpeg")
+        self.assertEqual(
+            service.negotiate_output_mime(MIMEAccept([("*/*", 1), ("image/*", 1)])),
+            "image/jpeg",
+        )
+        if "image/webp" in supported:
+            self.assertEqual(
+                service.negotiate_output_mime(
+                    MIMEAccept([("image/webp", 1), ("*/*", 0.8)])
+                ),
+                "image/webp",
+            )
+
+    def test_generates_full_size_variants_in_other_formats(self):
+        service = PhotoService(None)
+        mime = service.supported_output_mimes()[0]
+
+        path = service._ensure_rendition(self.tmp.name, "original.jpg", None, mime)
+
+        self.assertNotEqual(path, f"{self.tmp.name}/original.jpg")
+        with Image.open(path) as variant:
+            self.assertEqual(variant.size, (2000, 1500))
+            self.assertEqual(Image.MIME[variant.format], mime)
+
+    def test_reduced_decode_keeps_rotated_renditions_full_width(self):
+        service = PhotoService(None)
+        exif = Image.Exif()
+        exif[0x0112] = 6  # rotate 90 degrees on display
+        Image.new("RGB", (4000, 3000)).save(
+            f"{self.tmp.name}/rotated.jpg", exif=exif.tobytes()
+        )
+
+        path = service._ensure_rendition(self.tmp.name, "rotated.jpg", 800)
+
+        with Image.open(path) as rendition:
+            self.assertEqual(rendition.size, (800, 1066))
+
+    def test_signed_urls_resolve_without_a_database(self):
+        self.app.config["JWT_SECRET_KEY"] = "secret"
+        os.makedirs(f"{self.tmp.name}/plants/7")
+        os.replace(f"{self.tmp.name}/original.jpg", f"{self.tmp.name}/plants/7/a.jpg")
+        photo = SimpleNamespace(
+            status="ready", blob_id=None, plant_id=7, filename="a.jpg", width=2000
+        )
+        service = PhotoService(None)
+
+        urls = service.signed_urls_for(photo)
+        self.assertEqual(list(urls), ["original", "160", "400", "800", "1600"])
+        url = urlsplit(urls["800"])
+        path = unquote(url.path.removeprefix(PhotoService.SIGNED_URL_PREFIX))
+        query = {key: value[0] for key, value in parse_qs(url.query).items()}
+
+        expires = int(query["exp"])
+        self.assertTrue(service.verify_signed_url(path, 800, expires, query["sig"]))
+        self.assertFalse(service.verify_signed_url(path, 1600, expires, query["sig"]))
+        with patch("app.services.photo_service.time.time", return_value=2**40):
+            self.assertFalse(
+                service.verify_signed_url(path, 800, expires, query["sig"])
+            )
+        with Image.open(service.resolve_signed_file(path, 800)) as rendition:
+            self.assertEqual(rendition.width, 800)
+        self.assertIsNone(service.signed_urls_for(SimpleNamespace(status="pending")))
+
+
+class PhotoIngestionTests(unittest.TestCase):
+    def test_rejects_images_over_the_decode_budget_before_decoding(self):
+        image = BytesIO()
+        Image.new("RGB", (1000, 1000)).save(image, format="JPEG")
+        image.seek(0)
+
+        with TemporaryDirectory() as upload_folder:
+            app = Flask(__name__)
+            app.config["UPLOAD_FOLDER"] = upload_folder
+            app.config["ALLOWED_MIME_TYPES"] = {"image/jpeg"}
+            app.config["PHOTO_MAX_DECODE_BYTES"] = 1000
+            with app.app_context(), patch.object(ImageFile.ImageFile, "load") as load:
+                with self.assertRaisesRegex(ValueError, "too large"):
+                    PhotoService(None)._process_and_save(
+                        FileStorage(image, filename="big.jpg"), upload_folder
+                    )
+                load.assert_not_called()
+
+    def test_stores_jpeg_originals_without_re_encoding(self):
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        exif.get_ifd(0x8825)[2] = (45.0, 30.0, 0.0)  # GPS latitude
+        image = BytesIO()
+        Image.linear_gradient("L").resize((320, 200)).convert("RGB").save(
+            image, format="JPEG", exif=exif, icc_profile=b"profile", progressive=True
+        )
+        primary = image.getvalue()
+        # Stands in for an MPF secondary image or a trailer
+        upload = primary + b"\xff\xd8trailer\xff\xd9"
+
+        with TemporaryDirectory() as upload_folder:
+            app = Flask(__name__)
+            app.config["UPLOAD_FOLDER"] = upload_folder
+            app.config["ALLOWED_MIME_TYPES"] = {"image/jpeg"}
+            with app.app_context():
+                meta = PhotoService(None)._process_and_save(
+                    FileStorage(BytesIO(upload), filename="photo.jpg"), upload_folder
+                )
+
+            with open(f"{upload_folder}/{meta['filename']}", "rb") as f:
+                stored = f.read()
+            with Image.open(BytesIO(stored)) as img:
+                self.assertEqual(dict(img.getexif()), {0x0112: 6})
+                self.assertEqual(img.info["icc_profile"], b"profile")
+            self.assertEqual(
+                stored[stored.index(b"\xff\xda"):], primary[primary.index(b"\xff\xda"):]
+            )
+            self.assertEqual((meta["width"], meta["height"]), (200, 320))
+            self.assertEqual(meta["size_bytes"], len(stored))
+            with Image.open(
+                f"{upload_folder}/{PhotoService._rendition_name(meta['filename'], 400, 'image/jpeg')}"
+            ) as thumb:
+                self.assertEqual(thumb.size, (400, 640))
+
+    def test_re_encodes_cmyk_jpeg_originals_as_rgb(self):
+        image = BytesIO()
+        Image.new("CMYK", (320, 200), (0, 255, 255, 0)).save(image, format="JPEG")
+        image.seek(0)
+
+        with TemporaryDirectory() as upload_folder:
+            app = Flask(__name__)
+            app.config["UPLOAD_FOLDER"] = upload_folder
+            app.config["ALLOWED_MIME_TYPES"] = {"image/jpeg"}
+            with app.app_context():
+                meta = PhotoService(None)._process_and_save(
+                    FileStorage(image, filename="print.jpg"), upload_folder
+                )
+
+            with Image.open(f"{upload_folder}/{meta['filename']}") as stored:
+                self.assertEqual(stored.mode, "RGB")
+                self.assertGreater(stored.getpixel((0, 0))[0], 200)
+
+
+class PhotoFileOffloadTests(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config["UPLOAD_FOLDER"] = "/app/uploads"
+        self.app.config["PHOTO_ACCEL_PREFIX"] = "/protected-uploads/"
+
+    def test_x_accel_names_the_file_under_the_internal_location(self):
+        self.app.config["PHOTO_SEND_FILE_MODE"] = "x-accel"
+        with self.app.test_request_context():
+            response = _send_photo_file(
+                "/app/uploads/blobs/ab/cd", "abcd.webp", "image/webp", "private"
+            )
+
+        self.assertEqual(
+            response.headers["X-Accel-Redirect"],
+            "/protected-uploads/blobs/ab/cd/abcd.webp",
+        )
+        self.assertEqual(response.mimetype, "image/webp")
+        self.assertEqual(response.get_data(), b"")
+
+    def test_x_accel_carries_the_rendition_etag_and_answers_revalidations(self):
+        self.app.config["PHOTO_SEND_FILE_MODE"] = "x-accel"
+        with self.app.test_request_context():
+            response = _send_photo_file(
+                "/app/uploads/blobs/ab/cd", "abcd.webp", "image/webp", "private", "abcd.webp"
+            )
+        self.assertEqual(response.headers["ETag"], '"abcd.webp"')
+        self.assertIn("X-Accel-Redirect", response.headers)
+
+        with self.app.test_request_context(headers={"If-None-Match": '"abcd.webp"'}):
+            response = _send_photo_file(
+                "/app/uploads/blobs/ab/cd", "abcd.webp", "image/webp", "private", "abcd.webp"
+            )
+        self.assertEqual(response.status_code, 304)
+        self.assertNotIn("X-Accel-Redirect", response.headers)
+
+    def test_x_sendfile_names_the_absolute_path(self):
+        self.app.config["PHOTO_SEND_FILE_MODE"] = "x-sendfile"
+        with self.app.test_request_context():
+            response = _send_photo_file(
+                "/app/uploads/plants/1", "a.jpg", "image/jpeg", "private"
+            )
+
+        self.assertEqual(response.headers["X-Sendfile"], "/app/uploads/plants/1/a.jpg")
+
+    def test_redirect_points_at_a_presigned_storage_url(self):
+        self.app.config["PHOTO_SEND_FILE_MODE"] = "redirect"
+        self.app.config["PHOTO_PRESIGNED_URL_TTL"] = 600
+        storage = MagicMock()
+        storage.presigned_url.return_value = "https://store.example/abcd.webp?sig=1"
+        self.app.extensions["photo_storage"] = storage
+        with self.app.test_request_context():
+            response = _send_photo_file(
+                "/app/uploads/blobs/ab/cd", "abcd.webp", "image/webp", "private"
+            )
+
+        storage.presigned_url.assert_called_once_with(
+            "blobs/ab/cd/abcd.webp", 600, "image/webp"
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.location, "https://store.example/abcd.webp?sig=1")
+        self.assertEqual(response.headers["Cache-Control"], "private, max-age=540")
+
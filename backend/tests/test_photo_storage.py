@@ -0,0 +1,229 @@
+from io import BytesIO
+import os
+from tempfile import TemporaryDirectory
+import unittest
+from unittest.mock import MagicMock
+import uuid
+
+from flask import Flask
+
+from app.services.photo_service import PhotoService
+from app.storage import LocalStorage, S3Storage, Storage, StorageDeleteError
+from helpers import add_plant, jpeg_upload, session_factory
+
+
+def list_files(root):
+    return sorted(
+        os.path.relpath(os.path.join(directory, name), root)
+        for directory, _, names in os.walk(root)
+        for name in names
+    )
+
+
+class StorageContract:
+    """Behaviour every storage backend must provide."""
+
+    def test_put_open_and_delete_many(self):
+        self.storage.put("a/b/one.jpg", BytesIO(b"one"), "image/jpeg")
+        self.storage.put("a/two.jpg", BytesIO(b"two"))
+
+        self.assertTrue(self.storage.exists("a/b/one.jpg"))
+        with self.storage.open("a/b/one.jpg") as stream:
+            self.assertEqual(stream.read(), b"one")
+
+        self.assertEqual(self.storage.list_directory("a"), {"a/two.jpg": 3})
+        self.assertEqual(self.storage.list_directory("missing"), {})
+
+        self.storage.delete_many(["a/b/one.jpg", "a/two.jpg", "a/missing.jpg"])
+        self.assertFalse(self.storage.exists("a/b/one.jpg"))
+        self.assertFalse(self.storage.exists("a/two.jpg"))
+
+    def test_download_of_a_missing_object_raises(self):
+        with TemporaryDirectory() as tmp:
+            with self.assertRaises(FileNotFoundError):
+                self.storage.download("missing.jpg", os.path.join(tmp, "x.jpg"))
+            self.assertEqual(os.listdir(tmp), [])
+
+
+class LocalStorageTests(StorageContract, unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.storage = LocalStorage(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_keys_cannot_escape_the_root(self):
+        with self.assertRaises(ValueError):
+            self.storage.put("../outside.jpg", BytesIO(b"x"))
+
+    def test_presigned_reads_are_not_supported(self):
+        self.assertIsNone(self.storage.presigned_url("a.jpg", 60))
+
+    def test_backends_must_implement_the_whole_interface(self):
+        class PartialStorage(Storage):
+            def put(self, key, stream, content_type=None):
+                pass
+
+        with self.assertRaises(TypeError):
+            PartialStorage()
+
+
+@unittest.skipUnless(
+    os.getenv("PHOTO_S3_TEST_ENDPOINT_URL"),
+    "Set PHOTO_S3_TEST_ENDPOINT_URL (and PHOTO_S3_TEST_BUCKET) to run against MinIO",
+)
+class S3StorageTests(StorageContract, unittest.TestCase):
+    def setUp(self):
+        self.storage = S3Storage.from_config(
+            {
+                "PHOTO_S3_ENDPOINT_URL": os.environ["PHOTO_S3_TEST_ENDPOINT_URL"],
+                "PHOTO_S3_BUCKET": os.getenv("PHOTO_S3_TEST_BUCKET", "plant-tracker-test"),
+                "PHOTO_S3_PREFIX": f"test-{uuid.uuid4().hex}/",
+            }
+        )
+
+    def test_presigned_url_reads_without_credentials(self):
+        from urllib.request import urlopen
+
+        self.storage.put("a.jpg", BytesIO(b"bytes"), "image/jpeg")
+        url = self.storage.presigned_url("a.jpg", 60, "image/jpeg")
+        with urlopen(url) as response:
+            self.assertEqual(response.read(), b"bytes")
+        self.storage.delete_many(["a.jpg"])
+
+
+class S3DeleteErrorTests(unittest.TestCase):
+    def test_failed_keys_are_raised_after_every_batch(self):
+        client = MagicMock()
+        client.delete_objects.side_effect = [
+            {
+                "Errors": [
+                    {"Key": "photos/a.jpg", "Code": "AccessDenied", "Message": "Denied"},
+                    {"Key": "photos/b.jpg", "Code": "NoSuchKey", "Message": "Missing"},
+                ]
+            },
+            {},
+        ]
+        storage = S3Storage(client, "bucket", "photos/")
+        storage.DELETE_BATCH_SIZE = 2
+
+        with self.assertRaises(StorageDeleteError) as raised:
+            storage.delete_many(["a.jpg", "b.jpg", "c.jpg"])
+
+        self.assertEqual(raised.exception.keys, {"a.jpg": "AccessDenied: Denied"})
+        self.assertEqual(client.delete_objects.call_count, 2)
+
+
+class SharedStorageTests(unittest.TestCase):
+    """Two app nodes with their own UPLOAD_FOLDER sharing one store."""
+
+    def setUp(self):
+        self.store = TemporaryDirectory()
+        self.folders = [TemporaryDirectory(), TemporaryDirectory()]
+        self.db = session_factory()()
+        self.plant = add_plant(self.db)
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+        self.store.cleanup()
+        for folder in self.folders:
+            folder.cleanup()
+
+    def node(self, index, **config):
+        app = Flask(__name__)
+        app.config["UPLOAD_FOLDER"] = self.folders[index].name
+        app.config["PHOTO_STORAGE_ROOT"] = self.store.name
+        app.config["ALLOWED_MIME_TYPES"] = {"image/jpeg"}
+        app.config.update(config)
+        return app.app_context()
+
+    def stored_files(self):
+        return list_files(self.store.name)
+
+    def test_files_written_on_one_node_are_served_and_deleted_on_another(self):
+        with self.node(0):
+            photos, errors = PhotoService(self.db).upload_plant_photos(
+                self.plant.id, [jpeg_upload()]
+            )
+        self.assertEqual(errors, {})
+        photo = photos[0]
+        self.assertEqual(self.stored_files(), list_files(self.folders[0].name))
+
+        with self.node(1):
+            service = PhotoService(self.db)
+            original = service.ensure_rendition(photo, None)
+            rendition = service.ensure_rendition(photo, 160)
+            self.assertTrue(original.startswith(self.folders[1].name))
+            self.assertTrue(os.path.isfile(rendition))
+            self.assertIn(
+                os.path.relpath(rendition, self.folders[1].name), self.stored_files()
+            )
+
+            service.delete_photo(photo.id)
+            service.reap_tombstones()
+
+        self.assertEqual(self.stored_files(), [])
+
+    def test_missing_original_raises(self):
+        with self.node(0):
+            photos, _ = PhotoService(self.db).upload_plant_photos(
+                self.plant.id, [jpeg_upload()]
+            )
+        LocalStorage(self.store.name).delete_many(self.stored_files())
+
+        with self.node(1):
+            with self.assertRaises(FileNotFoundError):
+                PhotoService(self.db).ensure_rendition(photos[0], 160)
+
+    def test_files_reaped_on_one_node_stop_being_served_on_another(self):
+        with self.node(0):
+            photos, _ = PhotoService(self.db).upload_plant_photos(
+                self.plant.id, [jpeg_upload()]
+            )
+        with self.node(1, PHOTO_WORKING_COPY_REVALIDATE=0):
+            service = PhotoService(self.db)
+            path = os.path.relpath(service.file_path_for(photos[0]), service.upload_folder)
+            rendition = service.resolve_signed_file(path, 160)
+            self.assertTrue(os.path.isfile(rendition))
+
+        with self.node(0):
+            service = PhotoService(self.db)
+            service.delete_photo(photos[0].id)
+            service.reap_tombstones()
+
+        with self.node(1, PHOTO_WORKING_COPY_REVALIDATE=0):
+            with self.assertRaises(FileNotFoundError):
+                PhotoService(self.db).resolve_signed_file(path, 160)
+        self.assertFalse(os.path.exists(rendition))
+
+    def test_working_copy_evicts_the_least_recently_verified_files(self):
+        with self.node(0):
+            service = PhotoService(self.db)
+            photos, _ = service.upload_plant_photos(
+                self.plant.id, [jpeg_upload("red"), jpeg_upload("blue")]
+            )
+            stale, fresh = (service.file_path_for(photos[i]) for i in range(2))
+            os.utime(stale, (0, 0))
+            stale_size = os.path.getsize(stale)
+            cached = list_files(self.folders[0].name)
+            total = sum(
+                os.path.getsize(os.path.join(self.folders[0].name, name)) for name in cached
+            )
+
+            freed = service.trim_working_copy(total - 1)
+
+            self.assertEqual(freed, stale_size)
+            self.assertFalse(os.path.exists(stale))
+            self.assertTrue(os.path.isfile(fresh))
+            self.assertEqual(service.ensure_rendition(photos[0], None), stale)
+            self.assertTrue(os.path.isfile(stale))
+
+    def test_working_copy_that_is_the_store_is_never_trimmed(self):
+        with self.node(0, PHOTO_STORAGE_ROOT=None):
+            service = PhotoService(self.db)
+            photos, _ = service.upload_plant_photos(self.plant.id, [jpeg_upload()])
+
+            self.assertEqual(service.trim_working_copy(0), 0)
+            self.assertTrue(os.path.isfile(service.file_path_for(photos[0])))
@@ -0,0 +1,78 @@
+import io
+from unittest.mock import patch
+
+from PIL import Image
+from sqlalchemy import event
+from werkzeug.formparser import parse_form_data
+
+from app.decorators.caching import record_write
+from app.models import DataVersion
+from helpers import PhotoApiTestCase, add_plant
+
+
+class ThumbnailBatchTests(PhotoApiTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = patch("app.decorators.caching.SessionLocal", self.Session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.app.after_request(record_write)
+
+        db = self.Session()
+        plant = add_plant(db)
+        other_plant = add_plant(db, username="moss", nickname="Pothos")
+        self.photo_ids = [
+            self.add_photo_file(db, plant, f"{i}.jpg").id for i in range(3)
+        ]
+        self.foreign_id = self.add_photo_file(db, other_plant, "other.jpg").id
+        db.commit()
+        self.headers = self.auth_headers(plant.user_id, Accept="image/jpeg")
+        db.close()
+
+    def post(self, photo_ids):
+        return self.client.post(
+            "/api/photos/thumbnails",
+            json={"photo_ids": photo_ids},
+            headers=self.headers,
+        )
+
+    def test_streams_owned_thumbnails_in_one_response(self):
+        photo_queries = []
+
+        def record(conn, cursor, statement, *args):
+            if "FROM photos" in statement:
+                photo_queries.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", record)
+        try:
+            response = self.post([*reversed(self.photo_ids), self.foreign_id])
+            body = response.get_data()
+        finally:
+            event.remove(self.engine, "before_cursor_execute", record)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(photo_queries), 1)
+        _, _, files = parse_form_data(
+            {
+                "wsgi.input": io.BytesIO(body),
+                "CONTENT_TYPE": response.headers["Content-Type"],
+                "CONTENT_LENGTH": str(len(body)),
+                "REQUEST_METHOD": "POST",
+            }
+        )
+        self.assertEqual(list(files), [str(i) for i in reversed(self.photo_ids)])
+        with Image.open(files[str(self.photo_ids[0])].stream) as thumb:
+            self.assertEqual(thumb.width, 400)
+        self.assertEqual(files[str(self.photo_ids[0])].mimetype, "image/jpeg")
+
+    def test_does_not_count_as_a_write(self):
+        self.post(self.photo_ids)
+
+        db = self.Session()
+        self.assertEqual(db.query(DataVersion).count(), 0)
+        db.close()
+
+    def test_rejects_invalid_and_oversized_batches(self):
+        self.assertEqual(self.post("1,2").status_code, 400)
+        self.assertEqual(self.post([]).status_code, 400)
+        self.assertEqual(self.post(list(range(1, 102))).status_code, 400)
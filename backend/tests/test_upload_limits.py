@@ -0,0 +1,56 @@
+from io import BytesIO
+import os
+
+from app.request import UploadRequest
+from helpers import PhotoApiTestCase, add_plant, noisy_jpeg
+
+
+class UploadLimitTests(PhotoApiTestCase):
+    config = {"MAX_UPLOAD_SIZE": 64 * 1024, "MAX_CONTENT_LENGTH": 256 * 1024}
+
+    def setUp(self):
+        super().setUp()
+        self.app.request_class = UploadRequest
+
+        db = self.Session()
+        plant = add_plant(db)
+        db.commit()
+        self.plant_id = plant.id
+        self.headers = self.auth_headers(plant.user_id)
+        db.close()
+
+    def upload(self, *images):
+        return self.client.post(
+            f"/api/photos/plant/{self.plant_id}",
+            data={
+                "files": [
+                    (BytesIO(image), f"{index}.jpg") for index, image in enumerate(images)
+                ]
+            },
+            headers=self.headers,
+        )
+
+    def test_batch_larger_than_one_file_limit_is_accepted(self):
+        images = [noisy_jpeg(150) for _ in range(3)]
+        self.assertGreater(sum(map(len, images)), 64 * 1024)
+        self.assertTrue(all(len(image) < 64 * 1024 for image in images))
+
+        response = self.upload(*images)
+
+        self.assertEqual(response.status_code, 201, response.get_json())
+        self.assertEqual(len(response.get_json()["photos"]), 3)
+
+    def test_oversized_file_rejects_the_request(self):
+        small, large = noisy_jpeg(100), noisy_jpeg(300)
+        self.assertGreater(len(large), 64 * 1024)
+
+        response = self.upload(small, large)
+
+        self.assertEqual(response.status_code, 413)
+        self.assertIn("'1.jpg'", response.get_json()["error"])
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, "blobs")))
+
+    def test_request_over_the_total_limit_is_rejected(self):
+        response = self.upload(*[noisy_jpeg(200) for _ in range(8)])
+
+        self.assertEqual(response.status_code, 413)
@@ -37,12 +37,28 @@ api.interceptors.request.use((config) => {
   return config;
 });
 
-// Response interceptor - handle 401 errors and refresh tokens
+// Retries of a request answered 503 with Retry-After (server busy)
+const MAX_BUSY_RETRIES = 2;
+const MAX_RETRY_AFTER_SECONDS = 30;
+
+// Response interceptor - retry busy responses, handle 401 errors and refresh tokens
 api.interceptors.response.use(
   (response) => response,
   async (error) => {
     const originalRequest = error.config;
 
+    const retryAfter = Number(error.response?.headers?.["retry-after"]);
+    if (
+      error.response?.status === 503 &&
+      retryAfter > 0 &&
+      (originalRequest._busyRetries ?? 0) < MAX_BUSY_RETRIES
+    ) {
+      originalRequest._busyRetries = (originalRequest._busyRetries ?? 0) + 1;
+      const delay = Math.min(retryAfter, MAX_RETRY_AFTER_SECONDS) * 1000;
+      await new Promise((resolve) => setTimeout(resolve, delay));
+      return api(originalRequest);
+    }
+
     const isRefreshRequest = originalRequest.url?.includes("/auth/refresh");
 
     if (
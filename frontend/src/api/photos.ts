@@ -1,5 +1,5 @@
 import api from "./axios";
-import type { Photo, PhotoWithSource } from "@/types";
+import type { Photo, PhotoUrls, PhotoWithSource } from "@/types";
 
 // Shape returned by upload endpoints
 export interface UploadPhotosResponse {
@@ -9,22 +9,41 @@ export interface UploadPhotosResponse {
 }
 
 // Get aggregated gallery for a plant (plant photos + all care log photos)
+// Pass `limit` to fetch one page, then `cursor: next_cursor` for the next one
 export async function getPlantPhotos(
   plantId: number,
-): Promise<{ photos: PhotoWithSource[] }> {
-  const res = await api.get(`/photos/plant/${plantId}`);
+  page?: { limit: number; cursor?: string | null },
+): Promise<{ photos: PhotoWithSource[]; next_cursor?: string | null }> {
+  const res = await api.get(`/photos/plant/${plantId}`, {
+    params: page && {
+      limit: page.limit,
+      ...(page.cursor ? { cursor: page.cursor } : {}),
+    },
+  });
+  return res.data;
+}
+
+// Download every photo of a plant, care log photos included, as one ZIP
+// streamed by the server in gallery order
+export async function downloadPlantPhotoArchive(plantId: number): Promise<Blob> {
+  const res = await api.get(`/photos/plant/${plantId}/archive`, {
+    responseType: "blob",
+  });
   return res.data;
 }
 
 // Upload one or more photos to a plant (multipart/form-data)
+// Items with an upload token from fetchPhotoPreview send the token instead
+// of the file, so the server reuses the already processed preview.
 export async function uploadPlantPhotos(
   plantId: number,
   files: File[],
   featuredIndex?: number,
   takenAts?: (string | undefined)[],
+  uploadTokens?: (string | undefined)[],
 ): Promise<UploadPhotosResponse> {
   const formData = new FormData();
-  files.forEach((file) => formData.append("files", file));
+  appendUploads(formData, files, uploadTokens);
   if (featuredIndex !== undefined && featuredIndex >= 0) {
     formData.append("featured_index", String(featuredIndex));
   }
@@ -35,30 +54,55 @@ export async function uploadPlantPhotos(
   return res.data;
 }
 
-// Convert a prospective HEIC/HEIF upload to a temporary JPEG preview.
-export async function fetchPhotoPreview(file: File): Promise<Blob> {
+// Convert a prospective HEIC/HEIF upload to a temporary JPEG preview. The
+// server keeps the processed upload for a while under the returned token.
+export async function fetchPhotoPreview(
+  file: File,
+): Promise<{ preview: Blob; uploadToken?: string }> {
   const formData = new FormData();
   formData.append("file", file);
   const res = await api.post("/photos/preview", formData, {
     headers: { "Content-Type": "multipart/form-data" },
     responseType: "blob",
   });
-  return res.data;
+  return {
+    preview: res.data,
+    uploadToken: res.headers["x-upload-token"] || undefined,
+  };
 }
 
 // Upload one or more photos to a care log
 export async function uploadCareLogPhotos(
   careLogId: number,
   files: File[],
+  uploadTokens?: (string | undefined)[],
 ): Promise<UploadPhotosResponse> {
   const formData = new FormData();
-  files.forEach((file) => formData.append("files", file));
+  appendUploads(formData, files, uploadTokens);
   const res = await api.post(`/photos/care-log/${careLogId}`, formData, {
     headers: { "Content-Type": "multipart/form-data" },
   });
   return res.data;
 }
 
+// Each `upload_token` stands for one photo in order; an empty one takes the
+// next file from `files`.
+function appendUploads(
+  formData: FormData,
+  files: File[],
+  uploadTokens?: (string | undefined)[],
+) {
+  if (!uploadTokens?.some(Boolean)) {
+    files.forEach((file) => formData.append("files", file));
+    return;
+  }
+  files.forEach((file, index) => {
+    const token = uploadTokens[index];
+    formData.append("upload_token", token ?? "");
+    if (!token) formData.append("files", file);
+  });
+}
+
 // Make a plant photo the featured cover photo.
 export async function makePhotoFeatured(photoId: number) {
   const res = await api.patch(`/photos/${photoId}`, { featured: true });
@@ -78,14 +122,106 @@ export async function deletePhoto(photoId: number) {
 }
 
 // Fetch a photo's binary file as a Blob for AuthImage rendering.
-// Pass thumb=true for the 400px thumbnail variant.
+// Pass thumb=true for the 400px thumbnail variant, or width for the smallest
+// server rendition at least that many pixels wide. WebP is requested
+// explicitly because XHR requests do not send the browser's image Accept list.
 export async function fetchPhotoFile(
   photoId: number,
   thumb = false,
+  width?: number,
 ): Promise<Blob> {
   const res = await api.get(`/photos/${photoId}/file`, {
-    params: thumb ? { thumb: 1 } : {},
+    params: width ? { w: width } : thumb ? { thumb: 1 } : {},
+    headers: { Accept: "image/webp,image/jpeg;q=0.8" },
     responseType: "blob",
   });
   return res.data;
 }
+
+// Thumbnail requests made in the same tick are sent as one
+// POST /photos/thumbnails, which streams the files back as multipart parts
+// named after each photo ID. Photos missing from the response, or a failed
+// batch, fall back to fetchPhotoFile.
+const THUMBNAIL_BATCH_MAX = 100;
+
+interface PendingThumbnail {
+  resolve: (blob: Blob) => void;
+  reject: (error: unknown) => void;
+}
+
+// width -> photo ID -> waiting callers
+const pendingThumbnails = new Map<number, Map<number, PendingThumbnail[]>>();
+let thumbnailFlush: ReturnType<typeof setTimeout> | null = null;
+
+export function fetchPhotoThumbnail(
+  photoId: number,
+  width: number,
+): Promise<Blob> {
+  return new Promise((resolve, reject) => {
+    let batch = pendingThumbnails.get(width);
+    if (!batch) {
+      batch = new Map();
+      pendingThumbnails.set(width, batch);
+    }
+    batch.set(photoId, [...(batch.get(photoId) ?? []), { resolve, reject }]);
+    thumbnailFlush ??= setTimeout(flushThumbnails, 0);
+  });
+}
+
+function flushThumbnails() {
+  thumbnailFlush = null;
+  const batches = [...pendingThumbnails];
+  pendingThumbnails.clear();
+  for (const [width, batch] of batches) {
+    const ids = [...batch.keys()];
+    for (let i = 0; i < ids.length; i += THUMBNAIL_BATCH_MAX) {
+      void loadThumbnailBatch(ids.slice(i, i + THUMBNAIL_BATCH_MAX), width, batch);
+    }
+  }
+}
+
+async function loadThumbnailBatch(
+  ids: number[],
+  width: number,
+  batch: Map<number, PendingThumbnail[]>,
+) {
+  let parts: FormData | null = null;
+  try {
+    const res = await api.post(
+      "/photos/thumbnails",
+      { photo_ids: ids, w: width },
+      {
+        headers: { Accept: "image/webp,image/jpeg;q=0.8" },
+        responseType: "blob",
+      },
+    );
+    // The browser parses multipart/form-data bodies natively
+    parts = await new Response(res.data, {
+      headers: { "Content-Type": String(res.headers["content-type"]) },
+    }).formData();
+  } catch {
+    parts = null;
+  }
+
+  for (const id of ids) {
+    const part = parts?.get(String(id));
+    const blob =
+      part instanceof Blob ? Promise.resolve(part) : fetchPhotoFile(id, false, width);
+    const waiters = batch.get(id) ?? [];
+    blob.then(
+      (result) => waiters.forEach((waiter) => waiter.resolve(result)),
+      (error) => waiters.forEach((waiter) => waiter.reject(error)),
+    );
+  }
+}
+
+// Pick the smallest signed rendition URL at least `width` pixels wide, or the
+// original when none is. Signed URLs load in a plain <img> without the JWT.
+export function pickPhotoUrl(urls: PhotoUrls, width?: number): string {
+  const widths = Object.keys(urls)
+    .filter((key) => key !== "original")
+    .map(Number)
+    .sort((a, b) => a - b);
+  const match = width ? widths.find((w) => w >= width) : undefined;
+  return `${import.meta.env.VITE_API_URL}${urls[match ?? "original"]}`;
+}
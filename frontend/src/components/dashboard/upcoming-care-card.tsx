@@ -47,7 +47,9 @@ export function UpcomingCareCard({
           >
             <PlantThumbnail
               photoId={log.cover_photo_id}
-              thumb
+              urls={log.cover_photo_urls}
+              placeholder={log.cover_photo_placeholder}
+              displayWidth={80}
               className="h-20 w-20 rounded-lg object-cover hover:opacity-80 transition-opacity"
             />
           </button>
@@ -90,10 +90,12 @@ export function SinglePlantForm({
           const uploadResult = await uploadCareLogPhotos(
             careLogId,
             selectedFiles.map((f) => f.file),
+            selectedFiles.map((f) => f.uploadToken),
           );
           if (uploadResult.errors.length > 0) {
             const failed = new Map(uploadResult.errors.map((item) => [item.index, item.error]));
-            setSelectedFiles(selectedFiles.flatMap((item, index) => failed.has(index) ? [{ ...item, uploadError: failed.get(index) }] : []));
+            // Tokens are single use, so retries send the file itself
+            setSelectedFiles(selectedFiles.flatMap((item, index) => failed.has(index) ? [{ ...item, uploadError: failed.get(index), uploadToken: undefined }] : []));
             setPendingCareLogId(careLogId);
             onSuccess(`Care logged. ${uploadResult.photos.length} photo${uploadResult.photos.length === 1 ? "" : "s"} uploaded; correct the remaining files and retry.`);
             return;
@@ -1,39 +1,76 @@
 import { useEffect, useState } from "react";
 import { ImageOffIcon } from "lucide-react";
-import { fetchPhotoFile } from "@/api/photos";
+import {
+  fetchPhotoFile,
+  fetchPhotoThumbnail,
+  pickPhotoUrl,
+} from "@/api/photos";
 import { cn } from "@/lib/utils";
+import type { PhotoUrls } from "@/types";
 
 interface AuthImageProps extends React.ImgHTMLAttributes<HTMLImageElement> {
   /** ID of the photo to render */
   photoId: number;
   /** Fetch the 400px thumbnail variant instead of the full-size original */
   thumb?: boolean;
+  /** Rendered width in CSS pixels; fetches a rendition sized for the screen */
+  displayWidth?: number;
+  /** Signed URLs from a list endpoint; loaded directly instead of via XHR */
+  urls?: PhotoUrls | null;
+  /** Tiny inline data URI shown, scaled up, until the image arrives */
+  placeholder?: string | null;
 }
 
 /**
- * Renders an <img> whose source is a JWT-protected photo served by the
- * /api/photos/<id>/file endpoint.
- *
+ * Renders an <img> for a photo. Signed URLs from list endpoints load as a
+ * plain image; otherwise the JWT-protected /api/photos/<id>/file endpoint is
+ * fetched as a blob. Sized images on the same page are fetched together
+ * through /api/photos/thumbnails. An expired signed URL falls back to the fetch.
+ * A `placeholder` fills the box while the image loads, without a request.
  */
 export function AuthImage({
   photoId,
   thumb = false,
+  displayWidth,
+  urls,
+  placeholder,
   className,
   alt = "",
+  style,
   ...imgProps
 }: AuthImageProps) {
   const [objectUrl, setObjectUrl] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(false);
+  const [signedFailed, setSignedFailed] = useState(false);
+  const pixelWidth = displayWidth
+    ? Math.ceil(displayWidth * (window.devicePixelRatio || 1))
+    : undefined;
+  const signedUrl =
+    urls && !signedFailed
+      ? pickPhotoUrl(urls, thumb && !pixelWidth ? 400 : pixelWidth)
+      : null;
+  const placeholderStyle: React.CSSProperties | undefined = placeholder
+    ? {
+        backgroundImage: `url(${placeholder})`,
+        backgroundSize: "cover",
+        backgroundPosition: "center",
+      }
+    : undefined;
 
   useEffect(() => {
+    if (signedUrl) return;
     let cancelled = false;
     let createdUrl: string | null = null;
 
     setLoading(true);
     setError(false);
 
-    fetchPhotoFile(photoId, thumb)
+    const request =
+      pixelWidth || thumb
+        ? fetchPhotoThumbnail(photoId, pixelWidth ?? 400)
+        : fetchPhotoFile(photoId);
+    request
       .then((blob) => {
         if (cancelled) return;
         createdUrl = URL.createObjectURL(blob);
@@ -52,12 +89,27 @@ export function AuthImage({
         URL.revokeObjectURL(createdUrl);
       }
     };
-  }, [photoId, thumb]);
+  }, [photoId, thumb, pixelWidth, signedUrl]);
+
+  if (signedUrl) {
+    return (
+      <img
+        src={signedUrl}
+        loading="lazy"
+        onError={() => setSignedFailed(true)}
+        className={className}
+        style={{ ...placeholderStyle, ...style }}
+        alt={alt}
+        {...imgProps}
+      />
+    );
+  }
 
   if (loading) {
     return (
       <div
-        className={cn("animate-pulse bg-muted", className)}
+        className={cn(!placeholder && "animate-pulse", "bg-muted", className)}
+        style={{ ...placeholderStyle, ...style }}
         role="img"
         aria-label="Loading image..."
       />
@@ -76,5 +128,13 @@ export function AuthImage({
     );
   }
 
-  return <img src={objectUrl} className={className} alt={alt} {...imgProps} />;
+  return (
+    <img
+      src={objectUrl}
+      className={className}
+      style={style}
+      alt={alt}
+      {...imgProps}
+    />
+  );
 }
@@ -87,7 +87,9 @@ export function PhotoGallery({
             >
               <AuthImage
                 photoId={photo.id}
-                thumb
+                urls={photo.urls}
+                placeholder={photo.placeholder}
+                displayWidth={240}
                 className="h-full w-full object-cover"
               />
             </button>
@@ -140,6 +142,9 @@ export function PhotoGallery({
             <div className="min-w-0 space-y-3">
               <AuthImage
                 photoId={selected.id}
+                urls={selected.urls}
+                placeholder={selected.placeholder}
+                displayWidth={768}
                 className="max-h-[60dvh] max-w-full rounded-lg object-contain"
                 alt={selected.original_filename || "Plant photo"}
               />
@@ -12,6 +12,8 @@ export interface SelectedPhoto {
   file: File;
   preview?: string;
   previewError?: boolean;
+  /** Token for the server-side processed preview, sent instead of the file */
+  uploadToken?: string;
   takenAt: string;
   isFeatured: boolean;
   uploadError?: string;
@@ -82,9 +84,10 @@ export function PhotoPicker({
 
   const makePreview = async (file: File) => {
     try {
-      const preview = URL.createObjectURL(isHeic(file) ? await fetchPhotoPreview(file) : file);
+      const converted = isHeic(file) ? await fetchPhotoPreview(file) : undefined;
+      const preview = URL.createObjectURL(converted?.preview ?? file);
       objectUrls.current.add(preview);
-      return { preview, previewError: false };
+      return { preview, previewError: false, uploadToken: converted?.uploadToken };
     } catch {
       return { preview: undefined, previewError: true };
     }
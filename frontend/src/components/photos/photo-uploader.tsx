@@ -6,7 +6,12 @@ import { PhotoPicker, type SelectedPhoto } from "@/components/photos/photo-picke
 import type { UploadPhotosResponse } from "@/api/photos";
 
 interface PhotoUploaderProps {
-  onUpload: (files: File[], featuredIndex: number | undefined, takenAts: (string | undefined)[]) => Promise<UploadPhotosResponse>;
+  onUpload: (
+    files: File[],
+    featuredIndex: number | undefined,
+    takenAts: (string | undefined)[],
+    uploadTokens: (string | undefined)[],
+  ) => Promise<UploadPhotosResponse>;
 }
 
 export function PhotoUploader({ onUpload }: PhotoUploaderProps) {
@@ -23,6 +28,7 @@ export function PhotoUploader({ onUpload }: PhotoUploaderProps) {
         items.map((item) => item.file),
         items.findIndex((item) => item.isFeatured),
         items.map((item) => item.takenAt || undefined),
+        items.map((item) => item.uploadToken),
       );
       if (result.errors.length === 0) {
         setItems([]);
@@ -31,7 +37,10 @@ export function PhotoUploader({ onUpload }: PhotoUploaderProps) {
       const failed = new Map(result.errors.map((item) => [item.index, item.error]));
       setItems(
         items.flatMap((item, index) =>
-          failed.has(index) ? [{ ...item, uploadError: failed.get(index) }] : [],
+          // Tokens are single use, so retries send the file itself
+          failed.has(index)
+            ? [{ ...item, uploadError: failed.get(index), uploadToken: undefined }]
+            : [],
         ),
       );
       setError(`${result.photos.length} uploaded. Fix the remaining ${result.errors.length} photo${result.errors.length === 1 ? "" : "s"} and try again.`);
@@ -82,7 +82,9 @@ export function CareTimeline({
                           <AuthImage
                             key={photo.id}
                             photoId={photo.id}
-                            thumb
+                            urls={photo.urls}
+                            placeholder={photo.placeholder}
+                            displayWidth={48}
                             className="h-12 w-12 rounded object-cover"
                           />
                         ))}
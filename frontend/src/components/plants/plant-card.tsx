@@ -52,7 +52,9 @@ export function PlantCard({
       >
         <PlantThumbnail
           photoId={plant.cover_photo_id}
-          thumb
+          urls={plant.cover_photo_urls}
+          placeholder={plant.cover_photo_placeholder}
+          displayWidth={400}
           className="h-64 w-full object-cover"
           iconClassName="h-16 w-16 text-muted-foreground/50"
         />
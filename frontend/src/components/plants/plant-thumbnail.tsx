@@ -1,10 +1,17 @@
 import { LeafIcon } from "lucide-react";
 import { AuthImage } from "@/components/photos/auth-image";
 import { cn } from "@/lib/utils";
+import type { PhotoUrls } from "@/types";
 
 interface PlantThumbnailProps {
   photoId?: number | null;
   thumb?: boolean;
+  /** Rendered width in CSS pixels, used to pick an image rendition. */
+  displayWidth?: number;
+  /** Signed cover photo URLs from the list endpoint, when available. */
+  urls?: PhotoUrls | null;
+  /** Inline placeholder shown until the cover photo loads. */
+  placeholder?: string | null;
   /** Sizing/shape classes applied to both the image and the fallback block. */
   className?: string;
   /** Classes for the fallback leaf icon (size/opacity). */
@@ -19,6 +26,9 @@ interface PlantThumbnailProps {
 export function PlantThumbnail({
   photoId,
   thumb,
+  displayWidth,
+  urls,
+  placeholder,
   className,
   iconClassName = "h-8 w-8 text-muted-foreground",
   alt = "",
@@ -28,6 +38,9 @@ export function PlantThumbnail({
       <AuthImage
         photoId={photoId}
         thumb={thumb}
+        displayWidth={displayWidth}
+        urls={urls}
+        placeholder={placeholder}
         className={className}
         alt={alt}
       />
@@ -120,10 +120,12 @@ export default function AddPlant() {
             selectedFiles.map((f) => f.file),
             selectedFiles.findIndex((file) => file.isFeatured),
             selectedFiles.map((f) => f.takenAt || undefined),
+            selectedFiles.map((f) => f.uploadToken),
           );
           if (uploadResult.errors.length > 0) {
             const failed = new Map(uploadResult.errors.map((item) => [item.index, item.error]));
-            setSelectedFiles(selectedFiles.flatMap((item, index) => failed.has(index) ? [{ ...item, uploadError: failed.get(index) }] : []));
+            // Tokens are single use, so retries send the file itself
+            setSelectedFiles(selectedFiles.flatMap((item, index) => failed.has(index) ? [{ ...item, uploadError: failed.get(index), uploadToken: undefined }] : []));
             setError(`Plant added. ${uploadResult.photos.length} photo${uploadResult.photos.length === 1 ? "" : "s"} uploaded; correct the remaining photo dates and submit again.`);
             return;
           }
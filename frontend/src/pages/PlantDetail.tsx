@@ -7,6 +7,7 @@ import {
   PlusCircleIcon,
   DropletIcon,
   CameraIcon,
+  DownloadIcon,
 } from "lucide-react";
 import {
   Card,
@@ -29,6 +30,7 @@ import { getPlant } from "@/api/plants";
 import { getAllSpecies } from "@/api/species";
 import {
   getPlantPhotos,
+  downloadPlantPhotoArchive,
   uploadPlantPhotos,
   deletePhoto,
   makePhotoFeatured,
@@ -39,6 +41,8 @@ import { useCareTypes } from "@/hooks/use-care-types";
 import type { Plant, Species, PhotoWithSource, CareLog } from "@/types";
 import { formatDate, parseLocalDate, getSpeciesName } from "@/lib/utils";
 
+const PHOTO_PAGE_SIZE = 48;
+
 export default function PlantDetail() {
   const { id } = useParams<{ id: string }>();
   const navigate = useNavigate();
@@ -49,6 +53,8 @@ export default function PlantDetail() {
   const [plant, setPlant] = useState<Plant | null>(null);
   const [species, setSpecies] = useState<Species[]>([]);
   const [photos, setPhotos] = useState<PhotoWithSource[]>([]);
+  const [photosCursor, setPhotosCursor] = useState<string | null>(null);
+  const [loadingMorePhotos, setLoadingMorePhotos] = useState(false);
   const [careLogs, setCareLogs] = useState<CareLog[]>([]);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState("");
@@ -57,9 +63,30 @@ export default function PlantDetail() {
   const [photoToDelete, setPhotoToDelete] = useState<number | null>(null);
   const [actionLoading, setActionLoading] = useState(false);
 
+  // Reload every page loaded so far, so edits don't collapse the gallery
   const refreshPhotos = async () => {
-    const res = await getPlantPhotos(plantId);
+    const res = await getPlantPhotos(plantId, {
+      limit: Math.max(PHOTO_PAGE_SIZE, photos.length),
+    });
     setPhotos(res.photos ?? []);
+    setPhotosCursor(res.next_cursor ?? null);
+  };
+
+  const loadMorePhotos = async () => {
+    if (!photosCursor) return;
+    setLoadingMorePhotos(true);
+    try {
+      const res = await getPlantPhotos(plantId, {
+        limit: PHOTO_PAGE_SIZE,
+        cursor: photosCursor,
+      });
+      setPhotos((current) => [...current, ...(res.photos ?? [])]);
+      setPhotosCursor(res.next_cursor ?? null);
+    } catch {
+      setError("Failed to load more photos");
+    } finally {
+      setLoadingMorePhotos(false);
+    }
   };
 
   const loadData = async () => {
@@ -67,13 +94,14 @@ export default function PlantDetail() {
       const [plantRes, speciesRes, photosRes, careLogsRes] = await Promise.all([
         getPlant(plantId),
         getAllSpecies(),
-        getPlantPhotos(plantId),
+        getPlantPhotos(plantId, { limit: PHOTO_PAGE_SIZE }),
         getCareLogsByPlant(plantId),
       ]);
 
       setPlant(plantRes.plant);
       setSpecies(speciesRes.species ?? []);
       setPhotos(photosRes.photos ?? []);
+      setPhotosCursor(photosRes.next_cursor ?? null);
       setCareLogs(careLogsRes.care_logs ?? []);
     } catch (err: unknown) {
       const message =
@@ -93,8 +121,15 @@ export default function PlantDetail() {
     files: File[],
     featuredIndex: number | undefined,
     takenAts: (string | undefined)[],
+    uploadTokens: (string | undefined)[],
   ) => {
-    const result = await uploadPlantPhotos(plantId, files, featuredIndex, takenAts);
+    const result = await uploadPlantPhotos(
+      plantId,
+      files,
+      featuredIndex,
+      takenAts,
+      uploadTokens,
+    );
     await refreshPhotos();
     if (result.errors.length === 0) {
       setShowUploader(false);
@@ -148,6 +183,23 @@ export default function PlantDetail() {
     }
   };
 
+  const handleDownloadPhotos = async () => {
+    setActionLoading(true);
+    try {
+      const archive = await downloadPlantPhotoArchive(plantId);
+      const url = URL.createObjectURL(archive);
+      const link = document.createElement("a");
+      link.href = url;
+      link.download = `${plant?.nickname ?? "plant"} photos.zip`;
+      link.click();
+      URL.revokeObjectURL(url);
+    } catch {
+      setError("Failed to download photos");
+    } finally {
+      setActionLoading(false);
+    }
+  };
+
   if (isLoading) {
     return (
       <PageLayout title="" maxWidth="4xl" hideHeader>
@@ -252,7 +304,9 @@ export default function PlantDetail() {
             </div>
             <div className="flex flex-wrap gap-2">
               <Badge variant="secondary">
-                {photos.length} photo{photos.length !== 1 ? "s" : ""}
+                {photos.length}
+                {photosCursor ? "+" : ""} photo
+                {photos.length !== 1 || photosCursor ? "s" : ""}
               </Badge>
             </div>
           </div>
@@ -266,22 +320,38 @@ export default function PlantDetail() {
             <CardTitle className="text-lg flex items-center gap-2">
               <CameraIcon className="h-5 w-5" />
               Photos
-              <Badge variant="secondary">{photos.length}</Badge>
+              <Badge variant="secondary">
+                {photos.length}
+                {photosCursor ? "+" : ""}
+              </Badge>
             </CardTitle>
-            <Button
-              variant={showUploader ? "ghost" : "outline"}
-              size="sm"
-              onClick={() => setShowUploader(!showUploader)}
-            >
-              {showUploader ? (
-                "Cancel"
-              ) : (
-                <>
-                  <CameraIcon className="h-4 w-4 mr-1.5" />
-                  Add Photos
-                </>
+            <div className="flex items-center gap-2">
+              {photos.length > 0 && (
+                <Button
+                  variant="outline"
+                  size="sm"
+                  onClick={handleDownloadPhotos}
+                  disabled={actionLoading}
+                >
+                  <DownloadIcon className="h-4 w-4 mr-1.5" />
+                  Download
+                </Button>
               )}
-            </Button>
+              <Button
+                variant={showUploader ? "ghost" : "outline"}
+                size="sm"
+                onClick={() => setShowUploader(!showUploader)}
+              >
+                {showUploader ? (
+                  "Cancel"
+                ) : (
+                  <>
+                    <CameraIcon className="h-4 w-4 mr-1.5" />
+                    Add Photos
+                  </>
+                )}
+              </Button>
+            </div>
           </div>
         </CardHeader>
         <CardContent className="space-y-4">
@@ -292,6 +362,18 @@ export default function PlantDetail() {
             onSetCover={handleSetCover}
             onUpdateTakenAt={handleUpdateTakenAt}
           />
+          {photosCursor && (
+            <div className="flex justify-center">
+              <Button
+                variant="outline"
+                size="sm"
+                onClick={loadMorePhotos}
+                disabled={loadingMorePhotos}
+              >
+                {loadingMorePhotos ? "Loading..." : "Load more photos"}
+              </Button>
+            </div>
+          )}
         </CardContent>
       </Card>
 
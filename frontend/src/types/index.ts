@@ -19,6 +19,8 @@ export interface Plant {
   last_watered: string;
   location?: string;
   cover_photo_id?: number | null;
+  cover_photo_urls?: PhotoUrls | null;
+  cover_photo_placeholder?: string | null;
 }
 
 // Care Logs
@@ -59,6 +61,8 @@ export type UpcomingCareLog = {
   due_date: string;
   days_until_due: number;
   cover_photo_id?: number | null;
+  cover_photo_urls?: PhotoUrls | null;
+  cover_photo_placeholder?: string | null;
 };
 
 // Species
@@ -92,11 +96,18 @@ export interface Photo {
   original_filename?: string;
   width?: number;
   height?: number;
+  // Tiny base64 JPEG data URI to show while the image loads
+  placeholder?: string | null;
   position?: number;
   taken_at?: string;
   created_at?: string;
+  status?: "pending" | "ready" | "failed";
+  urls?: PhotoUrls | null;
 }
 
+// Signed, expiring file URLs keyed by rendition width, plus "original"
+export type PhotoUrls = Record<string, string>;
+
 // Source metadata describing where a photo came from (plant vs care log)
 export interface PhotoSource {
   type: "plant" | "care_log";